@@ -22,6 +22,12 @@ from typing import List, Dict, Optional
 import requests
 import pandas as pd
 
+from lab03_columns import DATASET_COLUMNS
+from lab03_stats import ProductionStatsAccumulator
+from lab03_parquet import write_parquet_dataset
+from lab03_reviewers import ReviewerGraph
+from lab03_decoding import STREAMING, decode_pr_page, decode_description_lengths
+
 # Configura encoding UTF-8 para Windows
 if sys.platform == 'win32':
     import io
@@ -29,8 +35,9 @@ if sys.platform == 'win32':
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
 class GitHubPRCollector:
-    def __init__(self, mode='test'):
+    def __init__(self, mode='test', write_parquet=False, build_reviewer_graph=False):
         self.mode = mode
+        self.write_parquet = write_parquet
         self.github_token = self._load_github_token()
         
         # Configurações baseadas no modo
@@ -54,12 +61,18 @@ class GitHubPRCollector:
         # Arquivos de saída
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         self.output_file = f'data/lab03_complete{self.output_suffix}_{timestamp}.csv'
+        self.parquet_dir = f'data/lab03_complete{self.output_suffix}_{timestamp}_parquet'
         self.checkpoint_file = f'data/checkpoint{self.output_suffix}_{timestamp}.json'
+        self.stats_file = f'data/lab03{self.output_suffix}_stats_{timestamp}.json'
+        self.stats_state_file = f'data/lab03{self.output_suffix}_sketch_{timestamp}.json'
+        self.reviewers_file = f'data/lab03_reviewers{self.output_suffix}_{timestamp}.npz'
         
         # Estado interno
         self.all_prs = []
         self.collected_descriptions = {}
         self.processed_repos = set()
+        self.stats = ProductionStatsAccumulator()
+        self.reviewer_graph = ReviewerGraph() if build_reviewer_graph else None
         
         print(f"🚀 INICIANDO COLETA COMPLETA - MODO: {mode.upper()}")
         print(f"🎯 Objetivo: {self.max_repositories} repositórios, {self.max_prs_per_repo} PRs cada")
@@ -215,13 +228,19 @@ class GitHubPRCollector:
                     if pr['author']:
                         participants.add(pr['author']['login'])
                     
-                    for comment in pr['comments']['nodes']:
-                        if comment['author']:
-                            participants.add(comment['author']['login'])
+                    commenters = pr['comments']['logins']
+                    reviewers = pr['reviews']['logins']
+                    participants.update(commenters)
+                    participants.update(reviewers)
                     
-                    for review in pr['reviews']['nodes']:
-                        if review['author']:
-                            participants.add(review['author']['login'])
+                    # Interações revisor ↔ autor (evita uma segunda coleta)
+                    if self.reviewer_graph is not None:
+                        self.reviewer_graph.add_pr(
+                            repo_name,
+                            pr['author']['login'] if pr['author'] else None,
+                            reviewers=reviewers,
+                            commenters=commenters
+                        )
                     
                     pr_record = {
                         'repository': repo_name,
@@ -244,12 +263,13 @@ class GitHubPRCollector:
                     }
                     
                     all_prs.append(pr_record)
+                    self.stats.update(pr_record)
                     
                 except Exception as e:
                     print(f"  ⚠️ Erro ao processar PR {pr.get('number', '?')}: {e}")
                     continue
             
-            print(f"  ✅ {len([p for p in all_prs if p['repository'] == repo_name])} PRs coletados")
+            print(f"  ✅ {self.stats.repository_count(repo_name)} PRs coletados")
             
             # Rate limiting
             time.sleep(1.0)
@@ -315,14 +335,18 @@ class GitHubPRCollector:
                 'https://api.github.com/graphql',
                 headers=self.graphql_headers,
                 json={'query': query},
-                timeout=30
+                timeout=30,
+                stream=STREAMING
             )
             
             if response.status_code != 200:
                 print(f"  ❌ Erro HTTP {response.status_code}")
+                response.close()
                 break
             
-            data = response.json()
+            # Decodifica apenas os campos usados no registro
+            with response:
+                data = decode_pr_page(response)
             if 'errors' in data:
                 print(f"  ❌ Erro GraphQL: {data['errors']}")
                 break
@@ -426,21 +450,17 @@ class GitHubPRCollector:
                     'https://api.github.com/graphql',
                     headers=self.graphql_headers,
                     json={'query': query},
-                    timeout=30
+                    timeout=30,
+                    stream=STREAMING
                 )
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    if 'data' in data and data['data']['repository']:
-                        repo_data = data['data']['repository']
-                        
-                        for key, pr_data in repo_data.items():
-                            if key.startswith('pr') and pr_data:
-                                pr_number = pr_data['number']
-                                body = pr_data['body'] or ''
-                                descriptions[pr_number] = len(body)
-                        
-                        return descriptions
+                with response:
+                    if response.status_code == 200:
+                        # Mantém só o tamanho de cada corpo, sem materializar a página
+                        lengths = decode_description_lengths(response)
+                        if lengths is not None:
+                            descriptions.update(lengths)
+                            return descriptions
                 
                 if attempt < 2:
                     time.sleep(2 ** attempt)  # Backoff
@@ -463,31 +483,38 @@ class GitHubPRCollector:
         # Cria diretório se não existe
         os.makedirs('data', exist_ok=True)
         
-        # Garante ordem das colunas igual ao dataset original
-        columns = [
-            'repository', 'pr_number', 'title', 'status', 'created_at', 
-            'closed_at', 'merged_at', 'files_changed', 'additions', 
-            'deletions', 'total_changes', 'num_commits', 'num_reviews', 
-            'num_comments', 'analysis_time_hours', 'author', 'description_length'
-        ]
-        
         # Salva CSV final
         df = pd.DataFrame(self.all_prs)
-        df = df[columns]  # Reordena colunas
+        df = df[DATASET_COLUMNS]  # Garante ordem das colunas igual ao dataset original
         df.to_csv(self.output_file, index=False, encoding='utf-8')
         
         print(f"✅ Dataset salvo: {self.output_file}")
+        
+        # Saída colunar adicional, particionada por repositório
+        if self.write_parquet:
+            write_parquet_dataset(df, self.parquet_dir)
+            print(f"✅ Dataset Parquet salvo: {self.parquet_dir}")
+        
+        # Grafo de interação revisor ↔ autor
+        if self.reviewer_graph is not None:
+            self.reviewer_graph.save(self.reviewers_file)
+            print(f"✅ Grafo de revisores salvo: {self.reviewers_file}")
         print(f"📊 Total de registros: {len(df)}")
         print(f"📁 Repositórios únicos: {df['repository'].nunique()}")
         print(f"🔢 Colunas: {len(df.columns)} (compatível com dataset original)")
         
-        # Estatísticas básicas
+        # Estatísticas acumuladas durante a coleta (sem reprocessar o DataFrame)
+        self.stats.save_report(self.stats_file)
+        self.stats.save_state(self.stats_state_file)
+        with_description = sum(1 for pr in self.all_prs if pr['description_length'] > 0)
+        
         print("\\n📈 ESTATÍSTICAS FINAIS:")
-        print(f"   • PRs MERGED: {len(df[df['status'] == 'MERGED'])}")
-        print(f"   • PRs CLOSED: {len(df[df['status'] == 'CLOSED'])}")
-        print(f"   • Descrições coletadas: {len(df[df['description_length'] > 0])}")
-        print(f"   • Tempo médio análise: {df['analysis_time_hours'].mean():.1f}h")
-        print(f"   • Mudanças médias: {df['total_changes'].mean():.0f} linhas")
+        print(f"   • PRs MERGED: {self.stats.status_count('MERGED')}")
+        print(f"   • PRs CLOSED: {self.stats.status_count('CLOSED')}")
+        print(f"   • Descrições coletadas: {with_description}")
+        print(f"   • Tempo médio análise: {self.stats.mean('analysis_time_hours'):.1f}h")
+        print(f"   • Mudanças médias: {self.stats.mean('total_changes'):.0f} linhas")
+        print(f"📁 Estatísticas salvas: {self.stats_file}")
         
         return self.output_file
     
@@ -551,8 +578,11 @@ def main():
         print("❌ Escolha inválida! Usando modo test por padrão.")
         mode = 'test'
     
+    parquet = input("Gerar também dataset Parquet particionado? (y/N): ").strip().lower() == 'y'
+    reviewers = input("Construir grafo de interação revisor ↔ autor? (y/N): ").strip().lower() == 'y'
+    
     # Confirma execução
-    collector = GitHubPRCollector(mode=mode)
+    collector = GitHubPRCollector(mode=mode, write_parquet=parquet, build_reviewer_graph=reviewers)
     print(f"\\n⚠️ Modo {mode.upper()} selecionado!")
     
     if mode == 'production':
@@ -0,0 +1,14 @@
+"""
+Lab 03 - Colunas do Dataset de Pull Requests
+======================================================================
+Ordem das colunas do dataset original, compartilhada pela coleta
+(lab03.py) e pelas ferramentas que leem seus CSVs sem depender das
+bibliotecas da coleta.
+"""
+
+DATASET_COLUMNS = [
+    'repository', 'pr_number', 'title', 'status', 'created_at',
+    'closed_at', 'merged_at', 'files_changed', 'additions',
+    'deletions', 'total_changes', 'num_commits', 'num_reviews',
+    'num_comments', 'analysis_time_hours', 'author', 'description_length'
+]
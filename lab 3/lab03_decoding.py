@@ -0,0 +1,167 @@
+"""
+Lab 03 - Decodificação das Respostas GraphQL
+======================================================================
+As páginas de PRs (100 PRs com até 200 autores aninhados cada) e os
+batches de descrições (100 corpos completos) são decodificados sem
+materializar a resposta inteira como dicionários aninhados:
+
+- Com ijson, a resposta é lida em streaming (eventos) e apenas os campos
+  usados no registro são construídos; corpos das descrições viram
+  somente o tamanho
+- Sem ijson, usa orjson (ou json da stdlib) e reduz cada PR ao mesmo
+  formato enxuto
+
+Formato enxuto de um PR: os campos escalares da query, author como
+{'login': ...} e comments/reviews como {'totalCount': n, 'logins': [...]}.
+"""
+
+import json
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# As requisições devem usar stream=True para que o corpo não seja lido antes
+STREAMING = HAS_IJSON
+
+PR_FIELDS = [
+    'number', 'title', 'createdAt', 'closedAt', 'mergedAt',
+    'additions', 'deletions', 'changedFiles'
+]
+
+_PR_PREFIX = 'data.repository.pullRequests'
+_NODE_PREFIX = _PR_PREFIX + '.nodes.item'
+
+
+def _slim_pr(pr):
+    """Reduz um PR já decodificado ao formato enxuto"""
+    slim = {field: pr.get(field) for field in PR_FIELDS}
+    slim['author'] = {'login': pr['author']['login']} if pr.get('author') else None
+    for connection in ('comments', 'reviews'):
+        nodes = pr[connection].get('nodes') or []
+        slim[connection] = {
+            'totalCount': pr[connection]['totalCount'],
+            'logins': [n['author']['login'] for n in nodes if n and n.get('author')]
+        }
+    return slim
+
+
+def _raw_stream(response):
+    # Descomprime gzip/deflate ao ler diretamente do socket
+    response.raw.decode_content = True
+    return response.raw
+
+
+def _parse_pr_page_events(events):
+    """Constrói a página de PRs a partir dos eventos do ijson"""
+    errors = None
+    repository_found = False
+    page_info = {}
+    nodes = []
+    current = None
+
+    for prefix, event, value in events:
+        if prefix == 'errors' and event == 'start_array':
+            errors = []
+        elif prefix == 'errors.item.message':
+            errors.append({'message': value})
+        elif prefix == 'data.repository' and event == 'start_map':
+            repository_found = True
+        elif prefix.startswith(_PR_PREFIX + '.pageInfo.'):
+            page_info[prefix.rsplit('.', 1)[1]] = value
+        elif prefix == _NODE_PREFIX:
+            if event == 'start_map':
+                current = {
+                    'author': None,
+                    'comments': {'totalCount': 0, 'logins': []},
+                    'reviews': {'totalCount': 0, 'logins': []}
+                }
+            elif event == 'end_map':
+                nodes.append(current)
+                current = None
+        elif current is not None and prefix.startswith(_NODE_PREFIX + '.'):
+            path = prefix[len(_NODE_PREFIX) + 1:]
+            if path in PR_FIELDS:
+                current[path] = value
+            elif path == 'author.login':
+                current['author'] = {'login': value}
+            elif path in ('comments.totalCount', 'reviews.totalCount'):
+                current[path.split('.')[0]]['totalCount'] = value
+            elif path in ('comments.nodes.item.author.login', 'reviews.nodes.item.author.login'):
+                current[path.split('.')[0]]['logins'].append(value)
+
+    data = {'data': {'repository': None}}
+    if repository_found:
+        data['data']['repository'] = {
+            'pullRequests': {'pageInfo': page_info, 'nodes': nodes}
+        }
+    if errors is not None:
+        data['errors'] = errors
+    return data
+
+
+def decode_pr_page(response):
+    """
+    Decodifica uma página da query de PRs de _fetch_prs_graphql.
+
+    Returns:
+        dict no formato da resposta GraphQL, com os PRs no formato enxuto
+    """
+    if HAS_IJSON:
+        events = ijson.parse(_raw_stream(response), use_float=True)
+        return _parse_pr_page_events(events)
+
+    data = _loads(response.content)
+    repository = (data.get('data') or {}).get('repository')
+    if repository:
+        pull_requests = repository['pullRequests']
+        pull_requests['nodes'] = [_slim_pr(pr) for pr in pull_requests['nodes']]
+    return data
+
+
+def decode_description_lengths(response):
+    """
+    Decodifica um batch de _get_pr_descriptions_batch.
+
+    Returns:
+        dict {pr_number: tamanho da descrição} ou None se o repositório
+        não veio na resposta
+    """
+    if not HAS_IJSON:
+        data = _loads(response.content)
+        repository = (data.get('data') or {}).get('repository')
+        if not repository:
+            return None
+        return {
+            pr['number']: len(pr['body'] or '')
+            for key, pr in repository.items()
+            if key.startswith('pr') and pr
+        }
+
+    lengths = {}
+    repository_found = False
+    pending = {}
+    for prefix, event, value in ijson.parse(_raw_stream(response), use_float=True):
+        if prefix == 'data.repository' and event == 'start_map':
+            repository_found = True
+        elif prefix.startswith('data.repository.pr') and prefix.count('.') == 3:
+            alias, field = prefix.rsplit('.', 1)
+            entry = pending.setdefault(alias, {})
+            if field == 'number':
+                entry['number'] = value
+            elif field == 'body':
+                # Apenas o tamanho do corpo é mantido
+                entry['length'] = len(value or '')
+            if 'number' in entry and 'length' in entry:
+                lengths[entry['number']] = entry['length']
+                del pending[alias]
+
+    return lengths if repository_found else None
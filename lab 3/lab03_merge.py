@@ -0,0 +1,135 @@
+"""
+Lab 03 - Mesclagem dos Datasets de PRs
+======================================================================
+Combina qualquer quantidade de data/lab03_complete_{suffix}_{timestamp}.csv
+(test, production, execuções parciais) em um único dataset canônico:
+
+- Deduplicação por (repository, pr_number), mantendo a linha mais recente
+  (timestamp do nome do arquivo; dentro do arquivo, a última linha)
+- Os CSVs são lidos linha a linha e indexados em um SQLite temporário em
+  disco, então o uso de memória não depende do tamanho das entradas
+- Saída nas 17 colunas de save_final_dataset, ordenada por repositório e PR
+- O arquivo de saída é ignorado se aparecer entre as entradas (ex.: uma
+  mesclagem anterior casada pelo mesmo glob)
+
+Uso:
+    python lab03_merge.py data/lab03_complete_*.csv -o data/lab03_merged.csv
+"""
+
+import os
+import re
+import csv
+import sqlite3
+import argparse
+import tempfile
+from datetime import datetime
+
+from lab03_columns import DATASET_COLUMNS
+
+# Linhas inseridas por transação
+BATCH_SIZE = 10000
+
+_TIMESTAMP_PATTERN = re.compile(r'_(\d{8}_\d{6})\.csv$')
+
+
+def _file_timestamp(path):
+    """Timestamp do nome do arquivo (YYYYmmdd_HHMMSS) ou, na falta dele, o mtime"""
+    match = _TIMESTAMP_PATTERN.search(os.path.basename(path))
+    if match:
+        return datetime.strptime(match.group(1), '%Y%m%d_%H%M%S')
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+
+def merge_datasets(input_files, output_file, temp_dir=None):
+    """
+    Mescla e deduplica os CSVs de PRs em um único arquivo.
+
+    Returns:
+        dict com linhas lidas, PRs únicos e duplicatas descartadas
+    """
+    columns = [c for c in DATASET_COLUMNS if c not in ('repository', 'pr_number')]
+    placeholders = ', '.join('?' for _ in range(len(columns) + 2))
+
+    # Uma saída anterior não pode voltar como entrada (sem timestamp no nome,
+    # ela entraria pela data de modificação e venceria as coletas reais)
+    output_path = os.path.realpath(output_file)
+    skipped = [path for path in input_files if os.path.realpath(path) == output_path]
+    for path in skipped:
+        print(f"  ⏭️ {path} (arquivo de saída, ignorado)")
+    input_files = [path for path in input_files if path not in skipped]
+
+    rows_read = 0
+    with tempfile.TemporaryDirectory(dir=temp_dir) as workdir:
+        connection = sqlite3.connect(os.path.join(workdir, 'merge.db'))
+        connection.execute('PRAGMA journal_mode = OFF')
+        connection.execute('PRAGMA synchronous = OFF')
+        connection.execute(
+            f'''CREATE TABLE prs (
+                repository TEXT NOT NULL,
+                pr_number INTEGER NOT NULL,
+                {', '.join(f'{c} TEXT' for c in columns)},
+                PRIMARY KEY (repository, pr_number)
+            )'''
+        )
+        # Arquivos mais recentes são inseridos por último e substituem os antigos
+        insert = f'INSERT OR REPLACE INTO prs VALUES ({placeholders})'
+
+        for path in sorted(input_files, key=_file_timestamp):
+            with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+                batch = []
+                for row in csv.DictReader(f):
+                    batch.append(
+                        [row['repository'], int(float(row['pr_number']))] +
+                        [row.get(c, '') for c in columns]
+                    )
+                    if len(batch) >= BATCH_SIZE:
+                        connection.executemany(insert, batch)
+                        connection.commit()
+                        rows_read += len(batch)
+                        batch = []
+                connection.executemany(insert, batch)
+                connection.commit()
+                rows_read += len(batch)
+            print(f"  ✅ {path}")
+
+        unique = 0
+        with open(output_file, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(DATASET_COLUMNS)
+            cursor = connection.execute(
+                f'''SELECT repository, pr_number, {', '.join(columns)}
+                    FROM prs ORDER BY repository, pr_number'''
+            )
+            for row in cursor:
+                record = dict(zip(['repository', 'pr_number'] + columns, row))
+                writer.writerow([record[c] for c in DATASET_COLUMNS])
+                unique += 1
+
+        connection.close()
+
+    return {
+        'rows_read': rows_read,
+        'unique_prs': unique,
+        'duplicates': rows_read - unique
+    }
+
+
+def main():
+    """Mescla os CSVs informados em um dataset canônico"""
+    parser = argparse.ArgumentParser(description='Mescla datasets de PRs do Lab 03')
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('--temp-dir', help='Diretório para o índice temporário')
+    args = parser.parse_args()
+
+    print(f"🔀 Mesclando {len(args.files)} arquivos...")
+    result = merge_datasets(args.files, args.output, temp_dir=args.temp_dir)
+
+    print(f"📊 Linhas lidas: {result['rows_read']}")
+    print(f"📊 PRs únicos: {result['unique_prs']}")
+    print(f"🗑️ Duplicatas descartadas: {result['duplicates']}")
+    print(f"📁 Dataset salvo: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
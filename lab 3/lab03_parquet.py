@@ -0,0 +1,177 @@
+"""
+Lab 03 - Dataset de Pull Requests em Parquet Particionado
+======================================================================
+Saída colunar alternativa ao lab03_complete_*.csv:
+
+- Particionado por repositório (diretórios repository=<owner%2Fname>)
+- author/status codificados como dicionário
+- created_at/closed_at/merged_at como timestamps UTC
+- Estatísticas por row group, permitindo pular blocos na leitura
+
+O carregador aplica projeção de colunas e filtros diretamente na leitura,
+por exemplo apenas PRs MERGED de alguns repositórios.
+
+Uso:
+    python lab03_parquet.py convert data/lab03_complete_production_*.csv -o data/lab03_parquet
+"""
+
+import os
+import argparse
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Linhas por row group (estatísticas min/max são gravadas por grupo)
+ROW_GROUP_SIZE = 64 * 1024
+
+TIMESTAMP_COLUMNS = ['created_at', 'closed_at', 'merged_at']
+
+
+def _require_pyarrow():
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow não instalado! Execute: pip install pyarrow")
+
+
+def _schema():
+    """Schema do dataset (mesma ordem de colunas do CSV)"""
+    timestamp = pa.timestamp('s', tz='UTC')
+    return pa.schema([
+        ('repository', pa.dictionary(pa.int32(), pa.string())),
+        ('pr_number', pa.int64()),
+        ('title', pa.string()),
+        ('status', pa.dictionary(pa.int8(), pa.string())),
+        ('created_at', timestamp),
+        ('closed_at', timestamp),
+        ('merged_at', timestamp),
+        ('files_changed', pa.int64()),
+        ('additions', pa.int64()),
+        ('deletions', pa.int64()),
+        ('total_changes', pa.int64()),
+        ('num_commits', pa.int64()),
+        ('num_reviews', pa.int64()),
+        ('num_comments', pa.int64()),
+        ('analysis_time_hours', pa.float64()),
+        ('author', pa.dictionary(pa.int32(), pa.string())),
+        ('description_length', pa.int64()),
+    ])
+
+
+def _to_table(df):
+    """Converte o DataFrame de PRs para uma tabela Arrow tipada"""
+    schema = _schema()
+    df = df[schema.names].copy()
+    for column in TIMESTAMP_COLUMNS:
+        df[column] = pd.to_datetime(df[column], utc=True)
+    # Ordena por data para que os row groups tenham faixas de datas estreitas
+    df = df.sort_values(['repository', 'created_at'], kind='stable')
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def write_parquet_dataset(df, output_dir, basename='part'):
+    """
+    Salva o DataFrame de PRs como Parquet particionado por repositório.
+
+    Cada partição recebe o arquivo <basename>-<i>.parquet: gravar de novo com
+    o mesmo basename substitui esses arquivos em vez de duplicar as linhas,
+    e basenames diferentes (um por CSV de origem) convivem no mesmo diretório.
+    """
+    _require_pyarrow()
+
+    table = _to_table(df)
+    parquet_format = ds.ParquetFileFormat()
+    file_options = parquet_format.make_write_options(
+        compression='zstd',
+        use_dictionary=['status', 'author'],
+        write_statistics=True,
+    )
+    partitioning = ds.partitioning(
+        pa.schema([('repository', pa.dictionary(pa.int32(), pa.string()))]),
+        flavor='hive'
+    )
+    ds.write_dataset(
+        table,
+        output_dir,
+        format=parquet_format,
+        partitioning=partitioning,
+        file_options=file_options,
+        max_rows_per_group=ROW_GROUP_SIZE,
+        basename_template=f'{basename}-{{i}}.parquet',
+        existing_data_behavior='overwrite_or_ignore',
+    )
+    return output_dir
+
+
+def load_parquet_dataset(path, columns=None, repositories=None, status=None, filter=None):
+    """
+    Carrega o dataset Parquet com projeção de colunas e filtros na leitura.
+
+    Args:
+        path: diretório gerado por write_parquet_dataset
+        columns: colunas a carregar (None carrega todas)
+        repositories: lista de repositórios (poda partições inteiras)
+        status: 'MERGED', 'CLOSED' ou lista de status
+        filter: expressão pyarrow.dataset adicional
+
+    Returns:
+        pandas.DataFrame
+    """
+    _require_pyarrow()
+
+    dataset = ds.dataset(
+        path,
+        format='parquet',
+        partitioning=ds.HivePartitioning.discover(infer_dictionary=True)
+    )
+
+    expression = None
+    if repositories is not None:
+        expression = ds.field('repository').isin(list(repositories))
+    if status is not None:
+        statuses = [status] if isinstance(status, str) else list(status)
+        condition = ds.field('status').isin(statuses)
+        expression = condition if expression is None else expression & condition
+    if filter is not None:
+        expression = filter if expression is None else expression & filter
+
+    if columns is None:
+        # A coluna de partição volta para a posição original do CSV
+        columns = _schema().names
+    table = dataset.to_table(columns=columns, filter=expression)
+    return table.to_pandas()
+
+
+def convert_csv(csv_file, output_dir):
+    """Converte um lab03_complete_*.csv existente para Parquet particionado"""
+    df = pd.read_csv(csv_file, encoding='utf-8')
+    # Nome derivado do CSV: reconverter o mesmo arquivo não duplica partições
+    basename = os.path.splitext(os.path.basename(csv_file))[0]
+    write_parquet_dataset(df, output_dir, basename=basename)
+    return len(df)
+
+
+def main():
+    """Converte CSVs do Lab 03 para o formato Parquet particionado"""
+    parser = argparse.ArgumentParser(description='Dataset Parquet do Lab 03')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = subparsers.add_parser('convert', help='Converte CSVs lab03_complete_*')
+    convert_parser.add_argument('files', nargs='+')
+    convert_parser.add_argument('-o', '--output', required=True)
+
+    args = parser.parse_args()
+
+    for csv_file in args.files:
+        rows = convert_csv(csv_file, args.output)
+        print(f"  ✅ {csv_file} ({rows} PRs)")
+
+    print(f"📁 Dataset Parquet salvo: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Lab 03 - Grafo de Interação Revisor ↔ Autor
+======================================================================
+Matriz esparsa por repositório construída durante a coleta dos PRs:
+M[i, j] = número de reviews (ou comentários) de i em PRs do autor j.
+
+- Logins são internados em IDs inteiros compartilhados entre repositórios
+- As arestas chegam em buffers COO e são consolidadas em CSR em blocos,
+  então a memória cresce com o número de pares distintos, não de eventos
+- Consultas vetorizadas: principais revisores, reciprocidade e
+  concentração da carga de revisão (Gini, HHI)
+
+Uso:
+    python lab03_reviewers.py data/lab03_reviewers_production_*.npz
+"""
+
+import argparse
+from array import array
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Tipos de interação registrados
+KINDS = ('review', 'comment')
+
+# Quantidade de arestas acumuladas em COO antes de consolidar em CSR
+FLUSH_THRESHOLD = 50000
+
+
+class _RepositoryEdges:
+    """Arestas de um repositório: buffers COO pendentes + CSR consolidado"""
+
+    def __init__(self):
+        self.rows = {kind: array('i') for kind in KINDS}
+        self.cols = {kind: array('i') for kind in KINDS}
+        self.csr = {kind: None for kind in KINDS}
+        self.pr_count = 0
+
+
+class ReviewerGraph:
+    """Matrizes esparsas de interação revisor → autor por repositório"""
+
+    def __init__(self):
+        self.login_ids = {}
+        self.logins = []
+        self.repositories = {}
+
+    def _intern(self, login):
+        login_id = self.login_ids.get(login)
+        if login_id is None:
+            login_id = len(self.logins)
+            self.login_ids[login] = login_id
+            self.logins.append(login)
+        return login_id
+
+    def add_pr(self, repository, author, reviewers=(), commenters=()):
+        """Registra as interações de um PR (auto-interações são ignoradas)"""
+        edges = self.repositories.get(repository)
+        if edges is None:
+            edges = self.repositories[repository] = _RepositoryEdges()
+        edges.pr_count += 1
+
+        if not author:
+            return
+        author_id = self._intern(author)
+
+        for kind, logins in (('review', reviewers), ('comment', commenters)):
+            for login in logins:
+                if login and login != author:
+                    edges.rows[kind].append(self._intern(login))
+                    edges.cols[kind].append(author_id)
+            if len(edges.rows[kind]) >= FLUSH_THRESHOLD:
+                self._flush(edges, kind)
+
+    def _flush(self, edges, kind):
+        """Consolida o buffer COO no CSR do repositório (somando duplicatas)"""
+        size = len(self.logins)
+        rows = np.frombuffer(edges.rows[kind], dtype=np.int32)
+        cols = np.frombuffer(edges.cols[kind], dtype=np.int32)
+        pending = sparse.coo_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(size, size)
+        ).tocsr()
+
+        current = edges.csr[kind]
+        if current is not None:
+            current = current.copy()
+            current.resize((size, size))
+            pending = current + pending
+        edges.csr[kind] = pending
+        edges.rows[kind] = array('i')
+        edges.cols[kind] = array('i')
+
+    def matrix(self, repository, kind='review'):
+        """Matriz CSR (logins × logins) do repositório; kind='all' soma os tipos"""
+        kinds = KINDS if kind == 'all' else (kind,)
+        size = len(self.logins)
+        edges = self.repositories[repository]
+        result = sparse.csr_matrix((size, size), dtype=np.int32)
+        for name in kinds:
+            if len(edges.rows[name]) or edges.csr[name] is None:
+                self._flush(edges, name)
+            current = edges.csr[name]
+            if current.shape != (size, size):
+                current = current.copy()
+                current.resize((size, size))
+                edges.csr[name] = current
+            result = result + current
+        return result
+
+    def top_reviewers(self, repository, n=10, kind='review'):
+        """Logins com mais interações no repositório, em ordem decrescente"""
+        load = np.asarray(self.matrix(repository, kind).sum(axis=1)).ravel()
+        active = np.flatnonzero(load)
+        if len(active) > n:
+            active = active[np.argpartition(load[active], -n)[-n:]]
+        ordered = active[np.argsort(load[active])[::-1]]
+        return [(self.logins[i], int(load[i])) for i in ordered]
+
+    def reciprocity(self, repository, kind='all'):
+        """Fração dos pares revisor→autor em que o autor também revisou o revisor"""
+        linked = (self.matrix(repository, kind) > 0).astype(np.int8)
+        if linked.nnz == 0:
+            return 0.0
+        return linked.multiply(linked.T).nnz / linked.nnz
+
+    def review_load_concentration(self, repository, kind='review'):
+        """Concentração da carga de revisão entre os revisores ativos"""
+        load = np.asarray(self.matrix(repository, kind).sum(axis=1)).ravel()
+        load = np.sort(load[load > 0]).astype(float)
+        if len(load) == 0:
+            return {'reviewers': 0, 'gini': 0.0, 'hhi': 0.0, 'top10_share': 0.0}
+
+        total = load.sum()
+        count = len(load)
+        ranks = np.arange(1, count + 1)
+        gini = (2 * np.sum(ranks * load) / (count * total)) - (count + 1) / count
+        shares = load / total
+        top = max(1, int(np.ceil(count * 0.1)))
+        return {
+            'reviewers': count,
+            'gini': float(gini),
+            'hhi': float(np.sum(shares ** 2)),
+            'top10_share': float(load[-top:].sum() / total),
+        }
+
+    def summary(self):
+        """Resumo por repositório para análise da carga de revisão"""
+        rows = []
+        for repository, edges in self.repositories.items():
+            top = self.top_reviewers(repository, n=1)
+            concentration = self.review_load_concentration(repository)
+            rows.append({
+                'repository': repository,
+                'prs': edges.pr_count,
+                'reviewers': concentration['reviewers'],
+                'top_reviewer': top[0][0] if top else None,
+                'top_reviewer_reviews': top[0][1] if top else 0,
+                'review_gini': concentration['gini'],
+                'review_hhi': concentration['hhi'],
+                'review_top10_share': concentration['top10_share'],
+                'reciprocity': self.reciprocity(repository),
+            })
+        return pd.DataFrame(rows)
+
+    def save(self, path):
+        """Salva logins e matrizes (em COO) em um único .npz"""
+        arrays = {
+            'logins': np.array(self.logins, dtype=str),
+            'repositories': np.array(list(self.repositories), dtype=str),
+            'pr_counts': np.array([e.pr_count for e in self.repositories.values()]),
+        }
+        for i, repository in enumerate(self.repositories):
+            for kind in KINDS:
+                coo = self.matrix(repository, kind).tocoo()
+                arrays[f'{i}_{kind}_row'] = coo.row
+                arrays[f'{i}_{kind}_col'] = coo.col
+                arrays[f'{i}_{kind}_data'] = coo.data
+        np.savez_compressed(path, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=False)
+        graph = cls()
+        graph.logins = data['logins'].tolist()
+        graph.login_ids = {login: i for i, login in enumerate(graph.logins)}
+        size = len(graph.logins)
+        for i, repository in enumerate(data['repositories'].tolist()):
+            edges = graph.repositories[repository] = _RepositoryEdges()
+            edges.pr_count = int(data['pr_counts'][i])
+            for kind in KINDS:
+                edges.csr[kind] = sparse.coo_matrix(
+                    (data[f'{i}_{kind}_data'],
+                     (data[f'{i}_{kind}_row'], data[f'{i}_{kind}_col'])),
+                    shape=(size, size)
+                ).tocsr()
+        return graph
+
+
+def main():
+    """Exibe o resumo da carga de revisão de um grafo salvo"""
+    parser = argparse.ArgumentParser(description='Grafo revisor ↔ autor do Lab 03')
+    parser.add_argument('file')
+    parser.add_argument('-o', '--output', help='Salva o resumo em CSV')
+    args = parser.parse_args()
+
+    graph = ReviewerGraph.load(args.file)
+    summary = graph.summary()
+    print(summary.sort_values('review_gini', ascending=False).to_string(index=False))
+
+    if args.output:
+        summary.to_csv(args.output, index=False, encoding='utf-8')
+        print(f"\n📁 Resumo salvo: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
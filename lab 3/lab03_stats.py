@@ -0,0 +1,437 @@
+"""
+Lab 03 - Estatísticas Incrementais dos Pull Requests
+======================================================================
+Acumuladores que são atualizados registro a registro, sem carregar o
+dataset completo em memória:
+
+- Média e variância pelo algoritmo de Welford (mescla exata via Chan)
+- Mínimo e máximo
+- Quantis aproximados com sketch KLL (mediana, p90, p99)
+
+As estatísticas são mantidas para o total, por status e por repositório.
+O estado completo pode ser salvo em JSON e mesclado com o de outras
+execuções (shards). Contagens, média, desvio padrão, mínimo e máximo da
+mescla são os mesmos de uma execução única (a menos de arredondamento de
+ponto flutuante). Já os quantis do KLL só são exatos enquanto nenhum nível
+foi compactado; depois disso têm erro de posto limitado, da ordem de 1/k
+da contagem, mas não nulo.
+
+Uso:
+    python lab03_stats.py csv data/lab03_complete_production_*.csv -o stats.json
+    python lab03_stats.py merge shard1_sketch.json shard2_sketch.json -o stats.json
+"""
+
+import sys
+import csv
+import json
+import math
+import argparse
+
+# Métricas presentes no arquivo lab03_production_stats_*.json
+METRICS = [
+    'files_changed', 'total_changes', 'analysis_time_hours',
+    'num_reviews', 'num_comments'
+]
+
+# Quantis adicionados ao relatório
+QUANTILES = {'median': 0.5, 'p90': 0.9, 'p99': 0.99}
+
+
+def parse_number(value):
+    """Converte o valor de uma métrica, mantendo inteiros (ex.: do CSV) como int"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+    if isinstance(value, int):
+        return value
+    return float(value)
+
+
+class RunningStats:
+    """Média, variância, mínimo e máximo atualizados a cada valor (Welford)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Mescla outro acumulador (fórmula paralela de Chan)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self):
+        """Variância amostral (ddof=1), igual ao pandas"""
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+    def to_dict(self):
+        return {
+            'count': self.count, 'mean': self.mean, 'm2': self.m2,
+            'min': self.min, 'max': self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count = data['count']
+        stats.mean = data['mean']
+        stats.m2 = data['m2']
+        stats.min = data['min']
+        stats.max = data['max']
+        return stats
+
+
+class KLLSketch:
+    """
+    Sketch KLL para quantis aproximados com memória O(k log n).
+
+    Enquanto nenhum nível foi compactado o sketch guarda todos os valores
+    e os quantis são exatos (mesma interpolação linear do pandas/numpy).
+    A compactação é determinística (alterna o deslocamento por nível),
+    então mesclar os mesmos shards sempre gera o mesmo resultado.
+    """
+
+    def __init__(self, k=200):
+        self.k = k
+        self.count = 0
+        self.levels = [[]]
+        self.offsets = [0]
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _size(self):
+        return sum(len(items) for items in self.levels)
+
+    def _max_size(self):
+        return sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def update(self, value):
+        self.levels[0].append(value)
+        self.count += 1
+        if self._size() >= self._max_size():
+            self._compress()
+
+    def _compress(self):
+        while self._size() >= self._max_size():
+            for h in range(len(self.levels)):
+                if len(self.levels[h]) >= self._capacity(h):
+                    if h + 1 == len(self.levels):
+                        self.levels.append([])
+                        self.offsets.append(0)
+                    items = sorted(self.levels[h])
+                    # Com tamanho ímpar, o maior valor permanece no nível
+                    keep = [items.pop()] if len(items) % 2 else []
+                    offset = self.offsets[h]
+                    self.offsets[h] = 1 - offset
+                    self.levels[h + 1].extend(items[offset::2])
+                    self.levels[h] = keep
+                    break
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+            self.offsets.append(0)
+        for h, items in enumerate(other.levels):
+            self.levels[h].extend(items)
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        if self.count == 0:
+            return None
+
+        if len(self.levels) == 1:
+            items = sorted(self.levels[0])
+            position = q * (len(items) - 1)
+            lower = int(math.floor(position))
+            upper = min(lower + 1, len(items) - 1)
+            return items[lower] + (items[upper] - items[lower]) * (position - lower)
+
+        weighted = sorted(
+            (value, 2 ** h)
+            for h, items in enumerate(self.levels)
+            for value in items
+        )
+        total = sum(weight for _, weight in weighted)
+        target = q * total
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return weighted[-1][0]
+
+    def to_dict(self):
+        return {
+            'k': self.k, 'count': self.count,
+            'levels': self.levels, 'offsets': self.offsets
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(k=data['k'])
+        sketch.count = data['count']
+        sketch.levels = [list(items) for items in data['levels']]
+        sketch.offsets = list(data['offsets'])
+        return sketch
+
+
+class MetricSummary:
+    """Momentos e sketch de quantis de uma métrica"""
+
+    def __init__(self, k=200):
+        self.stats = RunningStats()
+        self.sketch = KLLSketch(k)
+
+    def update(self, value):
+        self.stats.update(value)
+        self.sketch.update(value)
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def report(self):
+        if self.stats.count == 0:
+            return {'mean': None, 'min': None, 'max': None}
+        result = {
+            'mean': self.stats.mean,
+            'min': self.stats.min,
+            'max': self.stats.max,
+            'std': math.sqrt(self.stats.variance()),
+        }
+        for name, q in QUANTILES.items():
+            result[name] = self.sketch.quantile(q)
+        return result
+
+    def to_dict(self):
+        return {'stats': self.stats.to_dict(), 'sketch': self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls()
+        summary.stats = RunningStats.from_dict(data['stats'])
+        summary.sketch = KLLSketch.from_dict(data['sketch'])
+        return summary
+
+
+class GroupStats:
+    """Contagem de PRs e resumo de cada métrica para um grupo"""
+
+    def __init__(self):
+        self.count = 0
+        self.metrics = {metric: MetricSummary() for metric in METRICS}
+
+    def update(self, record):
+        self.count += 1
+        for metric in METRICS:
+            value = parse_number(record.get(metric))
+            if value is None or math.isnan(value):
+                continue
+            self.metrics[metric].update(value)
+
+    def merge(self, other):
+        self.count += other.count
+        for metric in METRICS:
+            self.metrics[metric].merge(other.metrics[metric])
+        return self
+
+    def report(self):
+        return {
+            'total_prs': self.count,
+            'metrics': {metric: self.metrics[metric].report() for metric in METRICS}
+        }
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'metrics': {metric: self.metrics[metric].to_dict() for metric in METRICS}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        group = cls()
+        group.count = data['count']
+        group.metrics = {
+            metric: MetricSummary.from_dict(data['metrics'][metric])
+            for metric in METRICS
+        }
+        return group
+
+
+class ProductionStatsAccumulator:
+    """
+    Estatísticas do dataset de PRs atualizadas conforme os registros chegam.
+
+    Gera o mesmo JSON de lab03_production_stats_*.json, acrescido de desvio
+    padrão, mediana, p90 e p99, além de recortes por status e repositório.
+    """
+
+    def __init__(self):
+        self.total = GroupStats()
+        self.by_status = {}
+        self.by_repository = {}
+
+    def update(self, record):
+        """Atualiza as estatísticas com um registro de PR"""
+        self.total.update(record)
+        status = record['status']
+        if status not in self.by_status:
+            self.by_status[status] = GroupStats()
+        self.by_status[status].update(record)
+        repository = record['repository']
+        if repository not in self.by_repository:
+            self.by_repository[repository] = GroupStats()
+        self.by_repository[repository].update(record)
+
+    def merge(self, other):
+        """Mescla o acumulador de outro shard"""
+        self.total.merge(other.total)
+        for target, source in ((self.by_status, other.by_status),
+                               (self.by_repository, other.by_repository)):
+            for key, group in source.items():
+                if key not in target:
+                    target[key] = GroupStats()
+                target[key].merge(group)
+        return self
+
+    def status_count(self, status):
+        group = self.by_status.get(status)
+        return group.count if group else 0
+
+    def repository_count(self, repository):
+        group = self.by_repository.get(repository)
+        return group.count if group else 0
+
+    def mean(self, metric):
+        return self.total.metrics[metric].stats.mean
+
+    def report(self):
+        """Relatório no formato de lab03_production_stats_*.json"""
+        total = self.total.report()
+        return {
+            'total_prs': self.total.count,
+            'merged_prs': self.status_count('MERGED'),
+            'closed_prs': self.status_count('CLOSED'),
+            'repositories_count': len(self.by_repository),
+            'metrics': total['metrics'],
+            'by_status': {
+                status: group.report()
+                for status, group in sorted(self.by_status.items())
+            },
+            'by_repository': {
+                repository: group.report()
+                for repository, group in sorted(self.by_repository.items())
+            }
+        }
+
+    def save_report(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        return path
+
+    def save_state(self, path):
+        """Salva o estado completo (momentos e sketches) para mesclagem"""
+        state = {
+            'total': self.total.to_dict(),
+            'by_status': {k: v.to_dict() for k, v in self.by_status.items()},
+            'by_repository': {k: v.to_dict() for k, v in self.by_repository.items()}
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        return path
+
+    @classmethod
+    def load_state(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        accumulator = cls()
+        accumulator.total = GroupStats.from_dict(state['total'])
+        accumulator.by_status = {
+            k: GroupStats.from_dict(v) for k, v in state['by_status'].items()
+        }
+        accumulator.by_repository = {
+            k: GroupStats.from_dict(v) for k, v in state['by_repository'].items()
+        }
+        return accumulator
+
+    @classmethod
+    def from_csv(cls, path):
+        """Lê um lab03_complete_*.csv linha a linha, sem pandas"""
+        accumulator = cls()
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                accumulator.update(row)
+        return accumulator
+
+
+def main():
+    """Gera relatórios a partir de CSVs ou mescla estados de shards"""
+    parser = argparse.ArgumentParser(description='Estatísticas incrementais do Lab 03')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    csv_parser = subparsers.add_parser('csv', help='Processa CSVs lab03_complete_*')
+    csv_parser.add_argument('files', nargs='+')
+    csv_parser.add_argument('-o', '--output', required=True)
+    csv_parser.add_argument('--state', help='Também salva o estado para mesclagem')
+
+    merge_parser = subparsers.add_parser('merge', help='Mescla estados de shards')
+    merge_parser.add_argument('files', nargs='+')
+    merge_parser.add_argument('-o', '--output', required=True)
+    merge_parser.add_argument('--state', help='Também salva o estado mesclado')
+
+    args = parser.parse_args()
+
+    accumulator = ProductionStatsAccumulator()
+    for path in args.files:
+        if args.command == 'csv':
+            accumulator.merge(ProductionStatsAccumulator.from_csv(path))
+        else:
+            accumulator.merge(ProductionStatsAccumulator.load_state(path))
+        print(f"  ✅ {path}")
+
+    accumulator.save_report(args.output)
+    if args.state:
+        accumulator.save_state(args.state)
+
+    print(f"📊 {accumulator.total.count} PRs de {len(accumulator.by_repository)} repositórios")
+    print(f"📁 Relatório salvo: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
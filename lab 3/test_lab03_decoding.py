@@ -0,0 +1,85 @@
+"""
+Testes - Decodificação das Respostas GraphQL (lab03_decoding.py)
+"""
+
+import io
+import gzip
+import json
+
+import pytest
+import urllib3
+
+import lab03_decoding
+from lab03_decoding import decode_pr_page, decode_description_lengths, _slim_pr
+
+
+class FakeResponse:
+    """Resposta com corpo gzip, lido via .raw (streaming) ou .content"""
+
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode('utf-8')
+        self.raw = urllib3.HTTPResponse(
+            body=io.BytesIO(gzip.compress(self.content)),
+            headers={'content-encoding': 'gzip'},
+            preload_content=False, decode_content=False,
+        )
+
+
+@pytest.fixture(params=['ijson', 'json'])
+def streaming(request, monkeypatch):
+    if request.param == 'ijson':
+        pytest.importorskip('ijson')
+        monkeypatch.setattr(lab03_decoding, 'HAS_IJSON', True)
+    else:
+        monkeypatch.setattr(lab03_decoding, 'HAS_IJSON', False)
+    return request.param
+
+
+def pr_node(number, author='alice', reviewers=('bob',), commenters=('carol', None)):
+    return {
+        'number': number, 'title': f'PR {number}', 'createdAt': '2024-01-01T00:00:00Z',
+        'closedAt': '2024-01-02T12:00:00Z', 'mergedAt': None,
+        'additions': 10, 'deletions': 2, 'changedFiles': 3,
+        'author': {'login': author} if author else None,
+        'comments': {'totalCount': len(commenters),
+                     'nodes': [{'author': {'login': c} if c else None} for c in commenters]},
+        'reviews': {'totalCount': len(reviewers),
+                    'nodes': [{'author': {'login': r}} for r in reviewers]},
+        'body': 'texto ignorado',
+    }
+
+
+def pr_page(nodes):
+    return {'data': {'repository': {'pullRequests': {
+        'pageInfo': {'hasNextPage': True, 'endCursor': 'abc'}, 'nodes': nodes}}}}
+
+
+def test_pr_page_slim_format(streaming):
+    nodes = [pr_node(1), pr_node(2, author=None, reviewers=(), commenters=())]
+    data = decode_pr_page(FakeResponse(pr_page(nodes)))
+    pull_requests = data['data']['repository']['pullRequests']
+    assert pull_requests['pageInfo'] == {'hasNextPage': True, 'endCursor': 'abc'}
+    assert pull_requests['nodes'] == [_slim_pr(node) for node in nodes]
+    first = pull_requests['nodes'][0]
+    assert first['author'] == {'login': 'alice'}
+    assert first['comments'] == {'totalCount': 2, 'logins': ['carol']}
+    assert first['reviews'] == {'totalCount': 1, 'logins': ['bob']}
+    assert 'body' not in first
+
+
+def test_pr_page_errors_and_missing_repository(streaming):
+    payload = {'data': {'repository': None}, 'errors': [{'message': 'Could not resolve'}]}
+    data = decode_pr_page(FakeResponse(payload))
+    assert data['data']['repository'] is None
+    assert data['errors'] == [{'message': 'Could not resolve'}]
+
+
+def test_description_lengths(streaming):
+    payload = {'data': {'repository': {
+        'pr0': {'number': 10, 'body': 'abc'},
+        'pr1': {'number': 11, 'body': None},
+        'pr2': {'number': 12, 'body': 'ação ✅'},
+        'pr3': None,
+    }}}
+    assert decode_description_lengths(FakeResponse(payload)) == {10: 3, 11: 0, 12: 6}
+    assert decode_description_lengths(FakeResponse({'data': {'repository': None}})) is None
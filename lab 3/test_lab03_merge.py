@@ -0,0 +1,69 @@
+"""
+Testes - Mesclagem dos Datasets de PRs (lab03_merge.py)
+"""
+
+import os
+import csv
+import sys
+import subprocess
+
+import lab03_merge
+from lab03_columns import DATASET_COLUMNS
+from lab03_merge import merge_datasets
+
+
+def write_rows(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=DATASET_COLUMNS)
+        writer.writeheader()
+        for repository, number, title in rows:
+            writer.writerow({column: '' for column in DATASET_COLUMNS} |
+                            {'repository': repository, 'pr_number': number, 'title': title})
+    return str(path)
+
+
+def read_titles(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames == DATASET_COLUMNS
+        return [(row['repository'], int(row['pr_number']), row['title']) for row in reader]
+
+
+def test_newest_file_wins_regardless_of_argument_order(tmp_path):
+    newer = write_rows(tmp_path / 'lab03_complete_production_20240302_080000.csv',
+                       [('b/y', 1, 'novo'), ('a/x', 2, 'novo')])
+    older = write_rows(tmp_path / 'lab03_complete_test_20240301_120000.csv',
+                       [('a/x', 2, 'antigo'), ('a/x', 1, 'antigo')])
+    output = tmp_path / 'merged.csv'
+
+    result = merge_datasets([newer, older], output)
+    assert read_titles(output) == [('a/x', 1, 'antigo'), ('a/x', 2, 'novo'), ('b/y', 1, 'novo')]
+    assert result == {'rows_read': 4, 'unique_prs': 3, 'duplicates': 1}
+
+
+def test_last_row_within_file_wins(tmp_path, monkeypatch):
+    # Lotes pequenos: a duplicata cai em outro lote da mesma transação
+    monkeypatch.setattr(lab03_merge, 'BATCH_SIZE', 2)
+    path = write_rows(tmp_path / 'lab03_complete_production_20240301_120000.csv',
+                      [('a/x', 1, 'primeira'), ('a/x', 2, 'outra'), ('a/x', 3, 'outra'),
+                       ('a/x', 1, 'última')])
+    merge_datasets([path], tmp_path / 'merged.csv')
+    assert read_titles(tmp_path / 'merged.csv')[0] == ('a/x', 1, 'última')
+
+
+def test_output_file_is_not_read_as_input(tmp_path):
+    collected = write_rows(tmp_path / 'lab03_complete_production_20240301_120000.csv',
+                           [('a/x', 1, 'coletado')])
+    # Saída anterior sem timestamp no nome: pelo mtime ela seria a mais recente
+    previous = write_rows(tmp_path / 'lab03_complete_merged.csv', [('a/x', 1, 'mesclado antes')])
+    result = merge_datasets([collected, previous], previous)
+    assert read_titles(previous) == [('a/x', 1, 'coletado')]
+    assert result['rows_read'] == 1
+
+
+def test_merge_does_not_import_collection_module():
+    lab_dir = os.path.dirname(os.path.abspath(lab03_merge.__file__))
+    code = "import sys, lab03_merge; print('lab03' in sys.modules)"
+    output = subprocess.run([sys.executable, '-c', code], cwd=lab_dir, check=True,
+                            capture_output=True, text=True).stdout
+    assert output.strip() == 'False'
@@ -0,0 +1,96 @@
+"""
+Testes - Dataset Parquet Particionado (lab03_parquet.py)
+"""
+
+import random
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+import pyarrow.dataset as ds
+
+from lab03_columns import DATASET_COLUMNS
+from lab03_parquet import write_parquet_dataset, load_parquet_dataset, convert_csv
+
+REPOSITORIES = ['facebook/react', 'torvalds/linux', 'python/cpython']
+
+
+def sample_dataframe(n=120, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        created = pd.Timestamp('2024-01-01', tz='UTC') + pd.Timedelta(hours=rng.randint(0, 5000))
+        closed = created + pd.Timedelta(hours=rng.randint(1, 300))
+        status = rng.choice(['MERGED', 'CLOSED'])
+        additions, deletions = rng.randint(0, 500), rng.randint(0, 500)
+        rows.append({
+            'repository': REPOSITORIES[i % len(REPOSITORIES)], 'pr_number': i,
+            'title': f'PR {i}', 'status': status,
+            'created_at': created.isoformat(), 'closed_at': closed.isoformat(),
+            'merged_at': closed.isoformat() if status == 'MERGED' else None,
+            'files_changed': rng.randint(1, 40), 'additions': additions,
+            'deletions': deletions, 'total_changes': additions + deletions,
+            'num_commits': rng.randint(1, 20), 'num_reviews': rng.randint(1, 8),
+            'num_comments': rng.randint(0, 30),
+            'analysis_time_hours': (closed - created).total_seconds() / 3600,
+            'author': f'user{rng.randint(0, 9)}', 'description_length': rng.randint(0, 4000),
+        })
+    return pd.DataFrame(rows, columns=DATASET_COLUMNS)
+
+
+def normalized(df):
+    """Mesmos tipos e ordem para comparar a leitura com o DataFrame de origem"""
+    df = df[DATASET_COLUMNS].copy()
+    for column in ('repository', 'status', 'author', 'title'):
+        df[column] = df[column].astype(str)
+    for column in ('created_at', 'closed_at', 'merged_at'):
+        df[column] = pd.to_datetime(df[column], utc=True).astype('datetime64[s, UTC]')
+    return df.sort_values(['repository', 'pr_number']).reset_index(drop=True)
+
+
+def test_roundtrip_keeps_rows_and_columns(tmp_path):
+    df = sample_dataframe()
+    write_parquet_dataset(df, tmp_path / 'parquet')
+    loaded = load_parquet_dataset(tmp_path / 'parquet')
+    assert list(loaded.columns) == DATASET_COLUMNS
+    pd.testing.assert_frame_equal(normalized(loaded), normalized(df), check_dtype=False)
+
+
+def test_filters_and_projection(tmp_path):
+    df = sample_dataframe()
+    write_parquet_dataset(df, tmp_path / 'parquet')
+    loaded = load_parquet_dataset(tmp_path / 'parquet', columns=['repository', 'pr_number', 'status'],
+                                  repositories=['torvalds/linux'], status='MERGED')
+    expected = df[(df['repository'] == 'torvalds/linux') & (df['status'] == 'MERGED')]
+    assert list(loaded.columns) == ['repository', 'pr_number', 'status']
+    assert sorted(loaded['pr_number']) == sorted(expected['pr_number'])
+    assert set(loaded['status'].astype(str)) == {'MERGED'}
+
+    extra = load_parquet_dataset(tmp_path / 'parquet', columns=['pr_number'],
+                                 filter=ds.field('num_reviews') >= 5)
+    assert sorted(extra['pr_number']) == sorted(df.loc[df['num_reviews'] >= 5, 'pr_number'])
+
+
+def test_repository_filter_prunes_partitions(tmp_path):
+    write_parquet_dataset(sample_dataframe(), tmp_path / 'parquet')
+    dataset = ds.dataset(tmp_path / 'parquet', format='parquet',
+                         partitioning=ds.HivePartitioning.discover(infer_dictionary=True))
+    selected = list(dataset.get_fragments(filter=ds.field('repository').isin(['python/cpython'])))
+    assert len(selected) == 1
+    assert len(list(dataset.get_fragments())) == len(REPOSITORIES)
+
+
+def test_reconverting_same_csv_does_not_duplicate(tmp_path):
+    df = sample_dataframe()
+    first, second = tmp_path / 'lab03_complete_a.csv', tmp_path / 'lab03_complete_b.csv'
+    df.iloc[:80].to_csv(first, index=False)
+    df.iloc[80:].to_csv(second, index=False)
+    output = tmp_path / 'parquet'
+
+    convert_csv(first, output)
+    convert_csv(first, output)
+    assert len(load_parquet_dataset(output)) == 80
+
+    convert_csv(second, output)
+    assert len(load_parquet_dataset(output)) == len(df)
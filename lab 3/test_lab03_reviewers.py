@@ -0,0 +1,110 @@
+"""
+Testes - Grafo Revisor ↔ Autor (lab03_reviewers.py)
+"""
+
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import lab03_reviewers
+from lab03_reviewers import ReviewerGraph
+
+
+def random_prs(n, seed):
+    rng = random.Random(seed)
+    users = [f'user{i}' for i in range(30)]
+    return [(rng.choice(['a/x', 'b/y']), rng.choice(users),
+             [rng.choice(users) for _ in range(rng.randint(0, 4))],
+             [rng.choice(users) for _ in range(rng.randint(0, 3))])
+            for _ in range(n)]
+
+
+def expected_counts(prs, repository, kind):
+    counts = Counter()
+    for repo, author, reviewers, commenters in prs:
+        if repo != repository:
+            continue
+        for login in (reviewers if kind == 'review' else commenters):
+            if login != author:
+                counts[(login, author)] += 1
+    return counts
+
+
+def matrix_counts(graph, repository, kind):
+    coo = graph.matrix(repository, kind).tocoo()
+    return Counter({(graph.logins[i], graph.logins[j]): int(v)
+                    for i, j, v in zip(coo.row, coo.col, coo.data) if v})
+
+
+@pytest.mark.parametrize('threshold', [3, 50000])
+def test_matrix_counts_match_events(monkeypatch, threshold):
+    # Limite pequeno força várias consolidações com o número de logins crescendo
+    monkeypatch.setattr(lab03_reviewers, 'FLUSH_THRESHOLD', threshold)
+    prs = random_prs(300, seed=1)
+    graph = ReviewerGraph()
+    for pr in prs:
+        graph.add_pr(*pr)
+    for repository in ('a/x', 'b/y'):
+        for kind in ('review', 'comment'):
+            assert matrix_counts(graph, repository, kind) == expected_counts(prs, repository, kind)
+        assert graph.repositories[repository].pr_count == sum(pr[0] == repository for pr in prs)
+
+
+def test_self_interactions_and_missing_author_ignored():
+    graph = ReviewerGraph()
+    graph.add_pr('a/x', 'alice', reviewers=['alice', 'bob'], commenters=['alice'])
+    graph.add_pr('a/x', None, reviewers=['carol'])
+    assert matrix_counts(graph, 'a/x', 'all') == Counter({('bob', 'alice'): 1})
+    assert graph.repositories['a/x'].pr_count == 2
+
+
+def test_top_reviewers_and_reciprocity():
+    graph = ReviewerGraph()
+    graph.add_pr('a/x', 'alice', reviewers=['bob', 'carol'])
+    graph.add_pr('a/x', 'bob', reviewers=['alice', 'carol'])
+    graph.add_pr('a/x', 'dave', reviewers=['carol'])
+    assert graph.top_reviewers('a/x', n=1) == [('carol', 3)]
+    assert sorted(graph.top_reviewers('a/x', n=10)[1:]) == [('alice', 1), ('bob', 1)]
+    # Pares ligados: bob→alice, carol→alice, alice→bob, carol→bob, carol→dave;
+    # recíprocos: bob↔alice
+    assert graph.reciprocity('a/x') == pytest.approx(2 / 5)
+
+
+def test_review_load_concentration():
+    graph = ReviewerGraph()
+    loads = {'r1': 1, 'r2': 2, 'r3': 3, 'r4': 10}
+    for reviewer, load in loads.items():
+        for i in range(load):
+            graph.add_pr('a/x', f'author{i}', reviewers=[reviewer])
+    result = graph.review_load_concentration('a/x')
+
+    values = np.sort(np.array(list(loads.values()), dtype=float))
+    differences = np.abs(values[:, None] - values[None, :]).sum()
+    gini = differences / (2 * len(values) ** 2 * values.mean())
+    assert result['reviewers'] == 4
+    assert result['gini'] == pytest.approx(gini)
+    assert result['hhi'] == pytest.approx(np.sum((values / values.sum()) ** 2))
+    assert result['top10_share'] == pytest.approx(10 / 16)
+
+
+def test_save_load_roundtrip(tmp_path):
+    prs = random_prs(100, seed=2)
+    graph = ReviewerGraph()
+    for pr in prs:
+        graph.add_pr(*pr)
+    path = graph.save(tmp_path / 'reviewers.npz')
+    loaded = ReviewerGraph.load(path)
+
+    for repository in ('a/x', 'b/y'):
+        for kind in ('review', 'comment'):
+            assert matrix_counts(loaded, repository, kind) == matrix_counts(graph, repository, kind)
+    assert loaded.summary().equals(graph.summary())
+    assert loaded.logins == graph.logins
+    assert all(type(login) is str for login in loaded.logins)
+    assert list(loaded.repositories) == list(graph.repositories)
+
+    # Sem pickle: o arquivo abre com allow_pickle=False e não tem arrays de objetos
+    with np.load(path, allow_pickle=False) as data:
+        assert all(data[name].dtype != object for name in data.files)
@@ -0,0 +1,156 @@
+"""
+Testes - Estatísticas Incrementais (lab03_stats.py)
+"""
+
+import csv
+import bisect
+import random
+
+import numpy as np
+import pytest
+
+from lab03_columns import DATASET_COLUMNS
+from lab03_stats import KLLSketch, RunningStats, ProductionStatsAccumulator, parse_number
+
+# Erro de posto aceito para k=200 (o observado fica abaixo de 0,01)
+RANK_ERROR = 0.02
+
+
+def lognormal_values(n, seed):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(0, 2) for _ in range(n)]
+
+
+def rank_error(sketch, values):
+    """Maior |posto(quantil(q)) − q| entre os percentis 1..99"""
+    ordered = sorted(values)
+    worst = 0.0
+    for i in range(1, 100):
+        q = i / 100
+        rank = bisect.bisect_right(ordered, sketch.quantile(q)) / len(ordered)
+        worst = max(worst, abs(rank - q))
+    return worst
+
+
+def test_running_stats_chan_merge_matches_single_pass():
+    values = lognormal_values(5000, seed=1)
+    single = RunningStats()
+    for value in values:
+        single.update(value)
+
+    shards = [RunningStats() for _ in range(3)]
+    for i, value in enumerate(values):
+        shards[i % 3].update(value)
+    merged = RunningStats().merge(shards[0]).merge(shards[1]).merge(shards[2])
+
+    assert merged.count == single.count == len(values)
+    assert merged.mean == pytest.approx(np.mean(values), rel=1e-12)
+    assert merged.variance() == pytest.approx(np.var(values, ddof=1), rel=1e-10)
+    assert merged.variance() == pytest.approx(single.variance(), rel=1e-10)
+    assert (merged.min, merged.max) == (min(values), max(values))
+
+
+def test_kll_exact_below_capacity():
+    values = lognormal_values(150, seed=2)
+    sketch = KLLSketch(k=200)
+    for value in values:
+        sketch.update(value)
+    assert len(sketch.levels) == 1
+    for q in (0.01, 0.25, 0.5, 0.9, 0.99):
+        assert sketch.quantile(q) == pytest.approx(np.quantile(values, q), rel=1e-12)
+
+
+@pytest.mark.parametrize('seed', [3, 4, 5])
+def test_kll_rank_error_bounded_after_compaction(seed):
+    values = lognormal_values(30000, seed)
+    sketch = KLLSketch(k=200)
+    for value in values:
+        sketch.update(value)
+    assert len(sketch.levels) > 1
+    assert sum(len(level) for level in sketch.levels) < len(values) // 10
+    assert rank_error(sketch, values) <= RANK_ERROR
+
+
+def test_kll_rank_error_bounded_after_merging_shards():
+    values = lognormal_values(30000, seed=6)
+    shards = [KLLSketch(k=200) for _ in range(4)]
+    for i, value in enumerate(values):
+        shards[i % 4].update(value)
+    merged = shards[0]
+    for shard in shards[1:]:
+        merged.merge(shard)
+    assert merged.count == len(values)
+    assert rank_error(merged, values) <= RANK_ERROR
+
+
+def test_kll_merge_is_deterministic():
+    values = lognormal_values(20000, seed=7)
+    results = []
+    for _ in range(2):
+        shards = [KLLSketch(k=100) for _ in range(2)]
+        for i, value in enumerate(values):
+            shards[i % 2].update(value)
+        results.append(shards[0].merge(shards[1]).quantile(0.9))
+    assert results[0] == results[1]
+
+
+def test_parse_number_keeps_ints():
+    assert parse_number('12') == 12 and isinstance(parse_number('12'), int)
+    assert parse_number('1.5') == 1.5
+    assert parse_number(7) == 7 and isinstance(parse_number(7), int)
+    assert parse_number('') is None
+    assert parse_number(None) is None
+
+
+def write_dataset(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=DATASET_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({column: row.get(column, '') for column in DATASET_COLUMNS})
+
+
+def sample_rows(n, seed):
+    rng = random.Random(seed)
+    return [{
+        'repository': f'owner/repo{i % 3}', 'pr_number': i,
+        'status': rng.choice(['MERGED', 'CLOSED']),
+        'files_changed': rng.randint(1, 50), 'total_changes': rng.randint(1, 2000),
+        'analysis_time_hours': round(rng.uniform(1, 500), 2),
+        'num_reviews': rng.randint(1, 10), 'num_comments': rng.randint(0, 30),
+    } for i in range(n)]
+
+
+def test_from_csv_keeps_integer_metrics(tmp_path):
+    path = tmp_path / 'lab03_complete.csv'
+    write_dataset(path, sample_rows(50, seed=8))
+    report = ProductionStatsAccumulator.from_csv(path).report()
+    assert report['total_prs'] == 50
+    assert report['merged_prs'] + report['closed_prs'] == 50
+    assert report['repositories_count'] == 3
+    assert isinstance(report['metrics']['num_reviews']['max'], int)
+    assert isinstance(report['metrics']['analysis_time_hours']['max'], float)
+
+
+def test_sharded_state_roundtrip_matches_single_run(tmp_path):
+    rows = sample_rows(180, seed=9)
+    path = tmp_path / 'lab03_complete.csv'
+    write_dataset(path, rows)
+    single = ProductionStatsAccumulator.from_csv(path).report()
+
+    states = []
+    for i, part in enumerate((rows[:100], rows[100:])):
+        shard_path = tmp_path / f'shard{i}.csv'
+        write_dataset(shard_path, part)
+        states.append(ProductionStatsAccumulator.from_csv(shard_path).save_state(tmp_path / f'shard{i}.json'))
+    merged = ProductionStatsAccumulator.load_state(states[0])
+    merged.merge(ProductionStatsAccumulator.load_state(states[1]))
+    report = merged.report()
+
+    assert report['total_prs'] == single['total_prs']
+    assert report['by_status'].keys() == single['by_status'].keys()
+    for metric, summary in single['metrics'].items():
+        for name in ('mean', 'std', 'min', 'max'):
+            assert report['metrics'][metric][name] == pytest.approx(summary[name], rel=1e-9)
+        # Abaixo da capacidade do sketch os quantis também são exatos
+        assert report['metrics'][metric]['median'] == pytest.approx(summary['median'])
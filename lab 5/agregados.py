@@ -0,0 +1,504 @@
+"""
+Lab 05 - Cubo de Agregados dos Resultados
+Resume as medições num cubo (consulta × fatores × dimensões × tipo_api) de
+agregados que podem ser atualizados bloco a bloco e mesclados, para
+processar resultados maiores que a memória com uso de memória constante:
+
+- Momentos por coluna: contagem, soma, média, M2 (soma dos quadrados dos
+  desvios), mínimo e máximo, mesclados pela fórmula de Chan (iguais aos de
+  uma passada única a menos de arredondamento: a ordem das somas muda)
+- Quantis por esboço KLL (Karnin, Lang e Liberty, 2016), exatos enquanto o
+  grupo tem até K_ESBOCO amostras e com erro de posto da ordem de 1/K depois
+  (ou sempre exatos com k=None, guardando todos os valores)
+- Diferenças pareadas REST − GraphQL (a i-ésima medição de cada API no
+  grupo de chaves), em fluxo: guarda apenas as medições que ainda não têm par
+
+O cubo é calculado uma vez; cada tabela do dashboard é uma fatia dele
+(AgregadosExperimento.fatia), que mescla as células dos níveis omitidos.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Estatísticas guardadas por coluna em cada grupo
+ESTATISTICAS = ['n', 'soma', 'media', 'm2', 'min', 'max']
+
+# Quantis disponíveis no resumo (nomes das colunas: p25, p50...)
+QUANTIS = (0.25, 0.5, 0.75, 0.95)
+
+# Tamanho do esboço KLL: grupos com até K_ESBOCO amostras têm quantis exatos
+# (None: sem compactação, quantis sempre exatos)
+K_ESBOCO = 256
+
+
+def nome_quantil(p):
+    return f'p{round(p * 100)}'
+
+
+class EsbocoKLL:
+    """
+    Esboço de quantis mesclável (KLL)
+
+    Os valores entram no nível 0; quando um nível passa da capacidade, é
+    ordenado e metade dos valores (os de posição par ou ímpar, sorteada)
+    sobe para o nível seguinte com o dobro do peso. A capacidade cai por
+    um fator 2/3 a cada nível abaixo do mais alto, então a memória fica
+    em torno de 3·K valores, qualquer que seja o número de amostras.
+    """
+
+    def __init__(self, k=K_ESBOCO, semente=0):
+        self.k = k
+        self.n = 0
+        self.niveis = [np.empty(0)]
+        self._sorteio = np.random.default_rng(semente)
+
+    def _capacidade(self, nivel):
+        profundidade = len(self.niveis) - 1 - nivel
+        return max(2, int(np.ceil(self.k * (2 / 3) ** profundidade)))
+
+    def _compactar(self):
+        if self.k is None:
+            return
+        while sum(map(len, self.niveis)) > sum(self._capacidade(h) for h in range(len(self.niveis))):
+            nivel = next(h for h, valores in enumerate(self.niveis) if len(valores) >= self._capacidade(h))
+            if nivel + 1 == len(self.niveis):
+                self.niveis.append(np.empty(0))
+            valores = np.sort(self.niveis[nivel])
+            impar = len(valores) % 2
+            promovidos = valores[impar:][self._sorteio.integers(2)::2]
+            self.niveis[nivel + 1] = np.concatenate([self.niveis[nivel + 1], promovidos])
+            self.niveis[nivel] = valores[:impar]
+
+    def adicionar(self, valores):
+        """Acrescenta um array de valores (NaN ignorados)"""
+        valores = np.asarray(valores, dtype=float)
+        valores = valores[~np.isnan(valores)]
+        self.n += len(valores)
+        self.niveis[0] = np.concatenate([self.niveis[0], valores])
+        self._compactar()
+
+    def mesclar(self, outro):
+        """Novo esboço equivalente a ter visto as amostras dos dois"""
+        # Sorteio próprio: mesclar não altera os esboços de origem
+        resultado = EsbocoKLL(self.k, semente=self.n + outro.n)
+        resultado.n = self.n + outro.n
+        altura = max(len(self.niveis), len(outro.niveis))
+        resultado.niveis = [np.concatenate([esboco.niveis[h] for esboco in (self, outro) if h < len(esboco.niveis)])
+                            for h in range(altura)]
+        resultado._compactar()
+        return resultado
+
+    @property
+    def exato(self):
+        """Nenhum valor foi descartado (todos ainda no nível 0)"""
+        return len(self.niveis) == 1
+
+    def quantis(self, ps):
+        """Quantis ps com interpolação linear entre as posições (como numpy.percentile)"""
+        ps = np.asarray(ps, dtype=float)
+        if self.n == 0:
+            return np.full(ps.shape, np.nan)
+        if self.exato:
+            return np.percentile(self.niveis[0], ps * 100)
+        valores = np.concatenate(self.niveis)
+        pesos = np.concatenate([np.full(len(v), 2.0 ** h) for h, v in enumerate(self.niveis)])
+        ordem = np.argsort(valores, kind='stable')
+        valores, pesos = valores[ordem], pesos[ordem]
+        # Posição (base 0) do centro de cada valor na amostra completa
+        centros = np.cumsum(pesos) - pesos / 2 - 0.5
+        return np.interp(ps * (self.n - 1), centros, valores)
+
+
+def _guardar_valores(arrays, nome, valores):
+    """Valores em arrays[nome], sem objetos Python (texto com a máscara dos nulos)"""
+    serie = pd.Series(np.asarray(valores))
+    if serie.dtype.kind in 'biuf':
+        arrays[nome] = serie.to_numpy()
+        return
+    nulos = serie.isna().to_numpy()
+    arrays[nome] = serie.astype(object).where(~nulos, '').astype(str).to_numpy(dtype=str)
+    arrays[f'{nome}.nulos'] = nulos
+
+
+def _ler_valores(arrays, nome):
+    valores = arrays[nome]
+    if f'{nome}.nulos' not in arrays:
+        return valores
+    return np.where(arrays[f'{nome}.nulos'], None, valores.astype(object))
+
+
+def _guardar_indice(arrays, nome, indice):
+    for i in range(indice.nlevels):
+        _guardar_valores(arrays, f'{nome}/{i}', indice.get_level_values(i))
+    return list(indice.names)
+
+
+def _ler_indice(arrays, nome, nomes):
+    niveis = [_ler_valores(arrays, f'{nome}/{i}') for i in range(len(nomes))]
+    if len(nomes) == 1:
+        return pd.Index(niveis[0], name=nomes[0])
+    return pd.MultiIndex.from_arrays(niveis, names=nomes)
+
+
+def _guardar_quadro(arrays, nome, df):
+    """DataFrame em arrays[nome/...]; devolve a descrição (JSON) para remontá-lo"""
+    if df is None:
+        return None
+    for j in range(df.shape[1]):
+        _guardar_valores(arrays, f'{nome}/coluna{j}', df.iloc[:, j])
+    return {'indice': _guardar_indice(arrays, f'{nome}/indice', df.index),
+            'colunas': [list(c) if isinstance(c, tuple) else c for c in df.columns],
+            'nomes_colunas': list(df.columns.names)}
+
+
+def _ler_quadro(arrays, nome, descricao):
+    if descricao is None:
+        return None
+    indice = _ler_indice(arrays, f'{nome}/indice', descricao['indice'])
+    nomes = descricao['nomes_colunas']
+    if len(nomes) == 1:
+        # Índice simples, mesmo com rótulos que são tuplas (ex.: ('meta', coluna))
+        colunas = pd.Index([tuple(c) if isinstance(c, list) else c for c in descricao['colunas']],
+                           name=nomes[0], tupleize_cols=False)
+    else:
+        colunas = pd.MultiIndex.from_arrays([[c[i] for c in descricao['colunas']] for i in range(len(nomes))],
+                                            names=nomes)
+    df = pd.DataFrame({j: _ler_valores(arrays, f'{nome}/coluna{j}') for j in range(len(colunas))}, index=indice)
+    df.columns = colunas
+    return df
+
+
+def _json(valor):
+    """Escalar do NumPy/pandas como valor do Python (para json.dumps)"""
+    return valor.item() if hasattr(valor, 'item') else valor
+
+
+def separar_grupos(codigo, grupos):
+    """Posições das linhas de cada grupo 0..grupos-1, na ordem do bloco"""
+    ordem = np.argsort(codigo, kind='stable')
+    limites = np.searchsorted(codigo[ordem], np.arange(grupos + 1))
+    return [ordem[limites[g]:limites[g + 1]] for g in range(grupos)]
+
+
+def momentos(df, codigo, rotulos, colunas):
+    """
+    Momentos de cada coluna em cada grupo
+
+    Args:
+        codigo: número do grupo de cada linha (0..len(rotulos)-1)
+        rotulos: Index com o rótulo de cada grupo
+
+    Returns:
+        DataFrame indexado por rotulos, colunas (coluna, estatística)
+    """
+    grupos = df[colunas].astype(float).groupby(codigo)
+    n = grupos.count()
+    partes = {
+        'n': n,
+        'soma': grupos.sum(),
+        'media': grupos.mean(),
+        'm2': (grupos.var(ddof=0) * n).fillna(0.0),
+        'min': grupos.min(),
+        'max': grupos.max(),
+    }
+    resultado = pd.concat(partes, axis=1).swaplevel(axis=1)
+    return resultado.reindex(columns=pd.MultiIndex.from_product([colunas, ESTATISTICAS])).set_axis(rotulos)
+
+
+def _matriz(resumo, indice, colunas):
+    """Momentos como array grupos × colunas × ESTATISTICAS (NaN onde faltam)"""
+    completo = resumo.reindex(index=indice, columns=pd.MultiIndex.from_product([colunas, ESTATISTICAS]))
+    return completo.to_numpy(dtype=float).reshape(len(indice), len(colunas), len(ESTATISTICAS))
+
+
+def mesclar_momentos(a, b):
+    """Momentos equivalentes a ter visto as linhas dos dois (grupos novos de b vão ao fim)"""
+    indice = a.index.append(b.index.difference(a.index, sort=False))
+    colunas = list(dict.fromkeys(list(a.columns.get_level_values(0)) + list(b.columns.get_level_values(0))))
+    ea, eb = _matriz(a, indice, colunas), _matriz(b, indice, colunas)
+    n, soma, media, m2, minimo, maximo = range(len(ESTATISTICAS))  # posições em ESTATISTICAS
+    na, nb = np.nan_to_num(ea[..., n]), np.nan_to_num(eb[..., n])
+    total = na + nb
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = eb[..., media] - ea[..., media]
+        mescladas = np.where(nb == 0, ea[..., media],
+                             np.where(na == 0, eb[..., media], ea[..., media] + delta * nb / total))
+        cruzado = np.where((na > 0) & (nb > 0), delta ** 2 * na * nb / total, 0.0)
+    resultado = np.stack([
+        total,
+        np.nan_to_num(ea[..., soma]) + np.nan_to_num(eb[..., soma]),
+        mescladas,
+        np.nan_to_num(ea[..., m2]) + np.nan_to_num(eb[..., m2]) + cruzado,
+        np.fmin(ea[..., minimo], eb[..., minimo]),
+        np.fmax(ea[..., maximo], eb[..., maximo]),
+    ], axis=-1)
+    return pd.DataFrame(resultado.reshape(len(indice), -1), index=indice,
+                        columns=pd.MultiIndex.from_product([colunas, ESTATISTICAS]))
+
+
+def agregar_momentos(resumo, por):
+    """
+    Momentos de grupos mais grossos: mescla os grupos do resumo que têm os
+    mesmos valores nos níveis por (na ordem em que aparecem)
+    """
+    colunas = [c for c in dict.fromkeys(resumo.columns.get_level_values(0)) if (c, 'm2') in resumo.columns]
+    e = {estatistica: resumo.xs(estatistica, axis=1, level=1)[colunas] for estatistica in ESTATISTICAS}
+    n = e['n'].fillna(0)
+    ponderada = (e['media'] * n).fillna(0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media_total = ponderada.groupby(level=por).transform('sum') / n.groupby(level=por).transform('sum')
+    # M2 total = soma dos M2 + dispersão das médias dos grupos em torno da média total
+    dispersao = (n * (e['media'] - media_total) ** 2).fillna(0)
+
+    def grupos(df):
+        return df.groupby(level=por, sort=False)
+
+    total = grupos(n).sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media = grupos(ponderada).sum() / total
+    partes = {
+        'n': total,
+        'soma': grupos(e['soma'].fillna(0)).sum(),
+        'media': media.where(total > 0),
+        'm2': grupos(e['m2'].fillna(0) + dispersao).sum(),
+        'min': grupos(e['min']).min(),
+        'max': grupos(e['max']).max(),
+    }
+    resultado = pd.concat(partes, axis=1).swaplevel(axis=1)
+    return resultado.reindex(columns=pd.MultiIndex.from_product([colunas, ESTATISTICAS]))
+
+
+def _com_metadados(resultado, df, codigo, rotulos, colunas_metadados):
+    primeiras = np.unique(codigo, return_index=True)[1]
+    metadados = df[colunas_metadados].iloc[primeiras].set_axis(rotulos)
+    metadados.columns = pd.MultiIndex.from_product([['meta'], colunas_metadados])
+    return pd.concat([resultado, metadados], axis=1)
+
+
+class AgregadosExperimento:
+    """
+    Cubo de agregados de cada célula chaves × dimensoes × tipo_api,
+    atualizado bloco a bloco
+
+    A memória depende do número de células e do tamanho dos esboços, não do
+    número de medições. As diferenças pareadas são feitas por chaves × tipo_api,
+    sem separar as dimensões.
+    """
+
+    def __init__(self, chaves, colunas, colunas_quantis, colunas_metadados, dimensoes=(),
+                 pareadas=('tempo_ms', 'tamanho_bytes'), apis_pareadas=('REST', 'GraphQL'), k=K_ESBOCO):
+        self.chaves = list(chaves)
+        self.dimensoes = list(dimensoes)
+        self.colunas = list(colunas)
+        self.colunas_quantis = list(colunas_quantis)
+        self.colunas_metadados = list(colunas_metadados)
+        self.pareadas = list(pareadas)
+        self.apis_pareadas = apis_pareadas
+        self.k = k
+        self.momentos = None
+        self.metadados = None
+        self.esbocos = {}
+        self.pares = None
+        self._pendentes = {}
+        self.linhas = 0
+
+    @property
+    def niveis(self):
+        return self.chaves + self.dimensoes + ['tipo_api']
+
+    def adicionar(self, bloco):
+        """Incorpora um bloco de linhas já enriquecidas"""
+        bloco = bloco.dropna(subset=self.niveis)
+        if len(bloco) == 0:
+            return
+        self.linhas += len(bloco)
+        grupos = bloco.groupby(self.niveis, sort=False)
+        codigo = grupos.ngroup().to_numpy()
+        rotulos = grupos.size().index
+
+        novos = momentos(bloco, codigo, rotulos, self.colunas)
+        self.momentos = novos if self.momentos is None else mesclar_momentos(self.momentos, novos)
+        metadados = _com_metadados(pd.DataFrame(index=rotulos), bloco, codigo, rotulos, self.colunas_metadados)
+        if self.metadados is None:
+            self.metadados = metadados
+        else:
+            self.metadados = pd.concat([self.metadados, metadados[~metadados.index.isin(self.metadados.index)]])
+
+        linhas_celula = separar_grupos(codigo, len(rotulos))
+        valores = {coluna: bloco[coluna].to_numpy(dtype=float) for coluna in self.colunas_quantis}
+        for rotulo, linhas in zip(rotulos, linhas_celula):
+            for coluna in self.colunas_quantis:
+                esboco = self.esbocos.get((rotulo, coluna))
+                if esboco is None:
+                    esboco = self.esbocos[(rotulo, coluna)] = EsbocoKLL(self.k)
+                esboco.adicionar(valores[coluna][linhas])
+
+        # Pares por chaves × tipo_api: células que só diferem nas dimensões juntas
+        if self.dimensoes:
+            grupo_celula, rotulos = pd.factorize(rotulos.droplevel(self.dimensoes))
+            codigo = grupo_celula[codigo]
+            linhas_celula = separar_grupos(codigo, len(rotulos))
+        self._parear(bloco, rotulos, linhas_celula)
+
+    def _parear(self, bloco, rotulos, linhas_grupo):
+        """Diferenças entre as medições das duas APIs que já têm par"""
+        api_a, api_b = self.apis_pareadas
+        medidas = bloco[self.pareadas].to_numpy(dtype=float)
+        por_chave = {}
+        for rotulo, linhas in zip(rotulos, linhas_grupo):
+            if rotulo[-1] in self.apis_pareadas:
+                por_chave.setdefault(rotulo[:-1], {})[rotulo[-1]] = medidas[linhas]
+
+        chaves_pares, diferencas = [], []
+        vazio = np.empty((0, len(self.pareadas)))
+        for chave, lados in por_chave.items():
+            pendentes = self._pendentes.get(chave, {api_a: vazio, api_b: vazio})
+            a = np.concatenate([pendentes[api_a], lados.get(api_a, vazio)])
+            b = np.concatenate([pendentes[api_b], lados.get(api_b, vazio)])
+            m = min(len(a), len(b))
+            self._pendentes[chave] = {api_a: a[m:], api_b: b[m:]}
+            if m:
+                chaves_pares.extend([chave] * m)
+                diferencas.append(a[:m] - b[:m])
+        if not diferencas:
+            return
+
+        codigo, unicos = pd.factorize(pd.Series(chaves_pares))
+        rotulos_pares = pd.MultiIndex.from_tuples(list(unicos), names=self.chaves)
+        if len(self.chaves) == 1:
+            rotulos_pares = rotulos_pares.get_level_values(0)
+        novos = momentos(pd.DataFrame(np.concatenate(diferencas), columns=self.pareadas),
+                         codigo, rotulos_pares, self.pareadas)
+        self.pares = novos if self.pares is None else mesclar_momentos(self.pares, novos)
+
+    def mesclar(self, outro):
+        """
+        Incorpora o cubo de outras linhas com as mesmas colunas (ex.: de outras
+        consultas, calculado à parte); as células novas vão ao fim
+
+        Pares pendentes de uma mesma chave nos dois cubos não são pareados
+        entre si: mescle cubos de chaves diferentes.
+        """
+        if outro.momentos is None:
+            return
+        if self.momentos is None:
+            self.momentos, self.metadados = outro.momentos, outro.metadados
+        else:
+            self.momentos = mesclar_momentos(self.momentos, outro.momentos)
+            self.metadados = pd.concat([self.metadados, outro.metadados[~outro.metadados.index.isin(self.metadados.index)]])
+        for chave, esboco in outro.esbocos.items():
+            self.esbocos[chave] = esboco if chave not in self.esbocos else self.esbocos[chave].mesclar(esboco)
+        if outro.pares is not None:
+            self.pares = outro.pares if self.pares is None else mesclar_momentos(self.pares, outro.pares)
+        self._pendentes.update(outro._pendentes)
+        self.linhas += outro.linhas
+
+    def reordenar(self, celulas):
+        """Põe as células na ordem de celulas (a ordem dos grupos nas fatias)"""
+        celulas = celulas[celulas.isin(self.momentos.index)]
+        self.momentos = self.momentos.reindex(celulas)
+        self.metadados = self.metadados.reindex(celulas)
+
+    def fatia(self, por, quantis=QUANTIS):
+        """
+        Resumo de cada grupo por × tipo_api, mesclando as células do cubo que
+        só diferem nos níveis omitidos (por: níveis de chaves e dimensoes)
+
+        Returns:
+            DataFrame indexado pelos grupos, na ordem em que aparecem:
+            momentos das colunas, quantis das colunas_quantis (p25, p50...)
+            e, com nível 'meta', os valores das colunas_metadados na
+            primeira linha do grupo
+        """
+        if self.momentos is None:
+            return None
+        celulas = self.momentos.index
+        omitidos = [nivel for nivel in celulas.names if nivel not in por and nivel != 'tipo_api']
+        grupo_celula, rotulos = pd.factorize(celulas.droplevel(omitidos) if omitidos else celulas)
+        rotulos = rotulos.set_names([nivel for nivel in celulas.names if nivel not in omitidos])
+
+        resultado = agregar_momentos(self.momentos, list(rotulos.names)).reindex(rotulos) if omitidos else self.momentos
+
+        # Esboços mesclados célula a célula, na ordem do cubo
+        mesclados = [dict() for _ in range(len(rotulos))]
+        for celula, grupo in zip(celulas, grupo_celula):
+            for coluna in self.colunas_quantis:
+                esboco = self.esbocos[(celula, coluna)]
+                anterior = mesclados[grupo].get(coluna)
+                mesclados[grupo][coluna] = esboco if anterior is None else anterior.mesclar(esboco)
+        colunas = pd.MultiIndex.from_tuples([(coluna, nome_quantil(p))
+                                             for coluna in self.colunas_quantis for p in quantis])
+        valores = [np.concatenate([esbocos[coluna].quantis(quantis) for coluna in self.colunas_quantis])
+                   for esbocos in mesclados]
+        quantis_df = pd.DataFrame(np.reshape(valores, (len(rotulos), len(colunas))), index=rotulos, columns=colunas)
+
+        primeiras = np.unique(grupo_celula, return_index=True)[1]
+        metadados = self.metadados.reindex(celulas).iloc[primeiras].set_axis(rotulos)
+        return pd.concat([resultado, quantis_df, metadados], axis=1)
+
+    def resumo(self, quantis=QUANTIS):
+        """Resumo de cada grupo chaves × tipo_api (fatia sem as dimensões)"""
+        return self.fatia(self.chaves, quantis)
+
+    def para_arrays(self, arrays, nome):
+        """
+        Estado do cubo em arrays do NumPy (arrays[nome/...]) mais uma descrição
+        em JSON, sem objetos Python, para ser gravado num .npz e lido com
+        allow_pickle=False (ver cache_dashboard.py)
+        """
+        celulas = list(self.esbocos)
+        esbocos = [self.esbocos[celula] for celula in celulas]
+        arrays[f'{nome}/esbocos/valores'] = np.concatenate(
+            [nivel for esboco in esbocos for nivel in esboco.niveis]) if esbocos else np.empty(0)
+        arrays[f'{nome}/esbocos/tamanhos'] = np.array(
+            [len(nivel) for esboco in esbocos for nivel in esboco.niveis], dtype=np.int64)
+        arrays[f'{nome}/esbocos/alturas'] = np.array([len(esboco.niveis) for esboco in esbocos], dtype=np.int64)
+        arrays[f'{nome}/esbocos/n'] = np.array([esboco.n for esboco in esbocos], dtype=np.int64)
+        pendentes = []
+        for i, (chave, lados) in enumerate(self._pendentes.items()):
+            for api, medidas in lados.items():
+                arrays[f'{nome}/pendentes/{i}/{api}'] = medidas
+            pendentes.append([[_json(v) for v in chave], list(lados)])
+        return {
+            'chaves': self.chaves, 'dimensoes': self.dimensoes, 'colunas': self.colunas,
+            'colunas_quantis': self.colunas_quantis, 'colunas_metadados': self.colunas_metadados,
+            'pareadas': self.pareadas, 'apis_pareadas': list(self.apis_pareadas), 'k': self.k,
+            'linhas': self.linhas,
+            'momentos': _guardar_quadro(arrays, f'{nome}/momentos', self.momentos),
+            'metadados': _guardar_quadro(arrays, f'{nome}/metadados', self.metadados),
+            'pares': _guardar_quadro(arrays, f'{nome}/pares', self.pares),
+            'esbocos': {
+                'celulas': [[_json(v) for v in celula] for celula, _ in celulas],
+                'colunas': [coluna for _, coluna in celulas],
+                'sorteios': [esboco._sorteio.bit_generator.state for esboco in esbocos],
+            },
+            'pendentes': pendentes,
+        }
+
+    @classmethod
+    def de_arrays(cls, arrays, nome, descricao):
+        """Cubo gravado por para_arrays"""
+        cubo = cls(descricao['chaves'], descricao['colunas'], descricao['colunas_quantis'],
+                   descricao['colunas_metadados'], dimensoes=descricao['dimensoes'],
+                   pareadas=descricao['pareadas'], apis_pareadas=tuple(descricao['apis_pareadas']),
+                   k=descricao['k'])
+        cubo.linhas = descricao['linhas']
+        cubo.momentos = _ler_quadro(arrays, f'{nome}/momentos', descricao['momentos'])
+        cubo.metadados = _ler_quadro(arrays, f'{nome}/metadados', descricao['metadados'])
+        cubo.pares = _ler_quadro(arrays, f'{nome}/pares', descricao['pares'])
+
+        esbocos = descricao['esbocos']
+        valores = arrays[f'{nome}/esbocos/valores']
+        limites = np.concatenate([[0], np.cumsum(arrays[f'{nome}/esbocos/tamanhos'])])
+        primeiro_nivel = np.concatenate([[0], np.cumsum(arrays[f'{nome}/esbocos/alturas'])])
+        for i, (celula, coluna) in enumerate(zip(esbocos['celulas'], esbocos['colunas'])):
+            esboco = EsbocoKLL(cubo.k)
+            esboco.n = int(arrays[f'{nome}/esbocos/n'][i])
+            esboco.niveis = [valores[limites[h]:limites[h + 1]].copy()
+                             for h in range(primeiro_nivel[i], primeiro_nivel[i + 1])]
+            esboco._sorteio.bit_generator.state = esbocos['sorteios'][i]
+            cubo.esbocos[(tuple(celula), coluna)] = esboco
+
+        for i, (chave, apis) in enumerate(descricao['pendentes']):
+            cubo._pendentes[tuple(chave)] = {api: arrays[f'{nome}/pendentes/{i}/{api}'] for api in apis}
+        return cubo
@@ -0,0 +1,125 @@
+"""
+Lab 05 - Cache Incremental do Dashboard
+Guarda entre execuções de preparar_dashboard.py o cubo de agregados de cada
+consulta e os resultados dos testes não paramétricos, indexados pelo hash do
+conteúdo das linhas de cada grupo consulta × tipo_api. Numa nova execução só
+são recalculadas as consultas e comparações cujos grupos mudaram (ex.: o
+benchmark noturno que acrescenta algumas consultas ao arquivo de resultados);
+as saídas são remontadas a partir do cache.
+
+A assinatura (versão do cache, catálogo de cenários, colunas e opções) vale
+para o cache inteiro: se ela mudar, tudo é recalculado. Mudanças no cálculo
+das métricas pedem um novo VERSAO_CACHE.
+
+O arquivo é um .npz: os cubos vão como arrays do NumPy e a estrutura e os
+resultados dos testes como JSON. Nada é lido com pickle (allow_pickle=False),
+então um cache compartilhado ou alterado não executa código ao ser aberto.
+"""
+
+import os
+import json
+import zipfile
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from agregados import AgregadosExperimento
+
+ARQUIVO_CACHE = os.path.join('resultados', 'cache_dashboard.npz')
+VERSAO_CACHE = 3
+
+
+def resumo_hash(*partes):
+    """Hash curto (hex) da representação das partes"""
+    h = hashlib.blake2b(digest_size=16)
+    for parte in partes:
+        h.update(repr(parte).encode('utf-8'))
+    return h.hexdigest()
+
+
+def hashes_grupos(df, chaves=('consulta', 'tipo_api')):
+    """
+    Hash do conteúdo das linhas de cada grupo, na ordem do arquivo
+
+    Returns:
+        dict {rótulo do grupo: hash hex}
+    """
+    linhas = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return {rotulo: hashlib.blake2b(linhas[posicoes].tobytes(), digest_size=16).hexdigest()
+            for rotulo, posicoes in df.groupby(list(chaves), sort=False).indices.items()}
+
+
+class CacheDashboard:
+    """Cubos por consulta e resultados de testes, válidos para uma assinatura"""
+
+    def __init__(self, arquivo=ARQUIVO_CACHE, assinatura=''):
+        self.arquivo = arquivo
+        self.assinatura = assinatura
+        # Cubos guardados ficam como descrição + arrays até serem reaproveitados
+        self.cubos = {}
+        self.testes = {}
+        self._arrays = {}
+        if os.path.exists(arquivo):
+            try:
+                with np.load(arquivo, allow_pickle=False) as npz:
+                    arrays = dict(npz)
+                estrutura = json.loads(str(arrays.pop('estrutura')))
+            except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+                estrutura = None  # cache corrompido ou de outro formato: recalcula tudo
+            if isinstance(estrutura, dict) and estrutura.get('assinatura') == assinatura:
+                self._arrays = arrays
+                self.cubos = {consulta: (_tupla(chave), (nome, descricao))
+                              for consulta, chave, nome, descricao in estrutura['cubos']}
+                self.testes = {_tupla(chave): resultado for chave, resultado in estrutura['testes']}
+        # Entradas usadas nesta execução (as demais não voltam ao arquivo)
+        self._cubos_usados = {}
+        self._testes_usados = {}
+        self.reaproveitados = {'cubos': 0, 'testes': 0}
+
+    def cubo(self, consulta, chave):
+        """Cubo guardado da consulta, se os hashes dos grupos (chave) não mudaram"""
+        guardado = self.cubos.get(consulta)
+        if guardado is None or guardado[0] != chave:
+            return None
+        nome, descricao = guardado[1]
+        cubo = AgregadosExperimento.de_arrays(self._arrays, nome, descricao)
+        self._cubos_usados[consulta] = (chave, cubo)
+        self.reaproveitados['cubos'] += 1
+        return cubo
+
+    def guardar_cubo(self, consulta, chave, cubo):
+        self._cubos_usados[consulta] = (chave, cubo)
+
+    def teste(self, chave):
+        resultado = self.testes.get(chave)
+        if resultado is not None:
+            self._testes_usados[chave] = resultado
+            self.reaproveitados['testes'] += 1
+        return resultado
+
+    def guardar_teste(self, chave, resultado):
+        self._testes_usados[chave] = resultado
+
+    def salvar(self):
+        """Grava as entradas usadas nesta execução (troca o arquivo de uma vez)"""
+        arrays = {}
+        cubos = [[consulta, chave, f'cubo{i}', cubo.para_arrays(arrays, f'cubo{i}')]
+                 for i, (consulta, (chave, cubo)) in enumerate(self._cubos_usados.items())]
+        testes = [[chave, resultado] for chave, resultado in self._testes_usados.items()]
+        arrays['estrutura'] = np.array(json.dumps(
+            {'assinatura': self.assinatura, 'cubos': cubos, 'testes': testes},
+            default=lambda valor: valor.item()))
+
+        pasta = os.path.dirname(self.arquivo)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        temporario = self.arquivo + '.tmp'
+        with open(temporario, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temporario, self.arquivo)
+
+
+def _tupla(valor):
+    """Listas do JSON de volta a tuplas (chaves do cache)"""
+    return tuple(_tupla(v) for v in valor) if isinstance(valor, list) else valor
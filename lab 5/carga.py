@@ -0,0 +1,313 @@
+"""
+Lab 05 - GraphQL vs REST - Modo de Carga
+Varredura de concorrência: cada braço (REST, GraphQL, REST-paralelo) de
+cada consulta é executado por N clientes simultâneos (1, 2, 4, ... 64)
+durante um tempo fixo, em laço fechado, com conexões persistentes.
+
+Para cada nível registra a vazão e um histograma de latência no estilo
+HDR (3 dígitos significativos), com e sem correção de omissão coordenada:
+em laço fechado uma resposta lenta atrasa as requisições seguintes do
+mesmo cliente, que deixam de ser medidas. A versão corrigida preenche
+essas amostras a partir do intervalo esperado entre requisições (a
+latência mediana do braço com 1 cliente; o nível 1 é sempre medido, e
+antes dos demais).
+
+A carga é gerada contra um servidor próprio (servidor_local.py): a API do
+GitHub não é aceita como --base-url.
+
+Cada nível é gravado em resultados_carga.csv assim que termina; com
+--retomar, uma varredura interrompida continua do primeiro nível que falta.
+
+Uso:
+    python carga.py --base-url http://localhost:8000 --duracao 10
+"""
+
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+from time import perf_counter, perf_counter_ns
+
+from experimento import ExperimentoAPI, REST_BASE_URL
+from gravacao import GravadorCSV, ler_resultados
+from instrumentacao import ClienteHTTP, coletor
+
+NIVEIS_CONCORRENCIA = [1, 2, 4, 8, 16, 32, 64]
+DURACAO_NIVEL = 10  # segundos por braço e nível
+
+# Requisições simultâneas de um cliente REST-paralelo (consulta 3)
+REQUISICOES_POR_CLIENTE = 4
+
+# Espera de um cliente após uma falha (dobra a cada falha seguida, até o máximo)
+ESPERA_ERRO_S = 0.1
+ESPERA_ERRO_MAX_S = 5.0
+
+CAMPOS_CARGA = [
+    'consulta', 'tipo_api', 'concorrencia', 'duracao_s', 'requisicoes', 'erros',
+    'vazao_rps', 'latencia_media_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'p999_ms', 'max_ms',
+    'intervalo_esperado_ms', 'p50_corrigido_ms', 'p90_corrigido_ms',
+    'p99_corrigido_ms', 'p999_corrigido_ms', 'max_corrigido_ms'
+]
+
+
+class HistogramaLatencia:
+    """
+    Histograma log-linear de latências em microssegundos (estilo HdrHistogram)
+
+    Valores abaixo de 2048 µs são exatos; acima disso cada potência de 2 é
+    dividida em 1024 faixas, o que mantém o erro relativo abaixo de 0,1%.
+    """
+
+    BITS_SUB = 11
+    SUB_BALDES = 1 << BITS_SUB
+    METADE = SUB_BALDES >> 1
+
+    def __init__(self):
+        self.contagens = Counter()
+        self.total = 0
+        self.soma = 0
+
+    @classmethod
+    def _indice(cls, valor):
+        if valor < cls.SUB_BALDES:
+            return valor
+        expoente = valor.bit_length() - cls.BITS_SUB
+        return (expoente + 1) * cls.METADE + ((valor >> expoente) - cls.METADE)
+
+    @classmethod
+    def _maior_equivalente(cls, indice):
+        """Maior valor representado pela faixa do índice"""
+        if indice < cls.SUB_BALDES:
+            return indice
+        expoente = indice // cls.METADE - 1
+        sub = indice % cls.METADE + cls.METADE
+        return ((sub + 1) << expoente) - 1
+
+    def registrar(self, valor_us, contagem=1):
+        valor_us = max(0, int(valor_us))
+        self.contagens[self._indice(valor_us)] += contagem
+        self.total += contagem
+        self.soma += valor_us * contagem
+
+    def registrar_corrigido(self, valor_us, intervalo_us, contagem=1):
+        """
+        Registra o valor e as amostras que o cliente deixou de enviar
+        enquanto esperava (como recordValueWithExpectedInterval do HdrHistogram)
+        """
+        self.registrar(valor_us, contagem)
+        if intervalo_us <= 0:
+            return
+        faltante = valor_us - intervalo_us
+        while faltante >= intervalo_us:
+            self.registrar(faltante, contagem)
+            faltante -= intervalo_us
+
+    def mesclar(self, outro):
+        self.contagens.update(outro.contagens)
+        self.total += outro.total
+        self.soma += outro.soma
+
+    def copia_corrigida(self, intervalo_us):
+        """Novo histograma com a correção de omissão coordenada aplicada"""
+        corrigido = HistogramaLatencia()
+        for indice, contagem in self.contagens.items():
+            corrigido.registrar_corrigido(self._maior_equivalente(indice), intervalo_us, contagem)
+        return corrigido
+
+    def percentil(self, p):
+        """Valor (µs) abaixo do qual estão p% das amostras"""
+        if self.total == 0:
+            return 0
+        alvo = max(1, -(-self.total * p // 100))
+        acumulado = 0
+        for indice in sorted(self.contagens):
+            acumulado += self.contagens[indice]
+            if acumulado >= alvo:
+                return self._maior_equivalente(indice)
+        return self.maximo()
+
+    def maximo(self):
+        return self._maior_equivalente(max(self.contagens)) if self.contagens else 0
+
+    def media(self):
+        return self.soma / self.total if self.total else 0.0
+
+
+def _cliente_em_laco(funcao, fim, histograma, erros, indice):
+    """
+    Um cliente: requisições em sequência até o fim do nível
+
+    Falhas são contadas em erros[indice] e seguidas de uma espera crescente,
+    para não martelar um servidor que está recusando conexões.
+    """
+    espera = ESPERA_ERRO_S
+    while perf_counter() < fim:
+        inicio = perf_counter_ns()
+        try:
+            funcao()
+        except Exception:
+            erros[indice] += 1
+            time.sleep(max(0.0, min(espera, fim - perf_counter())))
+            espera = min(espera * 2, ESPERA_ERRO_MAX_S)
+            continue
+        espera = ESPERA_ERRO_S
+        histograma.registrar((perf_counter_ns() - inicio) // 1000)
+
+
+def executar_nivel(funcao, concorrencia, duracao):
+    """
+    Executa um braço com N clientes simultâneos durante `duracao` segundos
+
+    Returns:
+        tuple: (histograma, erros, duracao_real_s)
+    """
+    histogramas = [HistogramaLatencia() for _ in range(concorrencia)]
+    erros = [0] * concorrencia
+    coletor.iniciar()
+
+    inicio = perf_counter()
+    fim = inicio + duracao
+    clientes = [
+        threading.Thread(target=_cliente_em_laco, args=(funcao, fim, h, erros, i))
+        for i, h in enumerate(histogramas)
+    ]
+    for cliente in clientes:
+        cliente.start()
+    for cliente in clientes:
+        cliente.join()
+    duracao_real = perf_counter() - inicio
+
+    histograma = HistogramaLatencia()
+    for h in histogramas:
+        histograma.mesclar(h)
+    coletor.iniciar()
+    return histograma, sum(erros), duracao_real
+
+
+def executar_varredura(experimento, niveis=NIVEIS_CONCORRENCIA, duracao=DURACAO_NIVEL,
+                       gravador=None, anteriores=()):
+    """
+    Varre os níveis de concorrência para todas as consultas e braços
+
+    O nível 1 é incluído se faltar e medido antes dos demais: dele sai o
+    intervalo esperado da correção de omissão coordenada de cada braço.
+
+    Args:
+        gravador: GravadorCSV que recebe cada nível assim que ele termina
+        anteriores: linhas de uma varredura interrompida (níveis já medidos
+            são pulados e seus intervalos esperados reaproveitados)
+
+    Returns:
+        list de dicts com as colunas de CAMPOS_CARGA
+    """
+    niveis = sorted(set(niveis) | {1})
+    # Um único pool persistente, grande o bastante para o maior nível
+    experimento.http = ClienteHTTP(persistente=True,
+                                   tamanho_pool=max(niveis) * REQUISICOES_POR_CLIENTE)
+    linhas = list(anteriores)
+    feitos = {(l['consulta'], l['tipo_api'], l['concorrencia']) for l in anteriores}
+    intervalos = {(l['consulta'], l['tipo_api']): round(l['intervalo_esperado_ms'] * 1000)
+                  for l in anteriores if l['concorrencia'] == 1}
+
+    try:
+        for nome, funcoes in experimento.consultas():
+            if all((nome, t, c) in feitos for c in niveis for t in funcoes):
+                continue
+
+            print(f"\n{'='*60}")
+            print(f"Carga: {nome}")
+            print(f"{'='*60}")
+
+            # Aquecimento: abre as conexões antes do primeiro nível
+            for funcao in funcoes.values():
+                funcao()
+
+            for concorrencia in niveis:
+                tipos = random.sample(list(funcoes), len(funcoes))
+                for tipo in tipos:
+                    if (nome, tipo, concorrencia) in feitos:
+                        continue
+                    histograma, erros, duracao_real = executar_nivel(funcoes[tipo], concorrencia, duracao)
+
+                    # Intervalo esperado: latência mediana com um único cliente
+                    if concorrencia == 1:
+                        intervalos[(nome, tipo)] = histograma.percentil(50)
+                    intervalo = intervalos[(nome, tipo)]
+                    corrigido = histograma.copia_corrigida(intervalo)
+
+                    linha = {
+                        'consulta': nome,
+                        'tipo_api': tipo,
+                        'concorrencia': concorrencia,
+                        'duracao_s': round(duracao_real, 3),
+                        'requisicoes': histograma.total,
+                        'erros': erros,
+                        'vazao_rps': histograma.total / duracao_real,
+                        'latencia_media_ms': histograma.media() / 1000,
+                        'p50_ms': histograma.percentil(50) / 1000,
+                        'p90_ms': histograma.percentil(90) / 1000,
+                        'p99_ms': histograma.percentil(99) / 1000,
+                        'p999_ms': histograma.percentil(99.9) / 1000,
+                        'max_ms': histograma.maximo() / 1000,
+                        'intervalo_esperado_ms': intervalo / 1000,
+                        'p50_corrigido_ms': corrigido.percentil(50) / 1000,
+                        'p90_corrigido_ms': corrigido.percentil(90) / 1000,
+                        'p99_corrigido_ms': corrigido.percentil(99) / 1000,
+                        'p999_corrigido_ms': corrigido.percentil(99.9) / 1000,
+                        'max_corrigido_ms': corrigido.maximo() / 1000,
+                    }
+                    linhas.append(linha)
+                    if gravador is not None:
+                        gravador.gravar(linha)
+                    print(f"{tipo:>13} x{concorrencia:<3} {linha['vazao_rps']:8.1f} req/s | "
+                          f"p50 {linha['p50_ms']:.1f}ms | p99 {linha['p99_ms']:.1f}ms "
+                          f"(corrigido {linha['p99_corrigido_ms']:.1f}ms) | erros {erros}")
+    finally:
+        experimento.http.fechar()
+
+    return linhas
+
+
+def main():
+    """Executa a varredura de concorrência"""
+    parser = argparse.ArgumentParser(description='Lab 05 - modo de carga (varredura de concorrência)')
+    parser.add_argument('--base-url', required=True,
+                        help='URL base da API REST do servidor sob carga (ex.: servidor_local.py)')
+    parser.add_argument('--graphql-url',
+                        help='Endpoint GraphQL (padrão: <base-url>/graphql)')
+    parser.add_argument('--duracao', type=float, default=DURACAO_NIVEL,
+                        help='Segundos por braço em cada nível')
+    parser.add_argument('--concorrencias', type=int, nargs='+', default=NIVEIS_CONCORRENCIA,
+                        help='Níveis de concorrência (o nível 1 é sempre incluído)')
+    parser.add_argument('-o', '--output', default='resultados_carga.csv')
+    parser.add_argument('--retomar', action='store_true',
+                        help='Continua uma varredura interrompida no arquivo de saída')
+    args = parser.parse_args()
+
+    if urlparse(args.base_url).hostname == urlparse(REST_BASE_URL).hostname:
+        print("\n⚠️  O modo de carga não roda contra a API do GitHub: use --base-url com o servidor local")
+        return
+
+    graphql_url = args.graphql_url or f"{args.base_url.rstrip('/')}/graphql"
+    experimento = ExperimentoAPI(rest_base_url=args.base_url.rstrip('/'), graphql_url=graphql_url)
+
+    print("="*60)
+    print("MODO DE CARGA: GraphQL vs REST")
+    print("="*60)
+    print(f"REST: {experimento.rest_base_url} | GraphQL: {experimento.graphql_url}")
+    print(f"Concorrência: {', '.join(map(str, sorted(set(args.concorrencias) | {1})))} | {args.duracao}s por nível")
+
+    anteriores = ler_resultados(args.output, campos_texto=('consulta', 'tipo_api')) if args.retomar else []
+    if anteriores:
+        print(f"Retomando {args.output}: {len(anteriores)} níveis já medidos")
+
+    # Níveis duram vários segundos: cada linha é sincronizada com o disco
+    with GravadorCSV(args.output, CAMPOS_CARGA, retomar=args.retomar, lote=1) as gravador:
+        executar_varredura(experimento, args.concorrencias, args.duracao, gravador, anteriores)
+    print(f"\nVarredura salva em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
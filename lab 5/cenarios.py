@@ -0,0 +1,95 @@
+"""
+Lab 05 - Catálogo de Cenários
+Lê cenarios.json, que declara cada consulta do experimento sem código:
+
+- nome, descricao, complexidade e itens retornados (metadados do dashboard)
+- variaveis: valores usados nos caminhos REST e na query GraphQL
+- rest: endpoints com chave (nome da parte na resposta combinada), caminho
+  ({variavel}, e {chave[campo]} para usar a resposta de um endpoint
+  anterior) e depende_de (chaves das respostas de que o caminho precisa)
+- graphql: documento equivalente, uma linha por item da lista
+
+O braço REST faz os endpoints em sequência, na ordem do arquivo; o
+REST-paralelo (cenários com endpoints independentes) dispara juntos os
+endpoints de cada nível de dependência.
+"""
+
+import os
+import re
+import json
+
+ARQUIVO_CENARIOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cenarios.json')
+
+
+class Cenario:
+    """Uma consulta do catálogo"""
+
+    def __init__(self, definicao):
+        self.nome = definicao['nome']
+        self.descricao = definicao.get('descricao', '')
+        self.complexidade = definicao['complexidade']
+        self.itens = definicao['itens']
+        self.variaveis = definicao.get('variaveis', {})
+        self.endpoints = [{'depende_de': [], **endpoint} for endpoint in definicao['rest']]
+        graphql = definicao['graphql']
+        self.query = '\n'.join(graphql) + '\n' if isinstance(graphql, list) else graphql
+        self._validar()
+
+    def _validar(self):
+        """Dependências precisam vir antes no arquivo (o braço REST segue essa ordem)"""
+        vistas = set()
+        for endpoint in self.endpoints:
+            for dependencia in endpoint['depende_de']:
+                if dependencia not in vistas:
+                    raise ValueError(f"{self.nome}: o endpoint '{endpoint['chave']}' depende de "
+                                     f"'{dependencia}', que não foi declarado antes dele")
+            if endpoint['chave'] in vistas:
+                raise ValueError(f"{self.nome}: chave '{endpoint['chave']}' repetida")
+            vistas.add(endpoint['chave'])
+
+    @property
+    def num_endpoints(self):
+        return len(self.endpoints)
+
+    def niveis(self):
+        """Endpoints agrupados por nível: cada um depende apenas de níveis anteriores"""
+        nivel = {}
+        for endpoint in self.endpoints:
+            nivel[endpoint['chave']] = max((nivel[d] + 1 for d in endpoint['depende_de']), default=0)
+        return [[e for e in self.endpoints if nivel[e['chave']] == n]
+                for n in range(max(nivel.values(), default=-1) + 1)]
+
+    @property
+    def paralelizavel(self):
+        """Há endpoints que podem ser requisitados ao mesmo tempo"""
+        return any(len(nivel) > 1 for nivel in self.niveis())
+
+    def caminho(self, endpoint, variaveis, dependencias):
+        """
+        Caminho do endpoint com as variáveis preenchidas
+
+        Args:
+            dependencias: dict {chave: JSON decodificado} das respostas de depende_de
+        """
+        return endpoint['caminho'].format(**variaveis, **dependencias)
+
+    def variaveis_graphql(self, variaveis):
+        """Apenas as variáveis declaradas no documento GraphQL"""
+        declaradas = set(re.findall(r'\$(\w+)\s*:', self.query))
+        return {nome: valor for nome, valor in variaveis.items() if nome in declaradas}
+
+
+def carregar_cenarios(arquivo=ARQUIVO_CENARIOS):
+    """
+    Lê o catálogo de cenários
+
+    Returns:
+        list de Cenario, na ordem do arquivo
+    """
+    with open(arquivo, encoding='utf-8') as f:
+        cenarios = [Cenario(definicao) for definicao in json.load(f)['consultas']]
+    nomes = [c.nome for c in cenarios]
+    repetidos = {nome for nome in nomes if nomes.count(nome) > 1}
+    if repetidos:
+        raise ValueError(f"Cenários com nome repetido em {arquivo}: {', '.join(sorted(repetidos))}")
+    return cenarios
@@ -0,0 +1,16 @@
+"""
+Fixtures dos testes do Lab 05
+"""
+
+import pytest
+
+from servidor_local import iniciar_servidor
+
+
+@pytest.fixture(scope='module')
+def servidor():
+    """URL base do servidor local com relógio virtual (python servidor_local.py --relogio-virtual)"""
+    servidor = iniciar_servidor(porta=0, relogio_virtual=True)
+    yield f"http://127.0.0.1:{servidor.server_port}"
+    servidor.shutdown()
+    servidor.server_close()
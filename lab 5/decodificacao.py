@@ -0,0 +1,83 @@
+"""
+Lab 05 - Custo de Decodificação das Respostas
+Mede, no cliente, quanto custa transformar o corpo JSON de cada resposta
+em objetos Python, com decodificadores intercambiáveis (json da biblioteca
+padrão e orjson, quando instalado):
+
+- Tempo de parede (perf_counter) e de CPU do processo (process_time)
+- Pico de memória alocada durante a decodificação (tracemalloc)
+- Número de objetos criados (dicts, listas, strings, números...)
+
+O tempo é medido numa passada sem tracemalloc, que deixa a decodificação
+várias vezes mais lenta; a memória, numa segunda passada.
+"""
+
+import json
+import tracemalloc
+from time import perf_counter_ns, process_time_ns
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DECODIFICADORES = {'json': json.loads}
+if orjson is not None:
+    DECODIFICADORES['orjson'] = orjson.loads
+
+# Colunas adicionadas aos resultados
+CAMPOS_DECODIFICACAO = ['decod_tempo_ms', 'decod_cpu_ms', 'decod_memoria_pico_bytes', 'decod_objetos']
+
+
+def contar_objetos(dados):
+    """Número de objetos na árvore decodificada (contêineres e valores)"""
+    total = 0
+    pendentes = [dados]
+    while pendentes:
+        objeto = pendentes.pop()
+        total += 1
+        if isinstance(objeto, dict):
+            total += len(objeto)  # chaves
+            pendentes.extend(objeto.values())
+        elif isinstance(objeto, list):
+            pendentes.extend(objeto)
+    return total
+
+
+def medir_decodificacao(corpos, decodificador='json'):
+    """
+    Decodifica os corpos de uma medição e mede o custo somado
+
+    Args:
+        corpos: list de bytes, um por resposta HTTP
+        decodificador: chave de DECODIFICADORES
+
+    Returns:
+        tuple: (list com os dados de cada corpo, dict com CAMPOS_DECODIFICACAO)
+    """
+    decodificar = DECODIFICADORES[decodificador]
+
+    inicio_cpu = process_time_ns()
+    inicio = perf_counter_ns()
+    dados = [decodificar(corpo) for corpo in corpos]
+    fim = perf_counter_ns()
+    fim_cpu = process_time_ns()
+
+    # Memória numa segunda passada; respeita um tracemalloc já ativo (-X tracemalloc)
+    ja_rastreando = tracemalloc.is_tracing()
+    if not ja_rastreando:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    copia = [decodificar(corpo) for corpo in corpos]
+    pico = tracemalloc.get_traced_memory()[1] - base
+    del copia
+    if not ja_rastreando:
+        tracemalloc.stop()
+
+    return dados, {
+        'decod_tempo_ms': (fim - inicio) / 1e6,
+        'decod_cpu_ms': (fim_cpu - inicio_cpu) / 1e6,
+        'decod_memoria_pico_bytes': pico,
+        'decod_objetos': sum(contar_objetos(d) for d in dados),
+    }
@@ -0,0 +1,222 @@
+"""
+Lab 05 - Estatísticas Incrementais do Experimento
+Acompanha cada braço (consulta × tipo_api × estado_conexao) medição a
+medição, sem guardar as amostras, para o resumo ao vivo, o relatório
+preliminar e a decisão de quando parar de medir:
+
+- Média e variância pelo algoritmo de Welford (mescláveis entre braços)
+- Quantis em fluxo pelo algoritmo P² (5 marcadores por quantil)
+- Meia-largura do intervalo de confiança da média (aproximação normal)
+- Estatística z de Welch entre dois braços e fronteira sequencial
+  conservadora (Bonferroni sobre o número máximo de olhadas)
+"""
+
+import math
+from bisect import insort
+from statistics import NormalDist
+
+# Quantis do tempo acompanhados em cada braço
+QUANTIS = (0.5, 0.9)
+
+
+class EstatisticaOnline:
+    """Média e variância incrementais de um braço do experimento"""
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+
+    def adicionar(self, valor):
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (valor - self.media)
+
+    def mesclar(self, outra):
+        """Nova estatística equivalente a ter visto as amostras das duas"""
+        resultado = EstatisticaOnline()
+        resultado.n = self.n + outra.n
+        if resultado.n == 0:
+            return resultado
+        delta = outra.media - self.media
+        resultado.media = self.media + delta * outra.n / resultado.n
+        resultado._m2 = self._m2 + outra._m2 + delta ** 2 * self.n * outra.n / resultado.n
+        return resultado
+
+    @property
+    def variancia(self):
+        """Variância amostral (n - 1)"""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def desvio(self):
+        return math.sqrt(self.variancia)
+
+    @property
+    def erro_padrao(self):
+        return self.desvio / math.sqrt(self.n) if self.n > 0 else math.inf
+
+    def meia_largura_ic(self, confianca=0.95):
+        """Meia-largura do IC da média"""
+        z = NormalDist().inv_cdf(0.5 + confianca / 2)
+        return z * self.erro_padrao
+
+    def largura_relativa_ic(self, confianca=0.95):
+        """Meia-largura do IC dividida pela média (inf sem dados suficientes)"""
+        if self.n < 2 or self.media == 0:
+            return math.inf
+        return self.meia_largura_ic(confianca) / abs(self.media)
+
+
+class QuantilP2:
+    """
+    Quantil p estimado em fluxo com 5 marcadores (Jain e Chlamtac, 1985)
+
+    As primeiras AMOSTRAS_EXATAS amostras são guardadas e o valor é exato
+    (o P² puro erra muito com poucas amostras); depois os 5 marcadores são
+    iniciados a partir delas e ajustados por interpolação parabólica a cada
+    nova amostra, com memória constante.
+    """
+
+    AMOSTRAS_EXATAS = 50
+
+    def __init__(self, p):
+        self.p = p
+        self.n = 0
+        self.amostras = []
+        self.alturas = None
+        self.posicoes = None
+        self.desejadas = None
+        self.incrementos = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def _iniciar_marcadores(self):
+        ultima = len(self.amostras) - 1
+        self.desejadas = [f * ultima for f in self.incrementos]
+        # Posições inteiras e estritamente crescentes entre 0 e a última
+        posicoes = [round(d) for d in self.desejadas]
+        for i in range(1, 5):
+            posicoes[i] = max(posicoes[i], posicoes[i - 1] + 1)
+        posicoes[4] = ultima
+        for i in range(3, -1, -1):
+            posicoes[i] = min(posicoes[i], posicoes[i + 1] - 1)
+        self.posicoes = posicoes
+        self.alturas = [self.amostras[i] for i in posicoes]
+        self.amostras = None
+
+    def adicionar(self, valor):
+        self.n += 1
+        if self.alturas is None:
+            insort(self.amostras, valor)
+            if len(self.amostras) == self.AMOSTRAS_EXATAS:
+                self._iniciar_marcadores()
+            return
+
+        q, n = self.alturas, self.posicoes
+        if valor < q[0]:
+            q[0] = valor
+            k = 0
+        elif valor >= q[4]:
+            q[4] = valor
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= valor < q[i + 1])
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desejadas[i] += self.incrementos[i]
+
+        for i in range(1, 4):
+            d = self.desejadas[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                parabolica = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if q[i - 1] < parabolica < q[i + 1]:
+                    q[i] = parabolica
+                else:
+                    q[i] += d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    def valor(self):
+        if self.alturas is not None:
+            return self.alturas[2]
+        q = self.amostras
+        if not q:
+            return math.nan
+        # Interpolação linear entre as amostras ordenadas (como numpy.percentile)
+        posicao = self.p * (len(q) - 1)
+        abaixo = int(posicao)
+        acima = min(abaixo + 1, len(q) - 1)
+        return q[abaixo] + (q[acima] - q[abaixo]) * (posicao - abaixo)
+
+
+class AcumuladorBraco:
+    """
+    Tempo, quantis, tamanhos e falhas de um braço do experimento
+
+    Amostras em quarentena (ruidosas, ver ruido.py) contam como medições
+    feitas, mas ficam fora das estatísticas.
+    """
+
+    def __init__(self):
+        self.tempo = EstatisticaOnline()
+        self.quantis = {p: QuantilP2(p) for p in QUANTIS}
+        self.tamanho = EstatisticaOnline()
+        self.bytes_rede = EstatisticaOnline()
+        self.falhas = 0
+        self.quarentena = 0
+
+    @property
+    def medicoes(self):
+        """Medições feitas no braço, incluindo as em quarentena"""
+        return self.tempo.n + self.quarentena
+
+    def adicionar(self, linha):
+        """Registra uma medição (linha do CSV de resultados)"""
+        self.tempo.adicionar(linha['tempo_ms'])
+        for quantil in self.quantis.values():
+            quantil.adicionar(linha['tempo_ms'])
+        self.tamanho.adicionar(linha['tamanho_bytes'])
+        if linha.get('bytes_corpo_comprimido') not in (None, ''):
+            self.bytes_rede.adicionar(linha['bytes_corpo_comprimido'] + linha['bytes_cabecalhos'])
+
+    def registrar_falha(self):
+        self.falhas += 1
+
+    def registrar_quarentena(self):
+        self.quarentena += 1
+
+    def resumo(self):
+        """Resumo do braço em um dict (valores em ms e bytes)"""
+        return {
+            'n': self.tempo.n,
+            'falhas': self.falhas,
+            'quarentena': self.quarentena,
+            'tempo_media': self.tempo.media,
+            'tempo_desvio': self.tempo.desvio,
+            **{f'tempo_p{round(p * 100)}': q.valor() for p, q in self.quantis.items()},
+            'tamanho_media': self.tamanho.media,
+            'bytes_rede_media': self.bytes_rede.media,
+        }
+
+
+def estatistica_welch(a, b):
+    """Estatística z de Welch para a diferença entre as médias de dois braços"""
+    erro = math.sqrt(a.variancia / a.n + b.variancia / b.n) if a.n and b.n else 0.0
+    if erro == 0:
+        return 0.0 if a.media == b.media else math.inf
+    return (a.media - b.media) / erro
+
+
+def fronteira_sequencial(alfa, max_olhadas):
+    """
+    Valor crítico de |z| para testes repetidos a cada rodada.
+
+    Divide alfa entre todas as olhadas possíveis, então a taxa de falso
+    positivo fica abaixo de alfa mesmo testando após cada rodada.
+    """
+    return NormalDist().inv_cdf(1 - alfa / (2 * max(1, max_olhadas)))
@@ -5,13 +5,23 @@ Sprint 1: Preparação do Experimento
 Este script prepara e executa o experimento para comparar APIs GraphQL e REST
 """
 
-import requests
 import time
 import json
 import csv
 import random
+import argparse
+import itertools
 from datetime import datetime
-import statistics
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, reduce
+
+from instrumentacao import (ClienteHTTP, CAMPOS_FASES, CAMPOS_BYTES, CAMPOS_COMPRESSAO,
+                            CAMPOS_RATELIMIT, CODIFICACOES_SUPORTADAS, coletor)
+from gravacao import GravadorCSV, ler_resultados
+from decodificacao import DECODIFICADORES, CAMPOS_DECODIFICACAO, medir_decodificacao
+from estatistica_online import AcumuladorBraco, estatistica_welch, fronteira_sequencial
+from ruido import CAMPOS_RUIDO, monitor
+from cenarios import ARQUIVO_CENARIOS, carregar_cenarios
 
 # Configurações
 GITHUB_TOKEN = "SEU_TOKEN_AQUI"  # Token do GitHub
@@ -27,302 +37,430 @@ HEADERS_GRAPHQL = {
 REST_BASE_URL = "https://api.github.com"
 GRAPHQL_URL = "https://api.github.com/graphql"
 
-# Número de repetições por consulta
+# Número de repetições por consulta (máximo, no modo sequencial)
 REPETICOES = 30
 DELAY_ENTRE_REQUESTS = 1  # segundos
 
+# Amostragem sequencial: as medições são feitas em rodadas (cada rodada mede
+# todas as combinações uma vez, em ordem sorteada) e a consulta para quando
+# todos os ICs atingem a largura alvo ou todas as comparações com o GraphQL
+# cruzam a fronteira do teste sequencial
+AMOSTRAGEM_SEQUENCIAL = True
+MIN_REPETICOES = 10
+LARGURA_IC_RELATIVA = 0.05  # meia-largura do IC 95% / média
+ALFA = 0.05
+
+# O desenho padrão compara apenas REST e GraphQL; os demais braços e fatores
+# multiplicam as medições contra a API e são ligados por opção (ver main)
+
+# Estado da conexão (fator opcional, --conexao-quente):
+# - fria: conexão nova a cada requisição (custo de DNS/TCP/TLS incluso)
+# - quente: sessão persistente, conexões reaproveitadas após aquecimento
+ESTADOS_CONEXAO = ['fria']
+ESTADOS_CONEXAO_FATOR = ['fria', 'quente']
+
+# Compressão (fator opcional, --compressao): Accept-Encoding enviado em cada
+# medição - identity, gzip e br (apenas com o pacote brotli instalado);
+# sem a opção, todas as medições pedem gzip
+CODIFICACOES = ['gzip']
+CODIFICACOES_FATOR = CODIFICACOES_SUPORTADAS
+
+# Decodificador do corpo JSON (fator do experimento): alterna a cada rodada
+# de cada braço; o custo da decodificação fica fora de tempo_ms
+DECODIFICADORES_EXPERIMENTO = list(DECODIFICADORES)
+
+# Custo de cada query GraphQL em pontos do limite: acrescenta rateLimit { cost }
+# às queries (a resposta GraphQL cresce cerca de 30 bytes)
+CONSULTAR_CUSTO_GRAPHQL = True
+
+# Amostras ruidosas (pausa do GC, CPU ocupada, sistema carregado; ver ruido.py)
+# são gravadas, mas ficam fora das estatísticas do braço e do critério de parada
+QUARENTENA_RUIDO = True
+
+# Colunas do arquivo de resultados
+CAMPOS_RESULTADO = (['consulta', 'tipo_api', 'estado_conexao', 'codificacao', 'decodificador',
+                     'tempo_ms', 'tamanho_bytes', 'timestamp']
+                    + CAMPOS_FASES + CAMPOS_BYTES + CAMPOS_COMPRESSAO + CAMPOS_DECODIFICACAO
+                    + CAMPOS_RATELIMIT + ['custo_graphql'] + CAMPOS_RUIDO)
+
+
+def com_custo(query):
+    """Query com o campo rateLimit { cost } no nível raiz (se CONSULTAR_CUSTO_GRAPHQL)"""
+    if not CONSULTAR_CUSTO_GRAPHQL:
+        return query
+    return query.rstrip().rsplit('}', 1)[0] + "  rateLimit {\n    cost\n  }\n}\n"
+
+
+def custo_graphql(dados):
+    """Soma de rateLimit.cost das respostas decodificadas ('' se nenhuma informa o custo)"""
+    custos = [d['data']['rateLimit']['cost'] for d in dados
+              if isinstance(d, dict) and isinstance(d.get('data'), dict) and d['data'].get('rateLimit')]
+    return sum(custos) if custos else ''
+
+
+class CombinedResponse:
+    """
+    Resposta simulada que agrega várias requisições REST.
+
+    Guarda as respostas originais; o JSON combinado só é montado quando
+    pedido, fora do trecho cronometrado.
+    """
+    def __init__(self, respostas):
+        self.respostas = respostas
+        self._json = None
+    
+    def json(self):
+        if self._json is None:
+            self._json = {chave: resposta.json() for chave, resposta in self.respostas.items()}
+        return self._json
+    
+    @property
+    def content(self):
+        return json.dumps(self.json()).encode('utf-8')
+    
+    def corpos(self):
+        """Corpos das respostas originais, como recebidos"""
+        return [resposta.content for resposta in self.respostas.values()]
+
+
 class ExperimentoAPI:
     """Classe para executar o experimento comparativo entre GraphQL e REST"""
     
-    def __init__(self):
+    def __init__(self, rest_base_url=REST_BASE_URL, graphql_url=GRAPHQL_URL,
+                 delay=DELAY_ENTRE_REQUESTS, cenarios=None, rest_paralelo=False,
+                 estados_conexao=ESTADOS_CONEXAO, codificacoes=CODIFICACOES):
+        self.rest_base_url = rest_base_url
+        self.graphql_url = graphql_url
+        self.delay = delay
+        # Braços e níveis medidos por executar_experimento_completo
+        self.rest_paralelo = rest_paralelo
+        self.estados_conexao = list(estados_conexao)
+        self.codificacoes = list(codificacoes)
+        # Consultas do experimento (ver cenarios.py)
+        self.cenarios = cenarios if cenarios is not None else carregar_cenarios()
         self.resultados = []
+        # Estatísticas incrementais de cada braço:
+        # {(consulta, tipo_api, estado_conexao, codificacao): AcumuladorBraco}
+        self.acumuladores = {}
+        self.gravador = None
+        self.clientes = {
+            'fria': ClienteHTTP(),
+            'quente': ClienteHTTP(persistente=True)
+        }
+        # Cliente usado pelas consultas; trocado a cada medição em executar_consulta
+        self.http = self.clientes['fria']
     
-    def medir_tempo_tamanho(self, funcao_request):
+    def aquecer(self, funcoes):
+        """
+        Executa cada função uma vez, sem medir, no cliente quente, para que
+        as medições seguintes encontrem as conexões já abertas no pool
+        """
+        self.http = self.clientes['quente']
+        for func in funcoes:
+            try:
+                func()
+            except Exception as e:
+                print(f"Erro no aquecimento: {e}")
+    
+    def acumulador(self, consulta, tipo, estado, codificacao):
+        """Acumulador do braço, criado na primeira medição"""
+        chave = (consulta, tipo, estado, codificacao)
+        if chave not in self.acumuladores:
+            self.acumuladores[chave] = AcumuladorBraco()
+        return self.acumuladores[chave]
+    
+    def iniciar_gravacao(self, arquivo='resultados_experimento.csv', retomar=False):
+        """
+        Passa a anexar cada medição ao CSV assim que ela termina
+        
+        Com retomar=True, as medições já gravadas no arquivo são carregadas
+        e executar_consulta mede apenas o que falta em cada combinação.
+        """
+        if retomar:
+            self.resultados = ler_resultados(
+                arquivo, campos_texto=('consulta', 'tipo_api', 'estado_conexao', 'codificacao',
+                                       'codificacao_recebida', 'decodificador', 'ratelimit_recurso',
+                                       'ruido', 'timestamp'))
+            for r in self.resultados:
+                braco = self.acumulador(r['consulta'], r['tipo_api'], r['estado_conexao'], r['codificacao'])
+                self.registrar_no_braco(braco, r)
+            print(f"Retomando {arquivo}: {len(self.resultados)} medições já gravadas")
+        self.gravador = GravadorCSV(arquivo, CAMPOS_RESULTADO, retomar=retomar)
+    
+    def registrar_no_braco(self, braco, linha):
+        """Acumula a medição no braço, ou a põe em quarentena se for ruidosa"""
+        if QUARENTENA_RUIDO and linha.get('ruido'):
+            braco.registrar_quarentena()
+        else:
+            braco.adicionar(linha)
+    
+    def fechar(self):
+        """Encerra as conexões persistentes e grava o que estiver pendente"""
+        for cliente in self.clientes.values():
+            cliente.fechar()
+        if self.gravador is not None:
+            self.gravador.fechar()
+    
+    def medir_tempo_tamanho(self, funcao_request, decodificador='json'):
         """
         Executa uma requisição e mede tempo de resposta e tamanho
         
+        Depois do trecho cronometrado, decodifica o JSON de cada resposta com
+        o decodificador indicado e mede o custo (ver decodificacao.py).
+        
         Returns:
-            tuple: (tempo_ms, tamanho_bytes, sucesso, dados)
+            tuple: (tempo_ms, tamanho_bytes, sucesso, dados, extras)
+            extras: dict com o tempo de cada fase (fase_*_ms), os bytes
+                    transferidos (bytes_*), o custo de decodificação
+                    (decod_*) e o consumo do limite de requisições
+                    (ratelimit_*, custo_graphql), somados entre requisições,
+                    e os sinais de ruído do cliente (ver ruido.py)
         """
         try:
-            inicio = time.time()
+            coletor.iniciar()
+            monitor.iniciar()
+            inicio = time.perf_counter_ns()
             resposta = funcao_request()
-            fim = time.time()
+            fim = time.perf_counter_ns()
             
-            tempo_ms = (fim - inicio) * 1000  # Converter para milissegundos
-            tamanho_bytes = len(resposta.content)
+            # Converter para milissegundos (+ latência virtual do servidor local, se houver)
+            tempo_ms = (fim - inicio) / 1e6 + coletor.atraso_virtual_ms()
+            ruido = monitor.finalizar(tempo_ms)
+            extras = coletor.resumo()
+            extras.update(ruido)
+            # Corpo descomprimido somado entre as requisições, como recebido
+            tamanho_bytes = extras['bytes_corpo']
             
-            return tempo_ms, tamanho_bytes, True, resposta.json()
+            # Custo de decodificação, fora do trecho cronometrado
+            combinada = isinstance(resposta, CombinedResponse)
+            corpos = resposta.corpos() if combinada else [resposta.content]
+            dados, custo = medir_decodificacao(corpos, decodificador)
+            extras.update(custo)
+            extras['custo_graphql'] = custo_graphql(dados)
+            dados = dict(zip(resposta.respostas, dados)) if combinada else dados[0]
+            
+            return tempo_ms, tamanho_bytes, True, dados, extras
         except Exception as e:
             print(f"Erro na requisição: {e}")
-            return None, None, False, None
-    
-    # ========== CONSULTA 1: SIMPLES - Informações básicas de um repositório ==========
+            return None, None, False, None, {}
     
-    def consulta1_rest(self, owner="torvalds", repo="linux"):
-        """REST: Buscar informações básicas de um repositório"""
-        url = f"{REST_BASE_URL}/repos/{owner}/{repo}"
-        return requests.get(url, headers=HEADERS_REST)
-    
-    def consulta1_graphql(self, owner="torvalds", repo="linux"):
-        """GraphQL: Buscar informações básicas de um repositório"""
-        query = """
-        query($owner: String!, $repo: String!) {
-          repository(owner: $owner, name: $repo) {
-            name
-            description
-            stargazerCount
-            forkCount
-            createdAt
-            updatedAt
-          }
-        }
+    def buscar_em_paralelo(self, requisicoes):
         """
-        variables = {"owner": owner, "repo": repo}
-        payload = {"query": query, "variables": variables}
-        return requests.post(GRAPHQL_URL, headers=HEADERS_GRAPHQL, json=payload)
-    
-    # ========== CONSULTA 2: MÉDIA - Repositório com issues ==========
-    
-    def consulta2_rest(self, owner="facebook", repo="react"):
-        """REST: Buscar repositório e suas issues (requer múltiplas requisições)"""
-        # Primeira requisição: dados do repo
-        repo_response = requests.get(
-            f"{REST_BASE_URL}/repos/{owner}/{repo}", 
-            headers=HEADERS_REST
-        )
-        # Segunda requisição: issues
-        issues_response = requests.get(
-            f"{REST_BASE_URL}/repos/{owner}/{repo}/issues?per_page=10&state=all",
-            headers=HEADERS_REST
-        )
-        # Combinar resultados
-        combined_data = {
-            "repository": repo_response.json(),
-            "issues": issues_response.json()
-        }
-        # Criar objeto de resposta simulado
-        class CombinedResponse:
-            def __init__(self, data):
-                self.content = json.dumps(data).encode('utf-8')
-                self._json = data
-            def json(self):
-                return self._json
+        Executa requisições REST independentes ao mesmo tempo
         
-        return CombinedResponse(combined_data)
-    
-    def consulta2_graphql(self, owner="facebook", repo="react"):
-        """GraphQL: Buscar repositório e suas issues (uma única requisição)"""
-        query = """
-        query($owner: String!, $repo: String!) {
-          repository(owner: $owner, name: $repo) {
-            name
-            description
-            stargazerCount
-            issues(first: 10) {
-              nodes {
-                title
-                state
-                createdAt
-                author {
-                  login
-                }
-              }
-            }
-          }
-        }
+        Args:
+            requisicoes: dict {chave: função sem argumentos que faz a requisição}
+        
+        Returns:
+            CombinedResponse com a resposta de cada requisição na sua chave
         """
-        variables = {"owner": owner, "repo": repo}
-        payload = {"query": query, "variables": variables}
-        return requests.post(GRAPHQL_URL, headers=HEADERS_GRAPHQL, json=payload)
+        with ThreadPoolExecutor(max_workers=len(requisicoes)) as executor:
+            futuros = {chave: executor.submit(func) for chave, func in requisicoes.items()}
+            respostas = {chave: futuro.result() for chave, futuro in futuros.items()}
+        return CombinedResponse(respostas)
     
-    # ========== CONSULTA 3: COMPLEXA - Repositório com issues, PRs e contributors ==========
+    def requisitar_endpoint(self, cenario, endpoint, variaveis, respostas):
+        """GET de um endpoint REST do cenário (dependências lidas das respostas anteriores)"""
+        dependencias = {chave: respostas[chave].json() for chave in endpoint['depende_de']}
+        url = f"{self.rest_base_url}{cenario.caminho(endpoint, variaveis, dependencias)}"
+        return self.http.get(url, headers=HEADERS_REST)
     
-    def consulta3_rest(self, owner="microsoft", repo="vscode"):
-        """REST: Dados complexos (múltiplas requisições)"""
-        repo_response = requests.get(
-            f"{REST_BASE_URL}/repos/{owner}/{repo}",
-            headers=HEADERS_REST
-        )
-        issues_response = requests.get(
-            f"{REST_BASE_URL}/repos/{owner}/{repo}/issues?per_page=5",
-            headers=HEADERS_REST
-        )
-        pulls_response = requests.get(
-            f"{REST_BASE_URL}/repos/{owner}/{repo}/pulls?per_page=5",
-            headers=HEADERS_REST
-        )
-        contributors_response = requests.get(
-            f"{REST_BASE_URL}/repos/{owner}/{repo}/contributors?per_page=5",
-            headers=HEADERS_REST
-        )
-        
-        combined_data = {
-            "repository": repo_response.json(),
-            "issues": issues_response.json(),
-            "pulls": pulls_response.json(),
-            "contributors": contributors_response.json()
-        }
-        
-        class CombinedResponse:
-            def __init__(self, data):
-                self.content = json.dumps(data).encode('utf-8')
-                self._json = data
-            def json(self):
-                return self._json
+    def executar_rest(self, cenario, variaveis=None):
+        """
+        REST: endpoints do cenário em sequência
         
-        return CombinedResponse(combined_data)
-    
-    def consulta3_graphql(self, owner="microsoft", repo="vscode"):
-        """GraphQL: Dados complexos (uma única requisição)"""
-        query = """
-        query($owner: String!, $repo: String!) {
-          repository(owner: $owner, name: $repo) {
-            name
-            description
-            stargazerCount
-            issues(first: 5) {
-              nodes {
-                title
-                state
-              }
-            }
-            pullRequests(first: 5) {
-              nodes {
-                title
-                state
-              }
-            }
-            mentionableUsers(first: 5) {
-              nodes {
-                login
-                name
-              }
-            }
-          }
-        }
+        Returns:
+            a resposta, com um único endpoint; senão CombinedResponse
         """
-        variables = {"owner": owner, "repo": repo}
-        payload = {"query": query, "variables": variables}
-        return requests.post(GRAPHQL_URL, headers=HEADERS_GRAPHQL, json=payload)
+        variaveis = {**cenario.variaveis, **(variaveis or {})}
+        respostas = {}
+        for endpoint in cenario.endpoints:
+            respostas[endpoint['chave']] = self.requisitar_endpoint(cenario, endpoint, variaveis, respostas)
+        if len(respostas) == 1:
+            return next(iter(respostas.values()))
+        return CombinedResponse(respostas)
     
-    # ========== CONSULTA 4: LISTA - Múltiplos repositórios ==========
+    def executar_rest_paralelo(self, cenario, variaveis=None):
+        """REST-paralelo: os endpoints de cada nível de dependência disparados ao mesmo tempo"""
+        variaveis = {**cenario.variaveis, **(variaveis or {})}
+        respostas = {}
+        for nivel in cenario.niveis():
+            requisicoes = {e['chave']: partial(self.requisitar_endpoint, cenario, e, variaveis, respostas)
+                           for e in nivel}
+            respostas.update(self.buscar_em_paralelo(requisicoes).respostas)
+        return CombinedResponse(respostas)
     
-    def consulta4_rest(self, user="google"):
-        """REST: Buscar repositórios de uma organização"""
-        url = f"{REST_BASE_URL}/orgs/{user}/repos?per_page=10"
-        return requests.get(url, headers=HEADERS_REST)
+    def executar_graphql(self, cenario, variaveis=None):
+        """GraphQL: o documento do cenário numa única requisição"""
+        variaveis = {**cenario.variaveis, **(variaveis or {})}
+        payload = {"query": com_custo(cenario.query), "variables": cenario.variaveis_graphql(variaveis)}
+        return self.http.post(self.graphql_url, headers=HEADERS_GRAPHQL, json=payload)
     
-    def consulta4_graphql(self, user="google"):
-        """GraphQL: Buscar repositórios de uma organização"""
-        query = """
-        query($user: String!) {
-          organization(login: $user) {
-            repositories(first: 10) {
-              nodes {
-                name
-                description
-                stargazerCount
-              }
-            }
-          }
-        }
+    def consultas(self):
         """
-        variables = {"user": user}
-        payload = {"query": query, "variables": variables}
-        return requests.post(GRAPHQL_URL, headers=HEADERS_GRAPHQL, json=payload)
-    
-    # ========== CONSULTA 5: ANINHADA - Dados com múltiplos níveis ==========
-    
-    def consulta5_rest(self, owner="nodejs", repo="node"):
-        """REST: Repositório com commits recentes e seus autores"""
-        repo_response = requests.get(
-            f"{REST_BASE_URL}/repos/{owner}/{repo}",
-            headers=HEADERS_REST
-        )
-        commits_response = requests.get(
-            f"{REST_BASE_URL}/repos/{owner}/{repo}/commits?per_page=5",
-            headers=HEADERS_REST
-        )
+        Consultas do experimento, uma por cenário do catálogo
         
-        combined_data = {
-            "repository": repo_response.json(),
-            "commits": commits_response.json()
-        }
+        Returns:
+            list de (nome_consulta, {tipo_api: função sem argumentos})
+        """
+        consultas = []
+        for cenario in self.cenarios:
+            funcoes = {
+                'REST': partial(self.executar_rest, cenario),
+                'GraphQL': partial(self.executar_graphql, cenario),
+            }
+            if cenario.paralelizavel:
+                funcoes['REST-paralelo'] = partial(self.executar_rest_paralelo, cenario)
+            consultas.append((cenario.nome, funcoes))
+        return consultas
+    
+    def verificar_parada(self, estatisticas, max_rodadas):
+        """
+        Critério de parada do modo sequencial
         
-        class CombinedResponse:
-            def __init__(self, data):
-                self.content = json.dumps(data).encode('utf-8')
-                self._json = data
-            def json(self):
-                return self._json
+        Args:
+            estatisticas: dict {(tipo_api, estado_conexao, codificacao): EstatisticaOnline} do tempo
+            max_rodadas: número máximo de rodadas da consulta
         
-        return CombinedResponse(combined_data)
-    
-    def consulta5_graphql(self, owner="nodejs", repo="node"):
-        """GraphQL: Repositório com commits recentes e seus autores"""
-        query = """
-        query($owner: String!, $repo: String!) {
-          repository(owner: $owner, name: $repo) {
-            name
-            description
-            defaultBranchRef {
-              target {
-                ... on Commit {
-                  history(first: 5) {
-                    nodes {
-                      message
-                      author {
-                        name
-                        email
-                        date
-                      }
-                    }
-                  }
-                }
-              }
-            }
-          }
-        }
+        Returns:
+            str com o motivo da parada, ou None para continuar medindo
         """
-        variables = {"owner": owner, "repo": repo}
-        payload = {"query": query, "variables": variables}
-        return requests.post(GRAPHQL_URL, headers=HEADERS_GRAPHQL, json=payload)
+        larguras = [e.largura_relativa_ic() for e in estatisticas.values()]
+        if max(larguras) <= LARGURA_IC_RELATIVA:
+            return f"IC 95% com meia-largura ≤ {LARGURA_IC_RELATIVA:.0%} da média em todos os braços"
+        
+        # Olhadas possíveis: uma por rodada a partir de MIN_REPETICOES
+        fronteira = fronteira_sequencial(ALFA, max_rodadas - MIN_REPETICOES + 1)
+        comparacoes = [
+            abs(estatistica_welch(e, estatisticas[('GraphQL', *niveis)]))
+            for (tipo, *niveis), e in estatisticas.items() if tipo != 'GraphQL'
+        ]
+        if comparacoes and min(comparacoes) >= fronteira:
+            return f"todas as comparações com o GraphQL cruzaram |z| ≥ {fronteira:.2f}"
+        return None
     
-    def executar_consulta(self, nome_consulta, func_rest, func_graphql, repeticoes=REPETICOES):
+    def executar_consulta(self, nome_consulta, func_rest, func_graphql, repeticoes=REPETICOES,
+                          func_rest_paralelo=None, estados_conexao=ESTADOS_CONEXAO,
+                          codificacoes=CODIFICACOES, sequencial=AMOSTRAGEM_SEQUENCIAL):
         """
         Executa uma consulta múltiplas vezes alternando entre REST e GraphQL
+        (e REST-paralelo, quando a consulta tem endpoints independentes),
+        cruzados com o estado da conexão (fria/quente) e a compressão
+        negociada (Accept-Encoding)
+        
+        No modo sequencial, repeticoes é o máximo de rodadas; a consulta pode
+        parar a partir de MIN_REPETICOES (ver verificar_parada).
+        
+        Cada medição atualiza o acumulador do seu braço (self.acumuladores),
+        que alimenta o resumo parcial impresso a cada rodada e o critério de
+        parada. Medições já acumuladas (retomada) contam para as repetições.
         """
         print(f"\n{'='*60}")
         print(f"Executando: {nome_consulta}")
         print(f"{'='*60}")
         
-        # Lista para alternar de forma aleatória
-        ordem = ['REST', 'GraphQL'] * repeticoes
-        random.shuffle(ordem)
+        funcoes = {'REST': func_rest, 'GraphQL': func_graphql}
+        if func_rest_paralelo is not None:
+            funcoes['REST-paralelo'] = func_rest_paralelo
         
-        for i, tipo in enumerate(ordem):
-            print(f"Medição {i+1}/{len(ordem)} - {tipo}...", end=" ")
-            
-            if tipo == 'REST':
-                tempo, tamanho, sucesso, dados = self.medir_tempo_tamanho(func_rest)
-            else:
-                tempo, tamanho, sucesso, dados = self.medir_tempo_tamanho(func_graphql)
+        celulas = list(itertools.product(funcoes, estados_conexao, codificacoes))
+        bracos = {celula: self.acumulador(nome_consulta, *celula) for celula in celulas}
+        estatisticas = {celula: braco.tempo for celula, braco in bracos.items()}
+        
+        # Medições já feitas (retomada de um arquivo parcial)
+        concluidas = {celula: braco.medicoes for celula, braco in bracos.items()}
+        
+        total = sum(max(0, repeticoes - concluidas[c]) for c in celulas)
+        if total == 0:
+            print("Consulta já concluída.")
+            return
+        if any(concluidas.values()):
+            print(f"Retomando: {sum(concluidas.values())} medições já gravadas")
+        
+        if 'quente' in estados_conexao:
+            self.aquecer(funcoes.values())
+        
+        # Sequencial: uma rodada com cada combinação que ainda não chegou a ela;
+        # fixo: todas as medições que faltam sorteadas juntas
+        if sequencial:
+            blocos = [[c for c in celulas if concluidas[c] < rodada] for rodada in range(1, repeticoes + 1)]
+        else:
+            blocos = [[c for c in celulas for _ in range(repeticoes - concluidas[c])]]
+        i = 0
+        
+        for rodada, bloco in enumerate(blocos, 1):
+            # Critério avaliado com a rodada anterior completa; uma rodada
+            # interrompida pela queda é terminada antes, para manter os braços pareados
+            parcial = 0 < len(bloco) < len(celulas)
+            if sequencial and rodada > MIN_REPETICOES and not parcial:
+                motivo = self.verificar_parada(estatisticas, repeticoes)
+                if motivo:
+                    rodadas = min(e.n for e in estatisticas.values())
+                    print(f"⏹ Parada após {rodadas} rodadas: {motivo}")
+                    break
             
-            if sucesso:
-                self.resultados.append({
-                    'consulta': nome_consulta,
-                    'tipo_api': tipo,
-                    'tempo_ms': tempo,
-                    'tamanho_bytes': tamanho,
-                    'timestamp': datetime.now().isoformat()
-                })
-                print(f"✓ Tempo: {tempo:.2f}ms, Tamanho: {tamanho} bytes")
-            else:
-                print("✗ Falha")
+            # Lista para alternar de forma aleatória entre as combinações tipo × estado × compressão
+            ordem = random.sample(bloco, len(bloco))
             
-            # Delay para evitar rate limiting
-            time.sleep(DELAY_ENTRE_REQUESTS)
+            for tipo, estado, codificacao in ordem:
+                i += 1
+                print(f"Medição {i}/{total} - {tipo} ({estado}, {codificacao})...", end=" ")
+                
+                self.http = self.clientes[estado]
+                self.http.codificacao = codificacao
+                braco = bracos[(tipo, estado, codificacao)]
+                decodificador = DECODIFICADORES_EXPERIMENTO[braco.medicoes % len(DECODIFICADORES_EXPERIMENTO)]
+                tempo, tamanho, sucesso, dados, extras = self.medir_tempo_tamanho(funcoes[tipo], decodificador)
+                
+                if sucesso:
+                    linha = {
+                        'consulta': nome_consulta,
+                        'tipo_api': tipo,
+                        'estado_conexao': estado,
+                        'codificacao': codificacao,
+                        'decodificador': decodificador,
+                        'tempo_ms': tempo,
+                        'tamanho_bytes': tamanho,
+                        'timestamp': datetime.now().isoformat(),
+                        **extras
+                    }
+                    self.resultados.append(linha)
+                    if self.gravador is not None:
+                        self.gravador.gravar(linha)
+                    self.registrar_no_braco(braco, linha)
+                    aviso = f" ⚠ ruído: {linha['ruido']}" if linha['ruido'] else ""
+                    print(f"✓ Tempo: {tempo:.2f}ms, Tamanho: {tamanho} bytes{aviso}")
+                else:
+                    braco.registrar_falha()
+                    print("✗ Falha")
+                
+                # Resumo parcial a cada rodada (uma medição por combinação)
+                if i % len(celulas) == 0:
+                    self.imprimir_resumo_parcial(nome_consulta, celulas)
+                
+                # Delay para evitar rate limiting
+                time.sleep(self.delay)
+    
+    def imprimir_resumo_parcial(self, nome_consulta, celulas):
+        """Uma linha por tipo de API com média, p90 e IC de cada braço até aqui"""
+        for tipo in dict.fromkeys(celula[0] for celula in celulas):
+            bracos = {celula[1:]: self.acumuladores[(nome_consulta, *celula)]
+                      for celula in celulas if celula[0] == tipo}
+            partes = []
+            for niveis, braco in bracos.items():
+                if braco.tempo.n == 0:
+                    continue
+                parte = (f"{'/'.join(niveis)} {braco.tempo.media:.1f}ms "
+                         f"p90 {braco.quantis[0.9].valor():.1f} "
+                         f"±{braco.tempo.largura_relativa_ic():.0%}")
+                if braco.falhas:
+                    parte += f" {braco.falhas} falha(s)"
+                if braco.quarentena:
+                    parte += f" {braco.quarentena} em quarentena"
+                partes.append(parte)
+            if partes:
+                n = min(braco.tempo.n for braco in bracos.values())
+                print(f"  ↳ {tipo} (n={n}): {' | '.join(partes)}")
     
     def executar_experimento_completo(self):
         """Executa todas as consultas do experimento"""
@@ -330,15 +468,23 @@ class ExperimentoAPI:
         print("INICIANDO EXPERIMENTO: GraphQL vs REST")
         print("="*60)
         print(f"Data/Hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Repetições por consulta: {REPETICOES}")
-        print(f"Total de medições: {5 * 2 * REPETICOES}")
+        if AMOSTRAGEM_SEQUENCIAL:
+            print(f"Repetições por consulta: {MIN_REPETICOES} a {REPETICOES} (amostragem sequencial)")
+        else:
+            print(f"Repetições por consulta: {REPETICOES}")
+        print(f"REST-paralelo: {'sim' if self.rest_paralelo else 'não'}")
+        print(f"Estados de conexão: {', '.join(self.estados_conexao)}")
+        print(f"Compressão (Accept-Encoding): {', '.join(self.codificacoes)}")
+        print(f"Decodificadores: {', '.join(DECODIFICADORES_EXPERIMENTO)}")
+        bracos = sum(3 if self.rest_paralelo and c.paralelizavel else 2 for c in self.cenarios)
+        print(f"Cenários: {len(self.cenarios)}")
+        print(f"Total de medições: até {bracos * len(self.estados_conexao) * len(self.codificacoes) * REPETICOES}")
         
         # Executar cada tipo de consulta
-        self.executar_consulta("Consulta 1 - Simples", self.consulta1_rest, self.consulta1_graphql)
-        self.executar_consulta("Consulta 2 - Média", self.consulta2_rest, self.consulta2_graphql)
-        self.executar_consulta("Consulta 3 - Complexa", self.consulta3_rest, self.consulta3_graphql)
-        self.executar_consulta("Consulta 4 - Lista", self.consulta4_rest, self.consulta4_graphql)
-        self.executar_consulta("Consulta 5 - Aninhada", self.consulta5_rest, self.consulta5_graphql)
+        for nome, funcoes in self.consultas():
+            self.executar_consulta(nome, funcoes['REST'], funcoes['GraphQL'],
+                                   func_rest_paralelo=funcoes.get('REST-paralelo') if self.rest_paralelo else None,
+                                   estados_conexao=self.estados_conexao, codificacoes=self.codificacoes)
         
         print(f"\n{'='*60}")
         print("EXPERIMENTO CONCLUÍDO!")
@@ -351,64 +497,141 @@ class ExperimentoAPI:
             return
         
         with open(arquivo, 'w', newline='', encoding='utf-8') as f:
-            campos = ['consulta', 'tipo_api', 'tempo_ms', 'tamanho_bytes', 'timestamp']
-            writer = csv.DictWriter(f, fieldnames=campos)
+            writer = csv.DictWriter(f, fieldnames=CAMPOS_RESULTADO)
             writer.writeheader()
             writer.writerows(self.resultados)
         
         print(f"\nResultados salvos em: {arquivo}")
         self.gerar_estatisticas_preliminares()
     
-    def gerar_estatisticas_preliminares(self):
-        """Gera estatísticas preliminares dos resultados"""
+    def gerar_estatisticas_preliminares(self, parcial=False):
+        """
+        Gera estatísticas preliminares a partir dos acumuladores de cada braço
+        (sem percorrer as medições, então também serve após uma interrupção)
+        """
         print("\n" + "="*60)
-        print("ESTATÍSTICAS PRELIMINARES")
+        print("ESTATÍSTICAS PRELIMINARES" + (" (PARCIAIS)" if parcial else ""))
         print("="*60)
         
-        # Agrupar por consulta e tipo
-        for consulta in set(r['consulta'] for r in self.resultados):
+        # {consulta: {tipo_api: {(estado_conexao, codificacao): AcumuladorBraco}}}
+        por_consulta = {}
+        for (consulta, tipo, *niveis), braco in self.acumuladores.items():
+            por_consulta.setdefault(consulta, {}).setdefault(tipo, {})[tuple(niveis)] = braco
+        
+        for consulta, por_tipo in por_consulta.items():
             print(f"\n{consulta}:")
             
-            rest_tempo = [r['tempo_ms'] for r in self.resultados 
-                         if r['consulta'] == consulta and r['tipo_api'] == 'REST']
-            graphql_tempo = [r['tempo_ms'] for r in self.resultados 
-                           if r['consulta'] == consulta and r['tipo_api'] == 'GraphQL']
+            # Tipo agregado entre os estados de conexão e as compressões
+            tempo, tamanho, rede = {}, {}, {}
+            for tipo, bracos in por_tipo.items():
+                tempo[tipo] = reduce(lambda a, b: a.mesclar(b), (b.tempo for b in bracos.values()))
+                tamanho[tipo] = reduce(lambda a, b: a.mesclar(b), (b.tamanho for b in bracos.values()))
+                rede[tipo] = reduce(lambda a, b: a.mesclar(b), (b.bytes_rede for b in bracos.values()))
             
-            rest_tamanho = [r['tamanho_bytes'] for r in self.resultados 
-                          if r['consulta'] == consulta and r['tipo_api'] == 'REST']
-            graphql_tamanho = [r['tamanho_bytes'] for r in self.resultados 
-                             if r['consulta'] == consulta and r['tipo_api'] == 'GraphQL']
+            if tempo.get('REST') and tempo['REST'].n and tempo.get('GraphQL') and tempo['GraphQL'].n:
+                print(f"  Tempo REST: {tempo['REST'].media:.2f}ms (±{tempo['REST'].desvio:.2f})")
+                print(f"  Tempo GraphQL: {tempo['GraphQL'].media:.2f}ms (±{tempo['GraphQL'].desvio:.2f})")
+                print(f"  Tamanho REST: {tamanho['REST'].media:.2f} bytes")
+                print(f"  Tamanho GraphQL: {tamanho['GraphQL'].media:.2f} bytes")
+                print(f"  Na rede (comprimido + cabeçalhos): REST {rede['REST'].media:.2f} bytes | GraphQL {rede['GraphQL'].media:.2f} bytes")
             
-            if rest_tempo and graphql_tempo:
-                print(f"  Tempo REST: {statistics.mean(rest_tempo):.2f}ms (±{statistics.stdev(rest_tempo):.2f})")
-                print(f"  Tempo GraphQL: {statistics.mean(graphql_tempo):.2f}ms (±{statistics.stdev(graphql_tempo):.2f})")
-                print(f"  Tamanho REST: {statistics.mean(rest_tamanho):.2f} bytes")
-                print(f"  Tamanho GraphQL: {statistics.mean(graphql_tamanho):.2f} bytes")
+            if tempo.get('REST-paralelo') and tempo['REST-paralelo'].n:
+                print(f"  Tempo REST-paralelo: {tempo['REST-paralelo'].media:.2f}ms")
+            
+            niveis_presentes = dict.fromkeys(niveis for bracos in por_tipo.values() for niveis in bracos)
+            for estado, codificacao in niveis_presentes:
+                medias = []
+                for tipo in ['REST', 'GraphQL', 'REST-paralelo']:
+                    braco = por_tipo.get(tipo, {}).get((estado, codificacao))
+                    if braco is not None and braco.tempo.n:
+                        medias.append(f"{tipo} {braco.tempo.media:.2f}ms (p50 {braco.quantis[0.5].valor():.2f}, "
+                                      f"p90 {braco.quantis[0.9].valor():.2f})")
+                if medias:
+                    print(f"  Conexão {estado}, {codificacao}: {' | '.join(medias)}")
+            
+            # Bytes na rede de cada compressão, entre os estados de conexão
+            for codificacao in dict.fromkeys(c for _, c in niveis_presentes):
+                bytes_tipo = []
+                for tipo in ['REST', 'GraphQL', 'REST-paralelo']:
+                    estatisticas = [b.bytes_rede for (_, c), b in por_tipo.get(tipo, {}).items() if c == codificacao]
+                    if estatisticas:
+                        rede_tipo = reduce(lambda a, b: a.mesclar(b), estatisticas)
+                        if rede_tipo.n:
+                            bytes_tipo.append(f"{tipo} {rede_tipo.media:.2f} bytes")
+                if bytes_tipo:
+                    print(f"  Na rede com {codificacao}: {' | '.join(bytes_tipo)}")
+            
+            falhas = {tipo: sum(b.falhas for b in bracos.values()) for tipo, bracos in por_tipo.items()}
+            if any(falhas.values()):
+                print(f"  Falhas: {' | '.join(f'{tipo} {n}' for tipo, n in falhas.items() if n)}")
+            quarentena = {tipo: sum(b.quarentena for b in bracos.values()) for tipo, bracos in por_tipo.items()}
+            if any(quarentena.values()):
+                print(f"  Em quarentena (ruído no cliente): {' | '.join(f'{tipo} {n}' for tipo, n in quarentena.items() if n)}")
 
 
 def main():
     """Função principal para executar o experimento"""
+    parser = argparse.ArgumentParser(description='Lab 05 - GraphQL vs REST')
+    parser.add_argument('--base-url',
+                        help='URL base da API REST (ex.: servidor_local.py); padrão: API do GitHub')
+    parser.add_argument('--graphql-url', help='Endpoint GraphQL (padrão: <base-url>/graphql)')
+    parser.add_argument('--delay', type=float,
+                        help=f'Segundos entre medições (padrão: {DELAY_ENTRE_REQUESTS} na API do GitHub, 0 com --base-url)')
+    parser.add_argument('-o', '--output', default='resultados_experimento.csv')
+    parser.add_argument('--retomar', action='store_true',
+                        help='Continua um arquivo de saída parcial, medindo apenas o que falta')
+    parser.add_argument('--cenarios', default=ARQUIVO_CENARIOS,
+                        help='Catálogo de cenários (padrão: cenarios.json)')
+    parser.add_argument('--rest-paralelo', action='store_true',
+                        help='Inclui o braço REST-paralelo nas consultas com endpoints independentes')
+    parser.add_argument('--conexao-quente', action='store_true',
+                        help='Inclui o estado de conexão como fator (fria e quente; padrão: só fria)')
+    parser.add_argument('--compressao', action='store_true',
+                        help=f"Inclui a compressão como fator ({', '.join(CODIFICACOES_FATOR)}; padrão: só gzip)")
+    args = parser.parse_args()
+    
     print("="*60)
     print("Lab 05 - GraphQL vs REST")
     print("Sprint 1 - Preparação e Execução")
     print("="*60)
     
-    # Verificar token
-    if GITHUB_TOKEN == "SEU_TOKEN_AQUI":
-        print("\n⚠️  ATENÇÃO: Configure seu token do GitHub!")
-        print("1. Acesse: https://github.com/settings/tokens")
-        print("2. Gere um token com permissões de leitura")
-        print("3. Substitua 'SEU_TOKEN_AQUI' no código")
-        return
+    if args.base_url:
+        # Servidor local: sem token e sem pausa contra rate limiting
+        rest_base_url = args.base_url.rstrip('/')
+        graphql_url = args.graphql_url or f"{rest_base_url}/graphql"
+        delay = 0 if args.delay is None else args.delay
+    else:
+        # Verificar token
+        if GITHUB_TOKEN == "SEU_TOKEN_AQUI":
+            print("\n⚠️  ATENÇÃO: Configure seu token do GitHub!")
+            print("1. Acesse: https://github.com/settings/tokens")
+            print("2. Gere um token com permissões de leitura")
+            print("3. Substitua 'SEU_TOKEN_AQUI' no código")
+            print("   (ou rode offline com --base-url apontando para servidor_local.py)")
+            return
+        rest_base_url = REST_BASE_URL
+        graphql_url = args.graphql_url or GRAPHQL_URL
+        delay = DELAY_ENTRE_REQUESTS if args.delay is None else args.delay
     
     # Criar e executar experimento
-    experimento = ExperimentoAPI()
+    experimento = ExperimentoAPI(rest_base_url, graphql_url, delay, carregar_cenarios(args.cenarios),
+                                 rest_paralelo=args.rest_paralelo,
+                                 estados_conexao=ESTADOS_CONEXAO_FATOR if args.conexao_quente else ESTADOS_CONEXAO,
+                                 codificacoes=CODIFICACOES_FATOR if args.compressao else CODIFICACOES)
     
-    # Executar experimento completo
-    experimento.executar_experimento_completo()
+    # Cada medição é gravada assim que termina
+    experimento.iniciar_gravacao(args.output, retomar=args.retomar)
     
-    # Salvar resultados
-    experimento.salvar_resultados('resultados_experimento.csv')
+    # Executar experimento completo; se for interrompido (erro ou Ctrl+C),
+    # o relatório sai com o que os acumuladores viram até ali
+    concluido = False
+    try:
+        experimento.executar_experimento_completo()
+        concluido = True
+    finally:
+        experimento.fechar()
+        print(f"\nResultados salvos em: {args.output}")
+        experimento.gerar_estatisticas_preliminares(parcial=not concluido)
 
 
 if __name__ == "__main__":
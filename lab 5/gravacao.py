@@ -0,0 +1,122 @@
+"""
+Lab 05 - Gravação Incremental dos Resultados
+Cada medição é anexada ao CSV assim que termina, em vez de esperar o fim
+do experimento:
+
+- flush + fsync em lotes (a cada LOTE_SINCRONIZACAO linhas ou
+  INTERVALO_SINCRONIZACAO segundos), então uma queda perde no máximo o
+  último lote
+- Ao retomar, uma última linha cortada pela queda é descartada e as
+  linhas já gravadas são lidas de volta para contar o que falta medir
+"""
+
+import os
+import csv
+from time import monotonic
+
+LOTE_SINCRONIZACAO = 10
+INTERVALO_SINCRONIZACAO = 5.0  # segundos
+
+# Bytes lidos por vez ao procurar o fim da última linha completa
+BLOCO_LEITURA = 64 * 1024
+
+
+def _descartar_linha_incompleta(arquivo):
+    """
+    Trunca o arquivo no último fim de linha (escrita interrompida no meio)
+
+    Lê apenas o final do arquivo, em blocos de trás para a frente, até achar
+    a última quebra de linha; sem nenhuma, o arquivo fica vazio.
+    """
+    with open(arquivo, 'rb+') as f:
+        fim = f.seek(0, os.SEEK_END)
+        posicao = fim
+        while posicao > 0:
+            inicio = max(0, posicao - BLOCO_LEITURA)
+            f.seek(inicio)
+            bloco = f.read(posicao - inicio)
+            if posicao == fim and bloco.endswith(b'\n'):
+                return
+            quebra = bloco.rfind(b'\n')
+            if quebra >= 0:
+                f.truncate(inicio + quebra + 1)
+                return
+            posicao = inicio
+        if fim:
+            f.truncate(0)
+
+
+def _valor(texto):
+    for tipo in (int, float):
+        try:
+            return tipo(texto)
+        except ValueError:
+            pass
+    return texto
+
+
+def ler_resultados(arquivo, campos_texto=()):
+    """
+    Lê as linhas já gravadas, convertendo os campos numéricos
+
+    Args:
+        campos_texto: campos mantidos como texto mesmo que pareçam números
+    """
+    if not os.path.exists(arquivo):
+        return []
+    _descartar_linha_incompleta(arquivo)
+    with open(arquivo, 'r', encoding='utf-8-sig', newline='') as f:
+        return [
+            {campo: valor if campo in campos_texto else _valor(valor) for campo, valor in linha.items()}
+            for linha in csv.DictReader(f)
+        ]
+
+
+class GravadorCSV:
+    """Anexa linhas a um CSV com sincronização em lotes"""
+
+    def __init__(self, arquivo, campos, retomar=False,
+                 lote=LOTE_SINCRONIZACAO, intervalo=INTERVALO_SINCRONIZACAO):
+        self.arquivo = arquivo
+        self.lote = lote
+        self.intervalo = intervalo
+
+        continuar = retomar and os.path.exists(arquivo) and os.path.getsize(arquivo) > 0
+        if continuar:
+            _descartar_linha_incompleta(arquivo)
+            with open(arquivo, 'r', encoding='utf-8-sig', newline='') as f:
+                cabecalho = next(csv.reader(f), [])
+            if cabecalho != list(campos):
+                raise ValueError(f"{arquivo} tem outras colunas; use um novo arquivo de saída")
+
+        self._f = open(arquivo, 'a' if continuar else 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._f, fieldnames=campos)
+        if not continuar:
+            self._writer.writeheader()
+            self.sincronizar()
+        self._pendentes = 0
+        self._ultima_sincronizacao = monotonic()
+
+    def gravar(self, linha):
+        self._writer.writerow(linha)
+        self._pendentes += 1
+        if self._pendentes >= self.lote or monotonic() - self._ultima_sincronizacao >= self.intervalo:
+            self.sincronizar()
+
+    def sincronizar(self):
+        """Garante que as linhas gravadas até aqui estão no disco"""
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._pendentes = 0
+        self._ultima_sincronizacao = monotonic()
+
+    def fechar(self):
+        if not self._f.closed:
+            self.sincronizar()
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
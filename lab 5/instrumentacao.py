@@ -0,0 +1,410 @@
+"""
+Lab 05 - Instrumentação das Requisições HTTP
+Mede cada fase de uma requisição com perf_counter_ns, por meio de ganchos
+nas conexões do urllib3 usadas pelo requests:
+
+- DNS: resolução do nome do host
+- Conexão: handshake TCP
+- TLS: handshake TLS (apenas HTTPS)
+- Servidor: do envio da requisição até a chegada dos cabeçalhos (TTFB)
+- Download: da chegada dos cabeçalhos até o fim do corpo
+
+Também registra o que trafegou na rede em cada resposta:
+
+- Corpo comprimido: bytes do corpo lidos do socket (antes de gzip/deflate)
+- Corpo: bytes do corpo após a descompressão
+- Cabeçalhos: linha de status + cabeçalhos da resposta
+
+E a compressão de cada resposta: a codificação que o servidor de fato
+usou (Content-Encoding) e o tempo gasto descomprimindo o corpo, medido em
+torno do decodificador do urllib3 (e incluído na fase de download).
+
+E o consumo do limite de requisições (rate limit) que o servidor informa
+nos cabeçalhos X-RateLimit-*: recurso (core no REST, graphql no GraphQL),
+pontos usados e restantes. O consumo de uma medição é a diferença entre o
+maior X-RateLimit-Used visto nela e o maior visto até a medição anterior,
+na mesma janela; outros clientes usando o mesmo token também entram nessa
+diferença.
+
+As fases e os bytes de todas as requisições de uma medição (por exemplo,
+os 4 endpoints da consulta 3 REST) são somados.
+
+Relógio virtual: quando o servidor (servidor_local.py) informa a latência
+no cabeçalho X-Latencia-Virtual-Ms em vez de esperar de fato, ela é somada
+à fase do servidor e ao tempo da medição (ver atraso_virtual_ms).
+"""
+
+import socket
+import warnings
+import threading
+from time import perf_counter_ns
+
+import requests
+import urllib3
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.response import HTTPResponse
+from urllib3.util.request import ACCEPT_ENCODING
+
+# A medição da descompressão troca a classe da resposta e envolve
+# HTTPResponse._decode, detalhes internos do urllib3 2.x (requirements.txt
+# fixa essa versão). Com outra versão esses ganchos ficam desligados e
+# descompressao_ms sai 0; as demais fases continuam medidas.
+GANCHOS_DESCOMPRESSAO = urllib3.__version__.split('.')[0] == '2'
+if not GANCHOS_DESCOMPRESSAO:
+    warnings.warn(f"urllib3 {urllib3.__version__} não suportado pela instrumentação "
+                  "(esperado 2.x): descompressao_ms não será medido", RuntimeWarning)
+
+# Colunas adicionadas aos resultados, na ordem em que as fases ocorrem
+CAMPOS_FASES = [
+    'fase_dns_ms', 'fase_conexao_ms', 'fase_tls_ms',
+    'fase_servidor_ms', 'fase_download_ms'
+]
+
+# Colunas com os bytes transferidos
+CAMPOS_BYTES = ['bytes_corpo_comprimido', 'bytes_corpo', 'bytes_cabecalhos']
+
+# Colunas da compressão das respostas
+CAMPOS_COMPRESSAO = ['codificacao_recebida', 'descompressao_ms']
+
+# Valores de Accept-Encoding que o urllib3 consegue descomprimir
+# (br apenas com o pacote brotli ou brotlicffi instalado)
+CODIFICACOES_SUPORTADAS = ['identity', 'gzip'] + (['br'] if 'br' in ACCEPT_ENCODING else [])
+
+# Colunas do limite de requisições (vazias se o servidor não informa o limite)
+CAMPOS_RATELIMIT = ['requisicoes', 'ratelimit_recurso', 'ratelimit_consumido', 'ratelimit_restante']
+
+CABECALHO_LATENCIA_VIRTUAL = 'X-Latencia-Virtual-Ms'
+
+
+class RegistroRequisicao:
+    """Instantes e durações (ns) de uma requisição HTTP"""
+
+    def __init__(self):
+        self.dns_ns = 0
+        self.conexao_ns = 0
+        self.tls_ns = 0
+        self.t_enviado = None
+        self.t_cabecalhos = None
+        self.t_fim_corpo = None
+        self.bytes_corpo_comprimido = 0
+        self.bytes_corpo = 0
+        self.bytes_cabecalhos = 0
+        self.codificacao = 'identity'
+        self.descompressao_ns = 0
+        self.ratelimit_recurso = None
+        self.ratelimit_reset = None
+        self.ratelimit_usado = None
+        self.ratelimit_restante = None
+        self.atraso_virtual_ns = 0
+        self.thread = threading.get_ident()
+
+
+class ColetorFases:
+    """Acumula os registros das requisições feitas durante uma medição"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.registros = []
+        # Maior (reset, usado) visto em cada recurso do limite até a medição anterior
+        self._base_ratelimit = {}
+
+    def iniciar(self):
+        """Descarta os registros anteriores (chamado no início de cada medição)"""
+        with self._lock:
+            self._base_ratelimit = self._maior_ratelimit(self.registros, self._base_ratelimit)
+            self.registros = []
+
+    @staticmethod
+    def _maior_ratelimit(registros, maiores=None):
+        """Maior (reset, usado) por recurso: a janela mais recente e, nela, o maior uso"""
+        maiores = dict(maiores or {})
+        for r in registros:
+            if r.ratelimit_usado is None:
+                continue
+            marca = (r.ratelimit_reset or 0, r.ratelimit_usado)
+            if marca > maiores.get(r.ratelimit_recurso, (-1, -1)):
+                maiores[r.ratelimit_recurso] = marca
+        return maiores
+
+    def novo_registro(self):
+        registro = RegistroRequisicao()
+        with self._lock:
+            self.registros.append(registro)
+        self._local.atual = registro
+        return registro
+
+    def registro_atual(self):
+        """Último registro criado pela thread atual"""
+        return getattr(self._local, 'atual', None)
+
+    def resumo(self):
+        """
+        Soma das fases (ms), dos bytes e da descompressão de todas as
+        requisições da medição, com as codificações recebidas (ex.: 'gzip')
+        e o consumo do limite de requisições
+        """
+        totais = dict.fromkeys(CAMPOS_FASES, 0.0)
+        totais.update(dict.fromkeys(CAMPOS_BYTES, 0))
+        totais['descompressao_ms'] = 0.0
+        with self._lock:
+            registros = list(self.registros)
+        totais['codificacao_recebida'] = '+'.join(sorted({r.codificacao for r in registros})) or 'identity'
+        for r in registros:
+            totais['fase_dns_ms'] += r.dns_ns / 1e6
+            totais['fase_conexao_ms'] += r.conexao_ns / 1e6
+            totais['fase_tls_ms'] += r.tls_ns / 1e6
+            if r.t_enviado is not None and r.t_cabecalhos is not None:
+                totais['fase_servidor_ms'] += (r.t_cabecalhos - r.t_enviado + r.atraso_virtual_ns) / 1e6
+            if r.t_cabecalhos is not None and r.t_fim_corpo is not None:
+                totais['fase_download_ms'] += (r.t_fim_corpo - r.t_cabecalhos) / 1e6
+            for campo in CAMPOS_BYTES:
+                totais[campo] += getattr(r, campo)
+            totais['descompressao_ms'] += r.descompressao_ns / 1e6
+        totais.update(self._consumo_ratelimit(registros))
+        return totais
+
+    def _consumo_ratelimit(self, registros):
+        """
+        Requisições da medição e pontos do limite consumidos nela, somados
+        entre os recursos ('' sem cabeçalhos de limite ou, na primeira
+        medição de um recurso, sem uso anterior para comparar)
+        """
+        maiores = self._maior_ratelimit(registros)
+        restantes = [r.ratelimit_restante for r in registros if r.ratelimit_restante is not None]
+        consumido = 0 if maiores else ''
+        for recurso, (reset, usado) in maiores.items():
+            base = self._base_ratelimit.get(recurso)
+            if base is None:
+                consumido = ''
+                break
+            # Janela nova: o uso recomeçou do zero
+            consumido += usado - base[1] if base[0] == reset else usado
+        return {
+            'requisicoes': len(registros),
+            'ratelimit_recurso': '+'.join(sorted(maiores)),
+            'ratelimit_consumido': consumido,
+            'ratelimit_restante': min(restantes) if restantes else '',
+        }
+
+    def atraso_virtual_ms(self):
+        """
+        Latência virtual a somar ao tempo da medição.
+
+        Requisições da mesma thread são sequenciais e seus atrasos se somam;
+        threads diferentes (REST-paralelo) correm ao mesmo tempo, então vale
+        o maior total entre elas.
+        """
+        por_thread = {}
+        with self._lock:
+            for r in self.registros:
+                por_thread[r.thread] = por_thread.get(r.thread, 0) + r.atraso_virtual_ns
+        return max(por_thread.values(), default=0) / 1e6
+
+
+# Coletor único: as medições do experimento são feitas uma de cada vez
+coletor = ColetorFases()
+
+
+class _ConexaoInstrumentadaMixin:
+    """Ganchos de tempo sobre as conexões do urllib3"""
+
+    _fases_pendentes = (0, 0, 0)
+    _usa_tls = False
+
+    def _new_conn(self):
+        host = self._dns_host
+        inicio = perf_counter_ns()
+        try:
+            enderecos = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)
+        except socket.gaierror:
+            enderecos = None
+        fim_dns = perf_counter_ns()
+
+        if not enderecos:
+            # O urllib3 refaz a resolução e reporta o erro (NameResolutionError)
+            sock = super()._new_conn()
+            self._tempo_dns_ns = fim_dns - inicio
+            self._tempo_tcp_ns = perf_counter_ns() - fim_dns
+            return sock
+
+        # Conecta direto em cada IP resolvido, em ordem, como socket.create_connection,
+        # para isolar o handshake TCP; vale o tempo da tentativa que conectou
+        erro = None
+        try:
+            for endereco in enderecos:
+                self._dns_host = endereco[4][0]
+                inicio_conexao = perf_counter_ns()
+                try:
+                    sock = super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError) as falha:
+                    erro = falha
+                    continue
+                self._tempo_dns_ns = fim_dns - inicio
+                self._tempo_tcp_ns = perf_counter_ns() - inicio_conexao
+                return sock
+        finally:
+            self._dns_host = host
+        raise erro
+
+    def connect(self):
+        self._tempo_dns_ns = self._tempo_tcp_ns = 0
+        inicio = perf_counter_ns()
+        super().connect()
+        total = perf_counter_ns() - inicio
+        # O que não foi DNS nem TCP é o handshake TLS
+        tls = max(0, total - self._tempo_dns_ns - self._tempo_tcp_ns) if self._usa_tls else 0
+        self._fases_pendentes = (self._tempo_dns_ns, self._tempo_tcp_ns, tls)
+
+    def request(self, *args, **kwargs):
+        registro = coletor.novo_registro()
+        super().request(*args, **kwargs)
+        registro.t_enviado = perf_counter_ns()
+        # Custos de conexão só entram na primeira requisição da conexão
+        registro.dns_ns, registro.conexao_ns, registro.tls_ns = self._fases_pendentes
+        self._fases_pendentes = (0, 0, 0)
+        self._registro_fases = registro
+
+    def getresponse(self, *args, **kwargs):
+        resposta = super().getresponse(*args, **kwargs)
+        registro = getattr(self, '_registro_fases', None)
+        if registro is not None:
+            registro.t_cabecalhos = perf_counter_ns()
+            registro.codificacao = resposta.headers.get('Content-Encoding', 'identity').lower()
+            if GANCHOS_DESCOMPRESSAO:
+                # O urllib3 instancia HTTPResponse diretamente; a troca de classe
+                # mede a descompressão sem alterar o restante da resposta
+                resposta.__class__ = _RespostaInstrumentada
+                resposta._registro_fases = registro
+        return resposta
+
+
+class _RespostaInstrumentada(HTTPResponse):
+    """HTTPResponse que soma ao registro o tempo gasto descomprimindo o corpo"""
+
+    _registro_fases = None
+
+    def _decode(self, *args, **kwargs):
+        inicio = perf_counter_ns()
+        try:
+            return super()._decode(*args, **kwargs)
+        finally:
+            if self._registro_fases is not None and self._decoder is not None:
+                self._registro_fases.descompressao_ns += perf_counter_ns() - inicio
+
+
+class ConexaoHTTPInstrumentada(_ConexaoInstrumentadaMixin, HTTPConnection):
+    pass
+
+
+class ConexaoHTTPSInstrumentada(_ConexaoInstrumentadaMixin, HTTPSConnection):
+    _usa_tls = True
+
+
+class PoolHTTPInstrumentado(HTTPConnectionPool):
+    ConnectionCls = ConexaoHTTPInstrumentada
+
+
+class PoolHTTPSInstrumentado(HTTPSConnectionPool):
+    ConnectionCls = ConexaoHTTPSInstrumentada
+
+
+class AdaptadorInstrumentado(HTTPAdapter):
+    """HTTPAdapter cujos pools criam conexões instrumentadas"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': PoolHTTPInstrumentado,
+            'https': PoolHTTPSInstrumentado,
+        }
+
+
+def _tamanho_cabecalhos(resposta_urllib3):
+    """
+    Bytes da linha de status e dos cabeçalhos de uma resposta.
+
+    O http.client não guarda os bytes originais, então o bloco é
+    reconstruído no formato da rede (nome: valor CRLF).
+    """
+    versao = {10: 'HTTP/1.0', 11: 'HTTP/1.1'}.get(resposta_urllib3.version, 'HTTP/1.1')
+    linha = f"{versao} {resposta_urllib3.status} {resposta_urllib3.reason or ''}\r\n"
+    total = len(linha.encode('latin-1', 'replace')) + 2  # CRLF final
+    for nome, valor in resposta_urllib3.headers.items():
+        total += len(f"{nome}: {valor}\r\n".encode('latin-1', 'replace'))
+    return total
+
+
+class SessaoInstrumentada(requests.Session):
+    """requests.Session que registra as fases de cada requisição"""
+
+    def __init__(self, tamanho_pool=DEFAULT_POOLSIZE):
+        super().__init__()
+        adaptador = AdaptadorInstrumentado(pool_maxsize=tamanho_pool)
+        self.mount('http://', adaptador)
+        self.mount('https://', adaptador)
+
+    def send(self, request, **kwargs):
+        resposta = super().send(request, **kwargs)
+        # Sem stream=True o corpo já foi lido ao retornar
+        registro = coletor.registro_atual()
+        if registro is not None and not kwargs.get('stream'):
+            registro.t_fim_corpo = perf_counter_ns()
+            # tell() conta os bytes lidos do socket, antes da descompressão
+            registro.bytes_corpo_comprimido = resposta.raw.tell()
+            registro.bytes_corpo = len(resposta.content)
+            registro.bytes_cabecalhos = _tamanho_cabecalhos(resposta.raw)
+            atraso = resposta.headers.get(CABECALHO_LATENCIA_VIRTUAL)
+            if atraso is not None:
+                registro.atraso_virtual_ns = int(float(atraso) * 1e6)
+            if 'X-RateLimit-Used' in resposta.headers:
+                registro.ratelimit_recurso = resposta.headers.get('X-RateLimit-Resource', 'core')
+                registro.ratelimit_reset = int(resposta.headers.get('X-RateLimit-Reset', 0))
+                registro.ratelimit_usado = int(resposta.headers['X-RateLimit-Used'])
+                registro.ratelimit_restante = int(resposta.headers.get('X-RateLimit-Remaining', 0))
+        return resposta
+
+
+class ClienteHTTP:
+    """
+    Cliente usado pelas consultas do experimento.
+
+    - persistente=False (conexão fria): cada requisição abre uma sessão
+      (e conexão) nova, como requests.get
+    - persistente=True (conexão quente): uma única sessão reaproveita as
+      conexões do pool entre requisições e medições, como um cliente de
+      produção de longa duração
+
+    tamanho_pool limita as conexões mantidas abertas por host; deve cobrir
+    o número de requisições simultâneas para que nenhuma seja descartada.
+
+    codificacao fixa o Accept-Encoding de todas as requisições (ex.:
+    'identity', 'gzip', 'br'); None mantém o padrão do requests.
+    """
+
+    def __init__(self, persistente=False, tamanho_pool=DEFAULT_POOLSIZE, codificacao=None):
+        self.persistente = persistente
+        self.codificacao = codificacao
+        self._sessao = SessaoInstrumentada(tamanho_pool) if persistente else None
+
+    def _requisitar(self, metodo, url, **kwargs):
+        if self.codificacao is not None:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), 'Accept-Encoding': self.codificacao}
+        if self.persistente:
+            return self._sessao.request(metodo, url, **kwargs)
+        with SessaoInstrumentada() as sessao:
+            return sessao.request(metodo, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self._requisitar('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._requisitar('POST', url, **kwargs)
+
+    def fechar(self):
+        """Encerra as conexões mantidas abertas pelo modo persistente"""
+        if self._sessao is not None:
+            self._sessao.close()
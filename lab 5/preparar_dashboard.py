@@ -3,42 +3,201 @@ Lab 05 - Sprint 3: Preparação de Dados para Dashboard Power BI
 Processa os resultados do experimento e gera métricas adicionais
 """
 
+import os
+import argparse
+
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from scipy import stats
 
+from cenarios import ARQUIVO_CENARIOS, carregar_cenarios
+from agregados import ESTATISTICAS, K_ESBOCO, AgregadosExperimento, agregar_momentos
+from testes_nao_parametricos import REAMOSTRAGENS, comparar_varios
+from cache_dashboard import ARQUIVO_CACHE, VERSAO_CACHE, CacheDashboard, hashes_grupos, resumo_hash
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+# Fases das requisições (presentes nos resultados coletados com instrumentação)
+COLUNAS_FASES = [
+    ('fase_dns_ms', 'Fase DNS (ms)'),
+    ('fase_conexao_ms', 'Fase Conexão (ms)'),
+    ('fase_tls_ms', 'Fase TLS (ms)'),
+    ('fase_servidor_ms', 'Fase Servidor (ms)'),
+    ('fase_download_ms', 'Fase Download (ms)'),
+]
+
+# Bytes transferidos (presentes nos resultados coletados com instrumentação)
+COLUNAS_BYTES = [
+    ('bytes_rede', 'Bytes na Rede'),
+    ('bytes_corpo_comprimido', 'Corpo Comprimido (bytes)'),
+    ('bytes_cabecalhos', 'Cabeçalhos (bytes)'),
+]
+
+# Tempo gasto descomprimindo o corpo (incluído na fase de download)
+COLUNAS_COMPRESSAO = [
+    ('descompressao_ms', 'Descompressão (ms)'),
+]
+
+# Custo de decodificação do JSON no cliente (fora do tempo de resposta)
+COLUNAS_DECODIFICACAO = [
+    ('decod_tempo_ms', 'Decodificação (ms)'),
+    ('decod_cpu_ms', 'Decodificação CPU (ms)'),
+    ('decod_memoria_pico_bytes', 'Decodificação Pico de Memória (bytes)'),
+    ('decod_objetos', 'Objetos Decodificados'),
+]
+
+# Colunas do limite de requisições (médias por consulta × tipo_api)
+COLUNAS_LIMITE = ['custo_limite', 'requisicoes', 'ratelimit_consumido']
+
+# Metadados da consulta guardados no resumo de cada grupo (da primeira linha)
+COLUNAS_METADADOS = ['complexidade', 'num_endpoints', 'itens_retornados']
+
+# Medidas comparadas no teste t pareado REST × GraphQL
+COLUNAS_PAREADAS = ['tempo_ms', 'tamanho_bytes']
+
+# Dimensões de tempo do cubo de agregados, além de consulta × fatores × tipo_api
+DIMENSOES_TEMPO = ['periodo_dia', 'hora']
+
+# O decodificador é escolhido depois do trecho cronometrado (não afeta tempo_ms
+# nem tamanho_bytes), então não é fator: entra no cubo só como dimensão, para
+# o custo de decodificação de cada um (decod_*)
+DIMENSOES_CUBO = DIMENSOES_TEMPO + ['decodificador']
+
+# Tipos de API no dataset de box plots, nesta ordem
+APIS_BOXPLOT = ['REST', 'GraphQL', 'REST-paralelo']
+
+# Pares (a, b) comparados pelos testes não paramétricos; speedup = tempo de a / tempo de b
+COMPARACOES_NAO_PARAMETRICAS = [('REST', 'GraphQL'), ('REST-paralelo', 'GraphQL')]
+
+# Fatores experimentais cruzados com consulta × tipo_api
+# (ausentes nos resultados de versões anteriores do experimento)
+FATORES = ['estado_conexao', 'codificacao']
+
+# Prefixo das colunas de cada tipo de API nas métricas do modo de carga e da varredura
+PREFIXOS_API = {'REST': 'rest', 'GraphQL': 'graphql', 'REST-paralelo': 'rest_paralelo',
+                'GraphQL-lote': 'graphql_lote'}
+
+# Peso das amostras ruidosas no cliente (ver ruido.py) nas médias ponderadas
+PESO_AMOSTRA_RUIDOSA = 0.25
+
+# Pontos por hora do limite de requisições do GitHub para um token pessoal
+# (o mesmo valor no REST, recurso core, e no GraphQL, recurso graphql)
+LIMITE_PONTOS_HORA = 5000
+
+# Colunas da varredura de concorrência (carga.py) médias entre execuções
+COLUNAS_CARGA = ['vazao_rps', 'latencia_media_ms', 'p50_ms', 'p99_ms', 'p999_ms',
+                 'p50_corrigido_ms', 'p99_corrigido_ms', 'p999_corrigido_ms']
+
+def fatores_presentes(df):
+    """Fatores registrados no dataset, na ordem de FATORES"""
+    return [fator for fator in FATORES if fator in df.columns]
+
 def carregar_dados(arquivo='resultados_experimento.csv'):
-    """Carrega os dados do experimento"""
-    df = pd.read_csv(arquivo)
+    """Carrega os dados do experimento (CSV ou Parquet)"""
+    df = pd.read_parquet(arquivo) if arquivo.endswith('.parquet') else pd.read_csv(arquivo)
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     return df
 
-def adicionar_metricas_derivadas(df):
-    """Adiciona métricas derivadas ao dataset"""
+def ler_em_blocos(arquivo, linhas_bloco):
+    """Blocos de linhas do CSV (ou Parquet, com pyarrow) sem carregar o arquivo inteiro"""
+    if arquivo.endswith('.parquet'):
+        for lote in pq.ParquetFile(arquivo).iter_batches(batch_size=linhas_bloco):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(arquivo, chunksize=linhas_bloco)
+
+def processar_em_blocos(arquivo, linhas_bloco, cenarios, excluir_ruidosas=False, saida='dados_enriquecidos.csv'):
+    """
+    Modo em blocos: lê os resultados aos pedaços, grava cada bloco enriquecido
+    em saida e atualiza o cubo de agregados mescláveis (ver agregados.py), com
+    memória que não depende do número de medições
+
+    A ordem de execução segue a ordem do arquivo (o experimento grava as
+    medições na ordem em que acontecem); dentro de cada bloco, o timestamp.
+
+    Os resultados coincidem com os do modo em memória a menos de
+    arredondamento de ponto flutuante: os momentos são somados bloco a bloco,
+    em outra ordem, e o último dígito de médias e desvios pode mudar. Os
+    quantis são aproximados nos grupos com mais de K_ESBOCO medições.
+
+    Returns:
+        dict com cubo, inicio, fim, registros, ruidosas (None sem a coluna
+        ruido), blocos e colunas
+    """
+    cubo = None
+    info = {'inicio': None, 'fim': None, 'registros': 0, 'ruidosas': None, 'blocos': 0, 'colunas': 0}
     
-    # Extrair número da consulta e complexidade
-    df['numero_consulta'] = df['consulta'].str.extract(r'Consulta (\d+)')[0].astype(int)
+    with open(saida, 'w', newline='', encoding='utf-8-sig') as f:
+        for bloco in ler_em_blocos(arquivo, linhas_bloco):
+            bloco['timestamp'] = pd.to_datetime(bloco['timestamp'])
+            bloco = adicionar_metricas_derivadas(bloco, cenarios)
+            bloco['ordem_execucao'] += info['registros']
+            info['registros'] += len(bloco)
+            info['blocos'] += 1
+            info['colunas'] = len(bloco.columns)
+            if 'amostra_ruidosa' in bloco.columns:
+                info['ruidosas'] = (info['ruidosas'] or 0) + int(bloco['amostra_ruidosa'].sum())
+                if excluir_ruidosas:
+                    bloco = excluir_amostras_ruidosas(bloco)
+            if len(bloco) == 0:
+                continue
+            
+            bloco.to_csv(f, index=False, header=(f.tell() == 0))
+            inicio, fim = bloco['timestamp'].min(), bloco['timestamp'].max()
+            info['inicio'] = inicio if info['inicio'] is None else min(info['inicio'], inicio)
+            info['fim'] = fim if info['fim'] is None else max(info['fim'], fim)
+            
+            if cubo is None:
+                cubo = criar_cubo(bloco, k=K_ESBOCO)
+            cubo.adicionar(dados_para_resumo(bloco)[0])
     
-    # Mapear complexidade
-    complexidade_map = {
-        'Consulta 1 - Simples': 'Simples',
-        'Consulta 2 - Média': 'Média',
-        'Consulta 3 - Complexa': 'Alta',
-        'Consulta 4 - Lista': 'Média',
-        'Consulta 5 - Aninhada': 'Alta'
-    }
-    df['complexidade'] = df['consulta'].map(complexidade_map)
-    
-    # Número de endpoints REST necessários
-    endpoints_map = {
-        'Consulta 1 - Simples': 1,
-        'Consulta 2 - Média': 2,
-        'Consulta 3 - Complexa': 4,
-        'Consulta 4 - Lista': 1,
-        'Consulta 5 - Aninhada': 2
-    }
-    df['num_endpoints'] = df['consulta'].map(endpoints_map)
+    if cubo is None:
+        raise ValueError(f'Nenhuma medição em {arquivo}')
+    info['cubo'] = cubo
+    return info
+
+def adicionar_metricas_derivadas(df, cenarios=None):
+    """Adiciona métricas derivadas ao dataset (metadados das consultas vindos do catálogo de cenários)"""
+    if cenarios is None:
+        cenarios = carregar_cenarios()
+    
+    # Número da consulta: posição no catálogo (ou o número do nome, para
+    # consultas que não estão mais nele)
+    posicao = {c.nome: i for i, c in enumerate(cenarios, 1)}
+    numero_no_nome = df['consulta'].str.extract(r'Consulta (\d+)')[0].astype(float)
+    df['numero_consulta'] = df['consulta'].map(posicao).fillna(numero_no_nome).astype(int)
+    
+    # Complexidade e número de endpoints REST necessários
+    df['complexidade'] = df['consulta'].map({c.nome: c.complexidade for c in cenarios})
+    df['num_endpoints'] = df['consulta'].map({c.nome: c.num_endpoints for c in cenarios})
+    
+    # Entidades retornadas por execução (repositório + itens das listas),
+    # as mesmas no REST e no GraphQL
+    df['itens_retornados'] = df['consulta'].map({c.nome: c.itens for c in cenarios})
+    
+    # Amostras com ruído no cliente (pausa do GC, CPU ocupada, sistema carregado)
+    if 'ruido' in df.columns:
+        df['ruido'] = df['ruido'].fillna('')
+        df['amostra_ruidosa'] = df['ruido'] != ''
+        df['peso_amostra'] = np.where(df['amostra_ruidosa'], PESO_AMOSTRA_RUIDOSA, 1.0)
+    
+    # Pontos do limite de requisições gastos: 1 por requisição REST; no GraphQL,
+    # o custo informado pela query (ou, sem ele, o consumo observado nos cabeçalhos)
+    if 'requisicoes' in df.columns:
+        custo = df['requisicoes'].astype(float)
+        if 'custo_graphql' in df.columns:
+            custo_graphql = df['custo_graphql'].fillna(df['ratelimit_consumido'])
+            custo = custo.where(df['tipo_api'] != 'GraphQL', custo_graphql)
+        df['custo_limite'] = custo
+        df['itens_por_ponto'] = df['itens_retornados'] / df['custo_limite']
+    
+    # Banda realmente consumida: corpo como trafegou (comprimido) + cabeçalhos
+    if 'bytes_corpo_comprimido' in df.columns:
+        df['bytes_rede'] = df['bytes_corpo_comprimido'] + df['bytes_cabecalhos']
     
     # Extrair informações temporais
     df['data'] = df['timestamp'].dt.date
@@ -55,202 +214,769 @@ def adicionar_metricas_derivadas(df):
     
     return df
 
-def calcular_metricas_comparativas(df):
-    """Calcula métricas comparativas entre REST e GraphQL"""
+def excluir_amostras_ruidosas(df):
+    """Dataset sem as amostras marcadas como ruidosas (inalterado sem a coluna ruido)"""
+    if 'amostra_ruidosa' not in df.columns:
+        return df
+    return df[~df['amostra_ruidosa']].reset_index(drop=True)
+
+def dados_para_resumo(df):
+    """
+    Colunas usadas pelo resumo por grupo, com o tempo ponderado pelo peso da amostra
+
+    Returns:
+        tuple: (DataFrame, colunas com momentos, colunas com quantis, colunas de metadados)
+    """
+    colunas_quantis = ['tempo_ms', 'tamanho_bytes'] + [
+        coluna for coluna, _ in COLUNAS_FASES + COLUNAS_BYTES + COLUNAS_COMPRESSAO + COLUNAS_DECODIFICACAO
+        if coluna in df.columns]
+    colunas = colunas_quantis + [coluna for coluna in COLUNAS_LIMITE if coluna in df.columns]
+    metadados = [coluna for coluna in COLUNAS_METADADOS if coluna in df.columns]
+    dimensoes = [coluna for coluna in DIMENSOES_CUBO if coluna in df.columns]
+    dados = df[['consulta'] + fatores_presentes(df) + dimensoes + ['tipo_api'] + colunas + metadados]
+    if 'peso_amostra' in df.columns:
+        dados = dados.assign(tempo_ponderado=df['tempo_ms'] * df['peso_amostra'],
+                             peso_amostra=df['peso_amostra'],
+                             amostra_ruidosa=df['amostra_ruidosa'])
+        colunas += ['tempo_ponderado', 'peso_amostra', 'amostra_ruidosa']
+    return dados, colunas, colunas_quantis, metadados
+
+def criar_cubo(df, k=None):
+    """
+    Cubo de agregados consulta × fatores × periodo_dia × hora × tipo_api
+    (ver agregados.py), vazio, com as colunas presentes em df
+
+    Args:
+        k: tamanho dos esboços de quantis (None: quantis exatos, guardando
+           todos os valores, para o dataset em memória)
+    """
+    _, colunas, colunas_quantis, metadados = dados_para_resumo(df.iloc[:0])
+    return AgregadosExperimento(['consulta'] + fatores_presentes(df), colunas, colunas_quantis, metadados,
+                                dimensoes=[d for d in DIMENSOES_CUBO if d in df.columns],
+                                pareadas=COLUNAS_PAREADAS, k=k)
+
+def montar_cubo(df, cache=None, hashes=None):
+    """
+    Cubo do dataset em memória; com o cache (ver cache_dashboard.py),
+    reaproveita o cubo de cada consulta cujos grupos consulta × tipo_api não
+    mudaram e calcula só o das demais
+
+    Returns:
+        tuple: (cubo, consultas recalculadas)
+    """
+    dados = dados_para_resumo(df)[0]
+    cubo = criar_cubo(df)
+    if cache is None:
+        cubo.adicionar(dados)
+        return cubo, list(dados['consulta'].dropna().unique())
     
-    metricas = []
+    grupos_consulta = {}
+    for (consulta, api), h in hashes.items():
+        grupos_consulta.setdefault(consulta, []).append((api, h))
+    recalculadas = []
+    for consulta, posicoes in dados.groupby('consulta', sort=False).indices.items():
+        chave = tuple(sorted(grupos_consulta.get(consulta, [])))
+        parcial = cache.cubo(consulta, chave)
+        if parcial is None:
+            parcial = criar_cubo(df)
+            parcial.adicionar(dados.iloc[posicoes])
+            cache.guardar_cubo(consulta, chave, parcial)
+            recalculadas.append(consulta)
+        cubo.mesclar(parcial)
+    # Células na ordem em que aparecem no dataset, como se o cubo fosse calculado de uma vez
+    cubo.reordenar(dados.dropna(subset=cubo.niveis).groupby(cubo.niveis, sort=False).size().index)
+    return cubo, recalculadas
+
+def resumir(cubo):
+    """
+    Resumo de cada grupo consulta × fatores × tipo_api, tirado do cubo, e
+    momentos das diferenças pareadas REST − GraphQL em cada grupo
+
+    Returns:
+        tuple: (resumo, diferenças)
+    """
+    resumo = cubo.resumo()
+    indice = resumo.index.droplevel('tipo_api').unique()
+    if cubo.pares is None:
+        colunas = pd.MultiIndex.from_product([COLUNAS_PAREADAS, ESTATISTICAS])
+        return resumo, pd.DataFrame(np.nan, index=indice, columns=colunas)
+    return resumo, cubo.pares.reindex(indice)
+
+def estatisticas_por_api(resumo):
+    """
+    Estatísticas de cada grupo chaves × tipo_api tiradas do resumo
+    (desvios com ddof=0, como np.std; variâncias com ddof=1, para os testes t)
+
+    Returns:
+        DataFrame indexado pelos rótulos (chaves + tipo_api)
+    """
+    tempo, tamanho = resumo['tempo_ms'], resumo['tamanho_bytes']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        estatisticas = pd.DataFrame({
+            'n': tempo['n'],
+            'tempo_media': tempo['media'],
+            'tempo_mediana': tempo['p50'],
+            'tempo_desvio': np.sqrt(tempo['m2'] / tempo['n']),
+            'tempo_var': tempo['m2'] / (tempo['n'] - 1),
+            'tempo_min': tempo['min'],
+            'tempo_max': tempo['max'],
+            'tempo_p25': tempo['p25'],
+            'tempo_p75': tempo['p75'],
+            'tempo_p95': tempo['p95'],
+            'tamanho_media': tamanho['media'],
+            'tamanho_desvio': np.sqrt(tamanho['m2'] / tamanho['n']),
+            'tamanho_var': tamanho['m2'] / (tamanho['n'] - 1),
+        })
+    
+    # Médias das fases, bytes na rede, descompressão e decodificação
+    for coluna, _ in COLUNAS_FASES + COLUNAS_BYTES + COLUNAS_COMPRESSAO + COLUNAS_DECODIFICACAO:
+        if coluna in resumo.columns.get_level_values(0):
+            estatisticas[f'{coluna}_media'] = resumo[(coluna, 'media')]
+    
+    # Metadados da consulta, da primeira linha de cada grupo
+    for coluna in ['complexidade', 'num_endpoints']:
+        estatisticas[coluna] = resumo[('meta', coluna)]
     
-    for consulta in df['consulta'].unique():
-        df_consulta = df[df['consulta'] == consulta]
+    # Amostras ruidosas e tempo médio com elas de peso menor
+    if 'peso_amostra' in resumo.columns.get_level_values(0):
+        estatisticas['tempo_media_ponderada'] = resumo[('tempo_ponderado', 'soma')] / resumo[('peso_amostra', 'soma')]
+        estatisticas['amostras_ruidosas'] = resumo[('amostra_ruidosa', 'soma')].round().astype(int)
+    
+    return estatisticas
+
+def estatisticas_da_api(estatisticas, tipo_api, indice):
+    """Estatísticas de um tipo de API nos grupos de indice (NaN onde ele não foi medido)"""
+    if tipo_api not in estatisticas.index.get_level_values('tipo_api'):
+        return pd.DataFrame(np.nan, index=indice, columns=estatisticas.columns)
+    return estatisticas.xs(tipo_api, level='tipo_api').reindex(indice)
+
+def teste_t_agrupado(a, b, diferencas, medida):
+    """
+    Teste t de cada grupo a partir das estatísticas: pareado onde as duas APIs
+    têm o mesmo número de medições, Welch onde não (ex.: após exclusões)
+
+    Args:
+        diferencas: momentos das diferenças da medida (ver resumir)
+
+    Returns:
+        tuple de arrays: (estatística t, p-valor)
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n_pares = diferencas['n']
+        desvio = np.sqrt(diferencas['m2'] / (n_pares - 1))
+        t_pareado = diferencas['media'] / (desvio / np.sqrt(n_pares))
+        p_pareado = 2 * stats.t.sf(np.abs(t_pareado), n_pares - 1)
+    t_welch, p_welch = teste_welch(a, b, medida)
+    pareado = (a['n'] == b['n']).values
+    return np.where(pareado, t_pareado, t_welch), np.where(pareado, p_pareado, p_welch)
+
+def teste_welch(a, b, medida):
+    """Teste t de Welch de cada grupo a partir das médias e variâncias"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return stats.ttest_ind_from_stats(a[f'{medida}_media'].values, np.sqrt(a[f'{medida}_var'].values), a['n'].values,
+                                          b[f'{medida}_media'].values, np.sqrt(b[f'{medida}_var'].values), b['n'].values,
+                                          equal_var=False)
+
+def significante(p_valores):
+    """'Sim' onde p < 0.05 (α = 0.05)"""
+    return np.where(np.asarray(p_valores) < 0.05, 'Sim', 'Não')
+
+def calcular_metricas_comparativas(resumo, diferencas):
+    """
+    Calcula métricas comparativas entre REST e GraphQL
+
+    Uma linha por consulta (e combinação de fatores, se houver), a partir do
+    resumo por grupo e das diferenças pareadas (ver resumir), sem voltar às
+    medições.
+    """
+    chaves = list(resumo.index.names[:-1])
+    indice = resumo.index.droplevel('tipo_api').unique()
+    
+    estatisticas = estatisticas_por_api(resumo)
+    colunas = estatisticas.columns
+    rest = estatisticas_da_api(estatisticas, 'REST', indice)
+    graphql = estatisticas_da_api(estatisticas, 'GraphQL', indice)
+    t_tempo, p_tempo = teste_t_agrupado(rest, graphql, diferencas['tempo_ms'], 'tempo')
+    t_tamanho, p_tamanho = teste_t_agrupado(rest, graphql, diferencas['tamanho_bytes'], 'tamanho')
+    
+    # Metadados da consulta, da primeira linha do grupo (a do primeiro tipo de API medido)
+    primeiros = estatisticas[['complexidade', 'num_endpoints']].groupby(level=chaves, sort=False).head(1)
+    primeiros = primeiros.droplevel('tipo_api').reindex(indice)
+    metrica = {
+        'complexidade': primeiros['complexidade'],
+        'num_endpoints': primeiros['num_endpoints'],
+    }
+    
+    # Tempo e tamanho de cada API
+    for prefixo, api in [('rest', rest), ('graphql', graphql)]:
+        for estatistica in ['media', 'mediana', 'desvio', 'min', 'max', 'p25', 'p75', 'p95']:
+            metrica[f'{prefixo}_tempo_{estatistica}'] = api[f'tempo_{estatistica}']
+    for prefixo, api in [('rest', rest), ('graphql', graphql)]:
+        metrica[f'{prefixo}_tamanho_media'] = api['tamanho_media']
+        metrica[f'{prefixo}_tamanho_desvio'] = api['tamanho_desvio']
+    
+    metrica.update({
+        # Ganhos Percentuais
+        'ganho_tempo_percentual': ((rest['tempo_media'] - graphql['tempo_media']) / rest['tempo_media']) * 100,
+        'ganho_tamanho_percentual': ((rest['tamanho_media'] - graphql['tamanho_media']) / rest['tamanho_media']) * 100,
         
-        # Dados REST
-        rest_data = df_consulta[df_consulta['tipo_api'] == 'REST']
-        tempo_rest = rest_data['tempo_ms'].values
-        tamanho_rest = rest_data['tamanho_bytes'].values
+        # Speedup
+        'speedup': rest['tempo_media'] / graphql['tempo_media'],
         
-        # Dados GraphQL
-        graphql_data = df_consulta[df_consulta['tipo_api'] == 'GraphQL']
-        tempo_graphql = graphql_data['tempo_ms'].values
-        tamanho_graphql = graphql_data['tamanho_bytes'].values
+        # Redução absoluta
+        'reducao_tempo_ms': rest['tempo_media'] - graphql['tempo_media'],
+        'reducao_tamanho_bytes': rest['tamanho_media'] - graphql['tamanho_media'],
         
-        # Estatísticas de Tempo
-        metrica = {
-            'consulta': consulta,
-            'complexidade': df_consulta['complexidade'].iloc[0],
-            'num_endpoints': df_consulta['num_endpoints'].iloc[0],
-            
-            # REST - Tempo
-            'rest_tempo_media': np.mean(tempo_rest),
-            'rest_tempo_mediana': np.median(tempo_rest),
-            'rest_tempo_desvio': np.std(tempo_rest),
-            'rest_tempo_min': np.min(tempo_rest),
-            'rest_tempo_max': np.max(tempo_rest),
-            'rest_tempo_p25': np.percentile(tempo_rest, 25),
-            'rest_tempo_p75': np.percentile(tempo_rest, 75),
-            'rest_tempo_p95': np.percentile(tempo_rest, 95),
-            
-            # GraphQL - Tempo
-            'graphql_tempo_media': np.mean(tempo_graphql),
-            'graphql_tempo_mediana': np.median(tempo_graphql),
-            'graphql_tempo_desvio': np.std(tempo_graphql),
-            'graphql_tempo_min': np.min(tempo_graphql),
-            'graphql_tempo_max': np.max(tempo_graphql),
-            'graphql_tempo_p25': np.percentile(tempo_graphql, 25),
-            'graphql_tempo_p75': np.percentile(tempo_graphql, 75),
-            'graphql_tempo_p95': np.percentile(tempo_graphql, 95),
-            
-            # REST - Tamanho
-            'rest_tamanho_media': np.mean(tamanho_rest),
-            'rest_tamanho_desvio': np.std(tamanho_rest),
-            
-            # GraphQL - Tamanho
-            'graphql_tamanho_media': np.mean(tamanho_graphql),
-            'graphql_tamanho_desvio': np.std(tamanho_graphql),
-            
-            # Ganhos Percentuais
-            'ganho_tempo_percentual': ((np.mean(tempo_rest) - np.mean(tempo_graphql)) / np.mean(tempo_rest)) * 100,
-            'ganho_tamanho_percentual': ((np.mean(tamanho_rest) - np.mean(tamanho_graphql)) / np.mean(tamanho_rest)) * 100,
-            
-            # Speedup
-            'speedup': np.mean(tempo_rest) / np.mean(tempo_graphql),
-            
-            # Redução absoluta
-            'reducao_tempo_ms': np.mean(tempo_rest) - np.mean(tempo_graphql),
-            'reducao_tamanho_bytes': np.mean(tamanho_rest) - np.mean(tamanho_graphql),
-            
-            # Coeficiente de Variação (estabilidade)
-            'rest_cv_tempo': (np.std(tempo_rest) / np.mean(tempo_rest)) * 100,
-            'graphql_cv_tempo': (np.std(tempo_graphql) / np.mean(tempo_graphql)) * 100,
-            
-            # Teste estatístico (t-test pareado)
-            't_statistic_tempo': stats.ttest_rel(tempo_rest, tempo_graphql)[0],
-            'p_value_tempo': stats.ttest_rel(tempo_rest, tempo_graphql)[1],
-            't_statistic_tamanho': stats.ttest_rel(tamanho_rest, tamanho_graphql)[0],
-            'p_value_tamanho': stats.ttest_rel(tamanho_rest, tamanho_graphql)[1],
-            
-            # Significância estatística (α = 0.05)
-            'significante_tempo': 'Sim' if stats.ttest_rel(tempo_rest, tempo_graphql)[1] < 0.05 else 'Não',
-            'significante_tamanho': 'Sim' if stats.ttest_rel(tamanho_rest, tamanho_graphql)[1] < 0.05 else 'Não',
-        }
+        # Coeficiente de Variação (estabilidade)
+        'rest_cv_tempo': (rest['tempo_desvio'] / rest['tempo_media']) * 100,
+        'graphql_cv_tempo': (graphql['tempo_desvio'] / graphql['tempo_media']) * 100,
+        
+        # Teste estatístico (t-test pareado)
+        't_statistic_tempo': t_tempo,
+        'p_value_tempo': p_tempo,
+        't_statistic_tamanho': t_tamanho,
+        'p_value_tamanho': p_tamanho,
         
-        metricas.append(metrica)
+        # Significância estatística (α = 0.05)
+        'significante_tempo': significante(p_tempo),
+        'significante_tamanho': significante(p_tamanho),
+    })
+    
+    # Tempo médio de cada fase da requisição, bytes na rede e descompressão
+    for coluna, _ in COLUNAS_FASES + COLUNAS_BYTES + COLUNAS_COMPRESSAO:
+        if f'{coluna}_media' in colunas:
+            metrica[f'rest_{coluna}_media'] = rest[f'{coluna}_media']
+            metrica[f'graphql_{coluna}_media'] = graphql[f'{coluna}_media']
+    if 'bytes_rede_media' in colunas:
+        metrica['ganho_bytes_rede_percentual'] = ((rest['bytes_rede_media'] - graphql['bytes_rede_media'])
+                                                  / rest['bytes_rede_media']) * 100
+    
+    # Custo de decodificação no cliente
+    for coluna, _ in COLUNAS_DECODIFICACAO:
+        if f'{coluna}_media' in colunas:
+            metrica[f'rest_{coluna}_media'] = rest[f'{coluna}_media']
+            metrica[f'graphql_{coluna}_media'] = graphql[f'{coluna}_media']
+    if 'decod_tempo_ms_media' in colunas:
+        metrica['razao_decod_tempo_rest_graphql'] = rest['decod_tempo_ms_media'] / graphql['decod_tempo_ms_media']
+    
+    # Amostras ruidosas e tempo médio com elas de peso menor
+    if 'tempo_media_ponderada' in colunas:
+        metrica.update({
+            'rest_amostras_ruidosas': rest['amostras_ruidosas'],
+            'graphql_amostras_ruidosas': graphql['amostras_ruidosas'],
+            'rest_tempo_media_ponderada': rest['tempo_media_ponderada'],
+            'graphql_tempo_media_ponderada': graphql['tempo_media_ponderada'],
+            'speedup_ponderado': rest['tempo_media_ponderada'] / graphql['tempo_media_ponderada'],
+        })
+    
+    # REST-paralelo (apenas consultas com múltiplos endpoints independentes)
+    if 'REST-paralelo' in estatisticas.index.get_level_values('tipo_api'):
+        paralelo = estatisticas_da_api(estatisticas, 'REST-paralelo', indice)
+        medido = paralelo['n'].notna().values
+        # Amostras independentes: teste t de Welch
+        t_paralelo, p_paralelo = teste_welch(paralelo, graphql, 'tempo')
+        metrica.update({
+            'rest_paralelo_tempo_media': paralelo['tempo_media'],
+            'rest_paralelo_tempo_mediana': paralelo['tempo_mediana'],
+            'rest_paralelo_tempo_desvio': paralelo['tempo_desvio'],
+            'rest_paralelo_tempo_p95': paralelo['tempo_p95'],
+            'rest_paralelo_tamanho_media': paralelo['tamanho_media'],
+            'speedup_paralelo': paralelo['tempo_media'] / graphql['tempo_media'],
+            'ganho_paralelo_vs_serial_percentual': ((rest['tempo_media'] - paralelo['tempo_media']) / rest['tempo_media']) * 100,
+            't_statistic_tempo_paralelo': t_paralelo,
+            'p_value_tempo_paralelo': p_paralelo,
+            'significante_tempo_paralelo': pd.Series(significante(p_paralelo)).where(medido),
+        })
+        for coluna, _ in COLUNAS_FASES + COLUNAS_BYTES + COLUNAS_COMPRESSAO + COLUNAS_DECODIFICACAO:
+            if f'{coluna}_media' in colunas:
+                metrica[f'rest_paralelo_{coluna}_media'] = paralelo[f'{coluna}_media']
     
-    return pd.DataFrame(metricas)
+    colunas = {nome: valores.values if isinstance(valores, pd.Series) else valores
+               for nome, valores in metrica.items()}
+    return pd.concat([indice.to_frame(index=False), pd.DataFrame(colunas)], axis=1)
 
-def calcular_metricas_gerais(df):
-    """Calcula métricas gerais do experimento"""
+def media_agregada(agregado, rotulo, coluna):
+    """Média de uma coluna num grupo dos momentos agregados (NaN se ausente)"""
+    if coluna not in agregado.columns.get_level_values(0) or rotulo not in agregado.index:
+        return np.nan
+    return agregado.loc[rotulo, (coluna, 'media')]
+
+def teste_t_student(agregado, coluna, a='REST', b='GraphQL'):
+    """p-valor do teste t de Student (variâncias iguais) entre dois tipos de API, a partir dos momentos"""
+    e = agregado[coluna]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        desvios = np.sqrt(e['m2'] / (e['n'] - 1))
+        return stats.ttest_ind_from_stats(e.loc[a, 'media'], desvios[a], e.loc[a, 'n'],
+                                          e.loc[b, 'media'], desvios[b], e.loc[b, 'n'])[1]
+
+def calcular_metricas_gerais(resumo, inicio, fim, resumo_decodificador=None):
+    """
+    Calcula métricas gerais do experimento, mesclando os momentos dos grupos
+    do resumo (inicio e fim: primeiro e último timestamp das medições)
+
+    resumo_decodificador: fatia decodificador × tipo_api do cubo, para o
+    custo de decodificação de cada decodificador
+    """
+    colunas = resumo.columns.get_level_values(0)
+    por_api = agregar_momentos(resumo, ['tipo_api'])
+    
+    def media(api, coluna):
+        return media_agregada(por_api, api, coluna)
     
-    rest_data = df[df['tipo_api'] == 'REST']
-    graphql_data = df[df['tipo_api'] == 'GraphQL']
+    contagem = por_api[('tempo_ms', 'n')]
     
     metricas_gerais = {
-        'total_medicoes': len(df),
-        'medicoes_rest': len(rest_data),
-        'medicoes_graphql': len(graphql_data),
+        'total_medicoes': int(contagem.sum()),
+        'medicoes_rest': int(contagem.get('REST', 0)),
+        'medicoes_graphql': int(contagem.get('GraphQL', 0)),
         
         # Tempo - Geral
-        'tempo_medio_rest': rest_data['tempo_ms'].mean(),
-        'tempo_medio_graphql': graphql_data['tempo_ms'].mean(),
-        'ganho_tempo_geral': ((rest_data['tempo_ms'].mean() - graphql_data['tempo_ms'].mean()) / rest_data['tempo_ms'].mean()) * 100,
-        'speedup_geral': rest_data['tempo_ms'].mean() / graphql_data['tempo_ms'].mean(),
+        'tempo_medio_rest': media('REST', 'tempo_ms'),
+        'tempo_medio_graphql': media('GraphQL', 'tempo_ms'),
+        'ganho_tempo_geral': ((media('REST', 'tempo_ms') - media('GraphQL', 'tempo_ms')) / media('REST', 'tempo_ms')) * 100,
+        'speedup_geral': media('REST', 'tempo_ms') / media('GraphQL', 'tempo_ms'),
         
         # Tamanho - Geral
-        'tamanho_medio_rest': rest_data['tamanho_bytes'].mean(),
-        'tamanho_medio_graphql': graphql_data['tamanho_bytes'].mean(),
-        'ganho_tamanho_geral': ((rest_data['tamanho_bytes'].mean() - graphql_data['tamanho_bytes'].mean()) / rest_data['tamanho_bytes'].mean()) * 100,
-        'reducao_tamanho_geral': rest_data['tamanho_bytes'].mean() / graphql_data['tamanho_bytes'].mean(),
+        'tamanho_medio_rest': media('REST', 'tamanho_bytes'),
+        'tamanho_medio_graphql': media('GraphQL', 'tamanho_bytes'),
+        'ganho_tamanho_geral': ((media('REST', 'tamanho_bytes') - media('GraphQL', 'tamanho_bytes')) / media('REST', 'tamanho_bytes')) * 100,
+        'reducao_tamanho_geral': media('REST', 'tamanho_bytes') / media('GraphQL', 'tamanho_bytes'),
         
         # Testes estatísticos gerais
-        'p_value_tempo_geral': stats.ttest_ind(rest_data['tempo_ms'], graphql_data['tempo_ms'])[1],
-        'p_value_tamanho_geral': stats.ttest_ind(rest_data['tamanho_bytes'], graphql_data['tamanho_bytes'])[1],
+        'p_value_tempo_geral': teste_t_student(por_api, 'tempo_ms'),
+        'p_value_tamanho_geral': teste_t_student(por_api, 'tamanho_bytes'),
         
         # Metadados
-        'data_inicio': df['timestamp'].min(),
-        'data_fim': df['timestamp'].max(),
-        'duracao_experimento_minutos': (df['timestamp'].max() - df['timestamp'].min()).total_seconds() / 60
+        'data_inicio': inicio,
+        'data_fim': fim,
+        'duracao_experimento_minutos': (fim - inicio).total_seconds() / 60
     }
     
+    if 'bytes_rede' in colunas:
+        rede_rest = media('REST', 'bytes_rede')
+        rede_graphql = media('GraphQL', 'bytes_rede')
+        metricas_gerais.update({
+            'bytes_rede_medio_rest': rede_rest,
+            'bytes_rede_medio_graphql': rede_graphql,
+            'ganho_bytes_rede_geral': ((rede_rest - rede_graphql) / rede_rest) * 100,
+            'p_value_bytes_rede_geral': teste_t_student(por_api, 'bytes_rede'),
+        })
+    
+    if 'codificacao' in resumo.index.names:
+        # A diferença de bytes entre REST e GraphQL sob cada compressão
+        por_codificacao = agregar_momentos(resumo, ['codificacao', 'tipo_api'])
+        for codificacao in por_codificacao.index.get_level_values('codificacao').unique():
+            def media_cod(api, coluna):
+                return media_agregada(por_codificacao, (codificacao, api), coluna)
+            rede_rest = media_cod('REST', 'bytes_rede')
+            rede_graphql = media_cod('GraphQL', 'bytes_rede')
+            metricas_gerais.update({
+                f'bytes_rede_medio_rest_{codificacao}': rede_rest,
+                f'bytes_rede_medio_graphql_{codificacao}': rede_graphql,
+                f'ganho_bytes_rede_{codificacao}': ((rede_rest - rede_graphql) / rede_rest) * 100,
+                f'descompressao_media_rest_{codificacao}': media_cod('REST', 'descompressao_ms'),
+                f'descompressao_media_graphql_{codificacao}': media_cod('GraphQL', 'descompressao_ms'),
+                f'speedup_codificacao_{codificacao}': media_cod('REST', 'tempo_ms') / media_cod('GraphQL', 'tempo_ms'),
+            })
+    
+    if 'decod_tempo_ms' in colunas:
+        decod_rest = media('REST', 'decod_tempo_ms')
+        decod_graphql = media('GraphQL', 'decod_tempo_ms')
+        metricas_gerais.update({
+            'decod_tempo_medio_rest': decod_rest,
+            'decod_tempo_medio_graphql': decod_graphql,
+            'decod_memoria_pico_media_rest': media('REST', 'decod_memoria_pico_bytes'),
+            'decod_memoria_pico_media_graphql': media('GraphQL', 'decod_memoria_pico_bytes'),
+            'razao_decod_tempo_rest_graphql': decod_rest / decod_graphql,
+        })
+    
+    if 'decod_tempo_ms' in colunas and resumo_decodificador is not None:
+        por_decodificador = agregar_momentos(resumo_decodificador, ['decodificador'])
+        for decodificador in por_decodificador.index:
+            metricas_gerais[f'decod_tempo_medio_{decodificador}'] = media_agregada(por_decodificador, decodificador, 'decod_tempo_ms')
+    
+    if 'amostra_ruidosa' in colunas:
+        ruidosas = por_api[('amostra_ruidosa', 'soma')]
+        ponderada = por_api[('tempo_ponderado', 'soma')] / por_api[('peso_amostra', 'soma')]
+        metricas_gerais.update({
+            'amostras_ruidosas': int(round(ruidosas.sum())),
+            'percentual_amostras_ruidosas': ruidosas.sum() / por_api[('amostra_ruidosa', 'n')].sum() * 100,
+            'speedup_ponderado_geral': ponderada.get('REST', np.nan) / ponderada.get('GraphQL', np.nan),
+        })
+    
+    if 'REST-paralelo' in por_api.index:
+        # Compara com o GraphQL apenas nas consultas que têm o braço paralelo
+        apis = resumo.index.get_level_values('tipo_api')
+        consultas = resumo.index.get_level_values('consulta')
+        graphql_pareado = resumo[(apis == 'GraphQL') & consultas.isin(consultas[apis == 'REST-paralelo'])]
+        metricas_gerais.update({
+            'medicoes_rest_paralelo': int(contagem['REST-paralelo']),
+            'tempo_medio_rest_paralelo': media('REST-paralelo', 'tempo_ms'),
+            'speedup_geral_paralelo': (media('REST-paralelo', 'tempo_ms') /
+                                       media_agregada(agregar_momentos(graphql_pareado, ['tipo_api']), 'GraphQL', 'tempo_ms')),
+        })
+    
+    if 'estado_conexao' in resumo.index.names:
+        por_estado = agregar_momentos(resumo, ['estado_conexao', 'tipo_api'])
+        for estado in por_estado.index.get_level_values('estado_conexao').unique():
+            tempo_rest = media_agregada(por_estado, (estado, 'REST'), 'tempo_ms')
+            tempo_graphql = media_agregada(por_estado, (estado, 'GraphQL'), 'tempo_ms')
+            metricas_gerais[f'tempo_medio_rest_{estado}'] = tempo_rest
+            metricas_gerais[f'tempo_medio_graphql_{estado}'] = tempo_graphql
+            metricas_gerais[f'speedup_geral_{estado}'] = tempo_rest / tempo_graphql
+    
     return pd.DataFrame([metricas_gerais])
 
-def gerar_tabela_pivot_tempo(df):
+def tabela_pivot(resumo, coluna, funcoes):
+    """Tabela pivot (como DataFrame.pivot_table) de uma coluna por grupo × tipo_api, tirada do resumo"""
+    e = resumo[coluna]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        valores = {'mean': e['media'], 'median': e['p50'], 'std': np.sqrt(e['m2'] / (e['n'] - 1)),
+                   'min': e['min'], 'max': e['max']}
+    partes = {funcao: valores[funcao].unstack('tipo_api').sort_index(axis=1) for funcao in funcoes}
+    # Mínimo e máximo de uma coluna inteira continuam inteiros, como no pivot_table
+    for funcao in ('min', 'max'):
+        if funcao in partes and partes[funcao].notna().all().all() and (partes[funcao] % 1 == 0).all().all():
+            partes[funcao] = partes[funcao].astype('int64')
+    tabela = pd.concat(partes, axis=1)
+    tabela = tabela.sort_index().dropna(axis=1, how='all')
+    tabela.columns.names = [None, 'tipo_api']
+    return tabela.round(2)
+
+def gerar_tabela_pivot_tempo(resumo):
     """Gera tabela pivot para análise de tempo"""
-    return df.pivot_table(
-        values='tempo_ms',
-        index='consulta',
-        columns='tipo_api',
-        aggfunc=['mean', 'median', 'std', 'min', 'max']
-    ).round(2)
-
-def gerar_tabela_pivot_tamanho(df):
+    return tabela_pivot(resumo, 'tempo_ms', ['mean', 'median', 'std', 'min', 'max'])
+
+def gerar_tabela_pivot_tamanho(resumo):
     """Gera tabela pivot para análise de tamanho"""
-    return df.pivot_table(
-        values='tamanho_bytes',
-        index='consulta',
-        columns='tipo_api',
-        aggfunc=['mean', 'std', 'min', 'max']
-    ).round(2)
-
-def criar_dataset_boxplot(df):
-    """Cria dataset otimizado para box plots"""
-    stats_list = []
-    
-    for consulta in df['consulta'].unique():
-        for tipo_api in ['REST', 'GraphQL']:
-            dados = df[(df['consulta'] == consulta) & (df['tipo_api'] == tipo_api)]
-            
-            for metrica, coluna in [('Tempo (ms)', 'tempo_ms'), ('Tamanho (bytes)', 'tamanho_bytes')]:
-                valores = dados[coluna].values
-                stats_list.append({
-                    'consulta': consulta,
-                    'tipo_api': tipo_api,
-                    'metrica': metrica,
-                    'min': np.min(valores),
-                    'q1': np.percentile(valores, 25),
-                    'mediana': np.median(valores),
-                    'q3': np.percentile(valores, 75),
-                    'max': np.max(valores),
-                    'media': np.mean(valores),
-                    'desvio': np.std(valores)
-                })
-    
-    return pd.DataFrame(stats_list)
+    return tabela_pivot(resumo, 'tamanho_bytes', ['mean', 'std', 'min', 'max'])
+
+def gerar_tabela_pivot_tempo_hora(cubo):
+    """Tabela pivot do tempo por consulta × período do dia × hora, para ver a variação ao longo do dia"""
+    return tabela_pivot(cubo.fatia(['consulta'] + DIMENSOES_TEMPO), 'tempo_ms', ['mean', 'median', 'std'])
+
+def criar_dataset_boxplot(resumo):
+    """Cria dataset otimizado para box plots: uma linha por grupo × tipo de API × métrica"""
+    metricas = [('Tempo (ms)', 'tempo_ms'), ('Tamanho (bytes)', 'tamanho_bytes')]
+    metricas += [(nome, coluna) for coluna, nome in COLUNAS_FASES + COLUNAS_BYTES + COLUNAS_COMPRESSAO + COLUNAS_DECODIFICACAO
+                 if coluna in resumo.columns.get_level_values(0)]
+    
+    apis = resumo.index.get_level_values('tipo_api')
+    resumo = resumo[apis.isin(APIS_BOXPLOT)]
+    # Grupos na ordem em que aparecem e, dentro de cada um, tipos de API na ordem de APIS_BOXPLOT
+    grupo = resumo.index.droplevel('tipo_api')
+    ordem = np.lexsort((pd.Categorical(resumo.index.get_level_values('tipo_api'), APIS_BOXPLOT).codes,
+                        grupo.unique().get_indexer(grupo)))
+    resumo = resumo.iloc[ordem]
+    
+    partes = []
+    for metrica, coluna in metricas:
+        e = resumo[coluna]
+        partes.append(pd.DataFrame({
+            'metrica': metrica,
+            'min': e['min'],
+            'q1': e['p25'],
+            'mediana': e['p50'],
+            'q3': e['p75'],
+            'max': e['max'],
+            'media': e['media'],
+            'desvio': np.sqrt(e['m2'] / e['n'])
+        }).reset_index())
+    
+    # Métricas de cada grupo × tipo de API lado a lado, na ordem de metricas
+    boxplot = pd.concat(partes, keys=range(len(partes)), names=['_metrica', '_linha']).reset_index()
+    boxplot = boxplot.sort_values(['_linha', '_metrica'], kind='stable')
+    return boxplot.drop(columns=['_metrica', '_linha']).reset_index(drop=True)
+
+def calcular_eficiencia_limite(resumo):
+    """
+    Eficiência no limite de requisições: uma linha por consulta, com os
+    tipos de API lado a lado - pontos gastos por execução, itens por ponto
+    e itens por hora que o limite comporta (None sem as colunas de limite)
+    """
+    if 'custo_limite' not in resumo.columns.get_level_values(0):
+        return None
+    por_consulta = agregar_momentos(resumo, ['consulta', 'tipo_api'])
+    itens = resumo[('meta', 'itens_retornados')].groupby(level='consulta', sort=False).first()
+    linhas = []
+    
+    for consulta in por_consulta.index.get_level_values('consulta').unique():
+        linha = {'consulta': consulta, 'itens_retornados': itens[consulta]}
+        
+        for tipo_api, prefixo in PREFIXOS_API.items():
+            if (consulta, tipo_api) not in por_consulta.index or por_consulta.loc[(consulta, tipo_api), ('custo_limite', 'n')] == 0:
+                continue
+            custo = media_agregada(por_consulta, (consulta, tipo_api), 'custo_limite')
+            linha[f'{prefixo}_requisicoes_media'] = media_agregada(por_consulta, (consulta, tipo_api), 'requisicoes')
+            linha[f'{prefixo}_custo_limite_media'] = custo
+            linha[f'{prefixo}_ratelimit_consumido_media'] = media_agregada(por_consulta, (consulta, tipo_api), 'ratelimit_consumido')
+            linha[f'{prefixo}_itens_por_ponto'] = linha['itens_retornados'] / custo
+            linha[f'{prefixo}_itens_por_hora'] = linha[f'{prefixo}_itens_por_ponto'] * LIMITE_PONTOS_HORA
+        
+        if 'rest_itens_por_ponto' in linha and 'graphql_itens_por_ponto' in linha:
+            linha['razao_itens_por_ponto_graphql_rest'] = linha['graphql_itens_por_ponto'] / linha['rest_itens_por_ponto']
+        
+        linhas.append(linha)
+    
+    return pd.DataFrame(linhas)
+
+def calcular_testes_nao_parametricos(df, reamostragens=REAMOSTRAGENS, processos=None, cache=None, hashes=None):
+    """
+    Mann-Whitney, delta de Cliff e ICs bootstrap do speedup da média e da
+    mediana (ver testes_nao_parametricos.py) em cada grupo consulta × fatores
+    e com todas as consultas juntas ('Todas')
+
+    Args:
+        cache, hashes: CacheDashboard e hashes dos grupos consulta × tipo_api
+            (ver cache_dashboard.py); só as comparações com grupos que mudaram
+            são recalculadas
+
+    Returns:
+        DataFrame com uma linha por grupo e comparação de COMPARACOES_NAO_PARAMETRICAS
+    """
+    chaves = ['consulta'] + fatores_presentes(df)
+    df = df.dropna(subset=chaves + ['tipo_api'])
+    tempos = {rotulo: valores.to_numpy(dtype=float)
+              for rotulo, valores in df.groupby(chaves + ['tipo_api'], sort=False)['tempo_ms']}
+    geral = {api: valores.to_numpy(dtype=float) for api, valores in df.groupby('tipo_api', sort=False)['tempo_ms']}
+    
+    hashes = hashes or {}
+    hash_geral = {api: resumo_hash(sorted((rotulo, h) for rotulo, h in hashes.items() if rotulo[1] == api))
+                  for api in geral}
+    
+    # Cada comparação: (linha de rótulos, par de amostras, identificador, hashes dos dois grupos)
+    comparacoes = []
+    grupos = dict.fromkeys(rotulo[:-1] for rotulo in tempos)
+    for api_a, api_b in COMPARACOES_NAO_PARAMETRICAS:
+        for grupo in grupos:
+            if grupo + (api_a,) in tempos and grupo + (api_b,) in tempos:
+                comparacoes.append(({**dict(zip(chaves, grupo)), 'api_a': api_a, 'api_b': api_b},
+                                    (tempos[grupo + (api_a,)], tempos[grupo + (api_b,)]),
+                                    repr((grupo, api_a, api_b)),
+                                    (hashes.get((grupo[0], api_a)), hashes.get((grupo[0], api_b)))))
+        if api_a in geral and api_b in geral:
+            comparacoes.append(({'consulta': 'Todas', 'api_a': api_a, 'api_b': api_b},
+                                (geral[api_a], geral[api_b]),
+                                repr(('Todas', api_a, api_b)),
+                                (hash_geral[api_a], hash_geral[api_b])))
+    if not comparacoes:
+        return None
+    
+    # Resultados guardados das comparações cujos grupos não mudaram; as demais são calculadas
+    resultados = [cache.teste((identificador, h)) if cache is not None and None not in h else None
+                  for _, _, identificador, h in comparacoes]
+    faltam = [i for i, resultado in enumerate(resultados) if resultado is None]
+    calculados = comparar_varios([comparacoes[i][1] for i in faltam], reamostragens, processos=processos,
+                                 identificadores=[comparacoes[i][2] for i in faltam]) if faltam else []
+    for i, resultado in zip(faltam, calculados):
+        resultados[i] = resultado
+        if cache is not None and None not in comparacoes[i][3]:
+            cache.guardar_teste((comparacoes[i][2], comparacoes[i][3]), resultado)
+    
+    linhas = [linha for linha, _, _, _ in comparacoes]
+    resultados = pd.DataFrame(resultados)
+    testes = pd.concat([pd.DataFrame(linhas, columns=chaves + ['api_a', 'api_b']), resultados], axis=1)
+    testes['significante'] = pd.Series(significante(testes['p_value'])).where(testes['p_value'].notna())
+    return testes
+
+def carregar_carga(arquivo='resultados_carga.csv'):
+    """Carrega a varredura do modo de carga (None se carga.py não foi executado)"""
+    if not os.path.exists(arquivo):
+        return None
+    return pd.read_csv(arquivo)
+
+def calcular_metricas_carga(df_carga):
+    """
+    Agrega a varredura de concorrência (uma ou mais execuções de carga.py):
+    uma linha por consulta e nível, com os tipos de API lado a lado
+    """
+    linhas = []
+    
+    for (consulta, concorrencia), df_nivel in df_carga.groupby(['consulta', 'concorrencia']):
+        linha = {'consulta': consulta, 'concorrencia': concorrencia}
+        
+        for tipo_api, prefixo in PREFIXOS_API.items():
+            dados = df_nivel[df_nivel['tipo_api'] == tipo_api]
+            if len(dados) == 0:
+                continue
+            linha[f'{prefixo}_requisicoes'] = dados['requisicoes'].sum()
+            linha[f'{prefixo}_erros'] = dados['erros'].sum()
+            for coluna in COLUNAS_CARGA:
+                linha[f'{prefixo}_{coluna}'] = dados[coluna].mean()
+        
+        if 'rest_vazao_rps' in linha and 'graphql_vazao_rps' in linha:
+            linha['razao_vazao_graphql_rest'] = linha['graphql_vazao_rps'] / linha['rest_vazao_rps']
+            linha['razao_p99_corrigido_rest_graphql'] = linha['rest_p99_corrigido_ms'] / linha['graphql_p99_corrigido_ms']
+        
+        linhas.append(linha)
+    
+    return pd.DataFrame(linhas)
+
+def carregar_varredura(arquivo='resultados_varredura.csv'):
+    """Carrega a varredura de paginação e lotes (None se varredura.py não foi executado)"""
+    if not os.path.exists(arquivo):
+        return None
+    return pd.read_csv(arquivo)
+
+def calcular_curvas_varredura(df_varredura):
+    """
+    Curvas de latência × bytes da varredura de paginação e lotes: uma linha
+    por ponto (itens por página × páginas, ou consultas no lote), com os
+    tipos de API lado a lado e o mais rápido em cada ponto
+    """
+    linhas = []
+    chaves = ['modo', 'tamanho_pagina', 'paginas', 'consultas_lote']
+    
+    for valores, df_ponto in df_varredura.groupby(chaves, dropna=False):
+        linha = dict(zip(chaves, valores))
+        
+        for tipo_api, prefixo in PREFIXOS_API.items():
+            dados = df_ponto[df_ponto['tipo_api'] == tipo_api]
+            if len(dados) == 0:
+                continue
+            linha[f'{prefixo}_n'] = len(dados)
+            linha[f'{prefixo}_itens'] = dados['itens'].mean()
+            linha[f'{prefixo}_requisicoes'] = dados['requisicoes'].mean()
+            linha[f'{prefixo}_tempo_medio'] = dados['tempo_ms'].mean()
+            linha[f'{prefixo}_tempo_mediana'] = dados['tempo_ms'].median()
+            linha[f'{prefixo}_tempo_p95'] = dados['tempo_ms'].quantile(0.95)
+            linha[f'{prefixo}_tamanho_medio'] = dados['tamanho_bytes'].mean()
+            linha[f'{prefixo}_bytes_rede_medio'] = dados['bytes_rede'].mean()
+            linha[f'{prefixo}_ms_por_item'] = linha[f'{prefixo}_tempo_medio'] / linha[f'{prefixo}_itens']
+        
+        tempos = {tipo_api: linha[f'{prefixo}_tempo_medio'] for tipo_api, prefixo in PREFIXOS_API.items()
+                  if f'{prefixo}_tempo_medio' in linha}
+        linha['mais_rapido'] = min(tempos, key=tempos.get)
+        if 'rest_tempo_medio' in linha and 'graphql_tempo_medio' in linha:
+            linha['razao_tempo_rest_graphql'] = linha['rest_tempo_medio'] / linha['graphql_tempo_medio']
+            linha['razao_bytes_rede_rest_graphql'] = linha['rest_bytes_rede_medio'] / linha['graphql_bytes_rede_medio']
+        if 'graphql_lote_tempo_medio' in linha and 'graphql_tempo_medio' in linha:
+            linha['speedup_lote'] = linha['graphql_tempo_medio'] / linha['graphql_lote_tempo_medio']
+        
+        linhas.append(linha)
+    
+    return pd.DataFrame(linhas)
+
+def pontos_de_cruzamento(df_curvas):
+    """
+    Pontos em que o tipo de API mais rápido muda ao longo de cada curva:
+    na paginação, para cada tamanho de página conforme cresce o número de
+    páginas; no lote, conforme cresce o número de consultas
+    """
+    curvas = [(f"{tamanho:.0f} itens/página", df_curva, 'paginas')
+              for tamanho, df_curva in df_curvas[df_curvas['modo'] == 'paginacao'].groupby('tamanho_pagina')]
+    df_lote = df_curvas[df_curvas['modo'] == 'lote']
+    if len(df_lote) > 0:
+        curvas.append(('lote', df_lote, 'consultas_lote'))
+    
+    cruzamentos = []
+    for curva, df_curva, eixo in curvas:
+        anterior = None
+        for _, row in df_curva.sort_values(eixo).iterrows():
+            if anterior is not None and row['mais_rapido'] != anterior['mais_rapido']:
+                cruzamentos.append({'curva': curva, 'eixo': eixo,
+                                    'ultimo_antes': anterior[eixo], 'primeiro_depois': row[eixo],
+                                    'antes': anterior['mais_rapido'], 'depois': row['mais_rapido']})
+            anterior = row
+    return cruzamentos
 
 def main():
     """Função principal"""
+    parser = argparse.ArgumentParser(description='Lab 05 - preparação de dados para o dashboard')
+    parser.add_argument('--excluir-ruidosas', action='store_true',
+                        help='Descarta as amostras com ruído no cliente (coluna ruido) antes das métricas')
+    parser.add_argument('--cenarios', default=ARQUIVO_CENARIOS,
+                        help='Catálogo de cenários com os metadados das consultas (padrão: cenarios.json)')
+    parser.add_argument('--entrada', default='resultados_experimento.csv',
+                        help='Resultados do experimento, CSV ou Parquet (padrão: resultados_experimento.csv)')
+    parser.add_argument('--bloco', type=int, default=0, metavar='LINHAS',
+                        help='Processa a entrada em blocos de LINHAS linhas, com memória constante '
+                             f'(quantis aproximados nos grupos com mais de {K_ESBOCO} amostras; ver agregados.py)')
+    parser.add_argument('--reamostragens', type=int, default=REAMOSTRAGENS,
+                        help=f'Reamostragens do bootstrap nos testes não paramétricos (padrão: {REAMOSTRAGENS})')
+    parser.add_argument('--processos', type=int, default=None,
+                        help='Processos para os testes não paramétricos (padrão: um por núcleo)')
+    parser.add_argument('--cache', default=ARQUIVO_CACHE,
+                        help=f'Cache incremental: só as consultas com medições novas ou alteradas são '
+                             f'recalculadas (padrão: {ARQUIVO_CACHE}; ver cache_dashboard.py)')
+    parser.add_argument('--sem-cache', action='store_true',
+                        help='Recalcula tudo, sem ler nem gravar o cache')
+    args = parser.parse_args()
+    if args.entrada.endswith('.parquet') and pq is None:
+        parser.error('Ler Parquet requer o pyarrow (pip install pyarrow)')
+    cenarios = carregar_cenarios(args.cenarios)
+    
     print("="*60)
     print("PREPARAÇÃO DE DADOS PARA DASHBOARD POWER BI")
     print("="*60)
     
-    # 1. Carregar dados
-    print("\n1. Carregando dados do experimento...")
-    df_original = carregar_dados()
-    print(f"   ✓ {len(df_original)} registros carregados")
+    if args.bloco:
+        # 1-2. Ler em blocos, enriquecer e gravar cada bloco, atualizando o cubo de agregados
+        print(f"\n1. Lendo {args.entrada} em blocos de {args.bloco} linhas...")
+        blocos = processar_em_blocos(args.entrada, args.bloco, cenarios, args.excluir_ruidosas)
+        print(f"   ✓ {blocos['registros']} registros em {blocos['blocos']} blocos")
+        print("\n2. Adicionando métricas derivadas...")
+        print(f"   ✓ Dataset enriquecido com {blocos['colunas']} colunas (gravado bloco a bloco)")
+        cubo, inicio, fim, ruidosas = blocos['cubo'], blocos['inicio'], blocos['fim'], blocos['ruidosas']
+        cache, hashes = None, None
+    else:
+        # 1. Carregar dados
+        print("\n1. Carregando dados do experimento...")
+        df_original = carregar_dados(args.entrada)
+        print(f"   ✓ {len(df_original)} registros carregados")
+        
+        # Hashes das medições de cada consulta × tipo_api, antes de enriquecer
+        cache, hashes = None, None
+        if not args.sem_cache:
+            with open(args.cenarios, 'rb') as f:
+                catalogo = f.read()
+            assinatura = resumo_hash(VERSAO_CACHE, catalogo, list(df_original.dtypes.astype(str).items()),
+                                     args.excluir_ruidosas, args.reamostragens)
+            cache = CacheDashboard(args.cache, assinatura)
+            hashes = hashes_grupos(df_original)
+        
+        # 2. Adicionar métricas derivadas
+        print("\n2. Adicionando métricas derivadas...")
+        df_enriquecido = adicionar_metricas_derivadas(df_original, cenarios)
+        print(f"   ✓ Dataset enriquecido com {len(df_enriquecido.columns)} colunas")
+        ruidosas = df_enriquecido['amostra_ruidosa'].sum() if 'amostra_ruidosa' in df_enriquecido.columns else None
+        if ruidosas is not None and args.excluir_ruidosas:
+            df_enriquecido = excluir_amostras_ruidosas(df_enriquecido)
+        cubo, recalculadas = montar_cubo(df_enriquecido, cache, hashes)
+        inicio, fim = df_enriquecido['timestamp'].min(), df_enriquecido['timestamp'].max()
+    if ruidosas is not None:
+        if args.excluir_ruidosas:
+            print(f"   ✓ {ruidosas} amostras com ruído no cliente excluídas")
+        else:
+            print(f"   ✓ {ruidosas} amostras com ruído no cliente (peso {PESO_AMOSTRA_RUIDOSA} nas médias ponderadas)")
+    if cache is not None:
+        print(f"   ✓ Cache: {cache.reaproveitados['cubos']} consultas reaproveitadas, {len(recalculadas)} recalculadas")
     
-    # 2. Adicionar métricas derivadas
-    print("\n2. Adicionando métricas derivadas...")
-    df_enriquecido = adicionar_metricas_derivadas(df_original)
-    print(f"   ✓ Dataset enriquecido com {len(df_enriquecido.columns)} colunas")
+    # Todas as tabelas abaixo são fatias do cubo, calculado uma única vez
+    resumo, diferencas = resumir(cubo)
     
     # 3. Calcular métricas comparativas
     print("\n3. Calculando métricas comparativas...")
-    df_metricas = calcular_metricas_comparativas(df_enriquecido)
+    df_metricas = calcular_metricas_comparativas(resumo, diferencas)
     print(f"   ✓ Métricas calculadas para {len(df_metricas)} consultas")
     
     # 4. Calcular métricas gerais
     print("\n4. Calculando métricas gerais...")
-    df_gerais = calcular_metricas_gerais(df_enriquecido)
+    resumo_decodificador = cubo.fatia(['decodificador']) if 'decodificador' in cubo.dimensoes else None
+    df_gerais = calcular_metricas_gerais(resumo, inicio, fim, resumo_decodificador)
     print(f"   ✓ Métricas gerais calculadas")
     
     # 5. Criar datasets para visualizações
     print("\n5. Criando datasets para visualizações...")
-    df_boxplot = criar_dataset_boxplot(df_enriquecido)
+    df_boxplot = criar_dataset_boxplot(resumo)
     print(f"   ✓ Dataset para box plots criado")
     
     # 6. Salvar arquivos
     print("\n6. Salvando arquivos...")
     
-    # Dataset principal enriquecido
-    df_enriquecido.to_csv('dados_enriquecidos.csv', index=False, encoding='utf-8-sig')
+    # Dataset principal enriquecido (no modo em blocos, já gravado)
+    if not args.bloco:
+        df_enriquecido.to_csv('dados_enriquecidos.csv', index=False, encoding='utf-8-sig')
     print("   ✓ dados_enriquecidos.csv")
     
     # Métricas comparativas
@@ -266,14 +992,51 @@ def main():
     print("   ✓ dados_boxplot.csv")
     
     # Pivots para tabelas
-    pivot_tempo = gerar_tabela_pivot_tempo(df_enriquecido)
+    pivot_tempo = gerar_tabela_pivot_tempo(resumo)
     pivot_tempo.to_csv('pivot_tempo.csv', encoding='utf-8-sig')
     print("   ✓ pivot_tempo.csv")
     
-    pivot_tamanho = gerar_tabela_pivot_tamanho(df_enriquecido)
+    pivot_tamanho = gerar_tabela_pivot_tamanho(resumo)
     pivot_tamanho.to_csv('pivot_tamanho.csv', encoding='utf-8-sig')
     print("   ✓ pivot_tamanho.csv")
     
+    pivot_tempo_hora = gerar_tabela_pivot_tempo_hora(cubo)
+    pivot_tempo_hora.to_csv('pivot_tempo_hora.csv', encoding='utf-8-sig')
+    print("   ✓ pivot_tempo_hora.csv")
+    
+    # Eficiência no limite de requisições, quando registrado
+    df_eficiencia = calcular_eficiencia_limite(resumo)
+    if df_eficiencia is not None:
+        df_eficiencia.to_csv('eficiencia_limite.csv', index=False, encoding='utf-8-sig')
+        print("   ✓ eficiencia_limite.csv")
+    
+    # Testes não paramétricos e bootstrap, sobre as medições (só com o dataset em memória)
+    df_testes = None
+    if args.bloco:
+        print("   - testes_nao_parametricos.csv não gerado: os testes precisam das medições (rode sem --bloco)")
+    else:
+        df_testes = calcular_testes_nao_parametricos(df_enriquecido, args.reamostragens, args.processos, cache, hashes)
+        if cache is not None:
+            cache.salvar()
+        if df_testes is not None:
+            df_testes.to_csv('testes_nao_parametricos.csv', index=False, encoding='utf-8-sig')
+            reaproveitados = f" ({cache.reaproveitados['testes']} de {len(df_testes)} comparações do cache)" if cache is not None else ''
+            print(f"   ✓ testes_nao_parametricos.csv{reaproveitados}")
+    
+    # Varredura de concorrência (modo de carga), quando executada
+    df_carga = carregar_carga()
+    if df_carga is not None:
+        df_metricas_carga = calcular_metricas_carga(df_carga)
+        df_metricas_carga.to_csv('metricas_carga.csv', index=False, encoding='utf-8-sig')
+        print("   ✓ metricas_carga.csv")
+    
+    # Varredura de paginação e lotes, quando executada
+    df_varredura = carregar_varredura()
+    if df_varredura is not None:
+        df_curvas = calcular_curvas_varredura(df_varredura)
+        df_curvas.to_csv('curvas_varredura.csv', index=False, encoding='utf-8-sig')
+        print("   ✓ curvas_varredura.csv")
+    
     # 7. Exibir resumo
     print("\n" + "="*60)
     print("RESUMO DAS MÉTRICAS GERAIS")
@@ -287,6 +1050,13 @@ def main():
     print(f"GraphQL - Média: {df_gerais['tempo_medio_graphql'].iloc[0]:.2f} ms")
     print(f"Ganho: {df_gerais['ganho_tempo_geral'].iloc[0]:.2f}%")
     print(f"Speedup: {df_gerais['speedup_geral'].iloc[0]:.2f}x")
+    for coluna in df_gerais.columns:
+        if coluna.startswith('speedup_geral_') and coluna != 'speedup_geral_paralelo':
+            print(f"Speedup (conexão {coluna[len('speedup_geral_'):]}): {df_gerais[coluna].iloc[0]:.2f}x")
+    if 'amostras_ruidosas' in df_gerais.columns:
+        print(f"Amostras com ruído no cliente: {df_gerais['amostras_ruidosas'].iloc[0]:.0f} "
+              f"({df_gerais['percentual_amostras_ruidosas'].iloc[0]:.1f}%) | "
+              f"Speedup ponderado: {df_gerais['speedup_ponderado_geral'].iloc[0]:.2f}x")
     print(f"P-value: {df_gerais['p_value_tempo_geral'].iloc[0]:.6f}")
     print(f"Significante: {'Sim' if df_gerais['p_value_tempo_geral'].iloc[0] < 0.05 else 'Não'}")
     
@@ -296,14 +1066,60 @@ def main():
     print(f"Redução: {df_gerais['ganho_tamanho_geral'].iloc[0]:.2f}%")
     print(f"P-value: {df_gerais['p_value_tamanho_geral'].iloc[0]:.6f}")
     print(f"Significante: {'Sim' if df_gerais['p_value_tamanho_geral'].iloc[0] < 0.05 else 'Não'}")
+    if 'bytes_rede_medio_rest' in df_gerais.columns:
+        print(f"Na rede (corpo comprimido + cabeçalhos): REST {df_gerais['bytes_rede_medio_rest'].iloc[0]:.2f} bytes | "
+              f"GraphQL {df_gerais['bytes_rede_medio_graphql'].iloc[0]:.2f} bytes | "
+              f"Redução: {df_gerais['ganho_bytes_rede_geral'].iloc[0]:.2f}%")
+    for coluna in df_gerais.columns:
+        if coluna.startswith('ganho_bytes_rede_') and coluna != 'ganho_bytes_rede_geral':
+            codificacao = coluna[len('ganho_bytes_rede_'):]
+            print(f"Na rede com {codificacao}: REST {df_gerais[f'bytes_rede_medio_rest_{codificacao}'].iloc[0]:.2f} bytes | "
+                  f"GraphQL {df_gerais[f'bytes_rede_medio_graphql_{codificacao}'].iloc[0]:.2f} bytes | "
+                  f"Redução: {df_gerais[coluna].iloc[0]:.2f}% | "
+                  f"Speedup: {df_gerais[f'speedup_codificacao_{codificacao}'].iloc[0]:.2f}x")
+    if 'decod_tempo_medio_rest' in df_gerais.columns:
+        print(f"Decodificação no cliente: REST {df_gerais['decod_tempo_medio_rest'].iloc[0]:.3f} ms | "
+              f"GraphQL {df_gerais['decod_tempo_medio_graphql'].iloc[0]:.3f} ms | "
+              f"Pico de memória: REST {df_gerais['decod_memoria_pico_media_rest'].iloc[0]:.0f} bytes | "
+              f"GraphQL {df_gerais['decod_memoria_pico_media_graphql'].iloc[0]:.0f} bytes")
     
     print("\n--- MÉTRICAS POR CONSULTA ---")
     for _, row in df_metricas.iterrows():
-        print(f"\n{row['consulta']}:")
+        fatores = [str(row[f]) for f in fatores_presentes(df_metricas)]
+        print(f"\n{row['consulta']}" + (f" [{', '.join(fatores)}]" if fatores else "") + ":")
         print(f"  Ganho Tempo: {row['ganho_tempo_percentual']:.2f}% | Speedup: {row['speedup']:.2f}x")
+        if 'speedup_ponderado' in row and (row['rest_amostras_ruidosas'] or row['graphql_amostras_ruidosas']):
+            print(f"  Amostras ruidosas: REST {row['rest_amostras_ruidosas']:.0f} | GraphQL {row['graphql_amostras_ruidosas']:.0f} | "
+                  f"Speedup ponderado: {row['speedup_ponderado']:.2f}x")
         print(f"  Ganho Tamanho: {row['ganho_tamanho_percentual']:.2f}%")
+        if 'ganho_bytes_rede_percentual' in row:
+            print(f"  Ganho Bytes na Rede: {row['ganho_bytes_rede_percentual']:.2f}%")
+        if 'razao_decod_tempo_rest_graphql' in row:
+            print(f"  Decodificação REST/GraphQL: {row['razao_decod_tempo_rest_graphql']:.2f}x")
+        if 'speedup_paralelo' in row and pd.notna(row['speedup_paralelo']):
+            print(f"  REST-paralelo vs GraphQL: Speedup {row['speedup_paralelo']:.2f}x | "
+                  f"Ganho sobre REST serial: {row['ganho_paralelo_vs_serial_percentual']:.2f}%")
         print(f"  Significância: Tempo={row['significante_tempo']}, Tamanho={row['significante_tamanho']}")
     
+    if df_eficiencia is not None:
+        print(f"\n--- LIMITE DE REQUISIÇÕES ({LIMITE_PONTOS_HORA} pontos/hora) ---")
+        for _, row in df_eficiencia.iterrows():
+            partes = [f"{tipo_api} {row[f'{prefixo}_custo_limite_media']:.1f} pontos, "
+                      f"{row[f'{prefixo}_itens_por_ponto']:.1f} itens/ponto"
+                      for tipo_api, prefixo in PREFIXOS_API.items()
+                      if f'{prefixo}_itens_por_ponto' in row and pd.notna(row[f'{prefixo}_itens_por_ponto'])]
+            print(f"{row['consulta']}: " + " | ".join(partes))
+    
+    if df_varredura is not None:
+        print("\n--- PAGINAÇÃO E LOTES (CRUZAMENTOS) ---")
+        cruzamentos = pontos_de_cruzamento(df_curvas)
+        unidades = {'paginas': 'página(s)', 'consultas_lote': 'consulta(s)'}
+        for c in cruzamentos:
+            print(f"{c['curva']}: {c['antes']} mais rápido até {c['ultimo_antes']:.0f} {unidades[c['eixo']]}, "
+                  f"{c['depois']} a partir de {c['primeiro_depois']:.0f}")
+        if not cruzamentos:
+            print("Nenhum cruzamento: o mesmo tipo de API é o mais rápido em todas as curvas")
+    
     print("\n" + "="*60)
     print("ARQUIVOS PRONTOS PARA POWER BI!")
     print("="*60)
@@ -314,6 +1130,15 @@ def main():
     print("4. dados_boxplot.csv - Dados para gráficos de distribuição")
     print("5. pivot_tempo.csv - Tabela resumo de tempo")
     print("6. pivot_tamanho.csv - Tabela resumo de tamanho")
+    print("7. pivot_tempo_hora.csv - Tempo por período do dia e hora")
+    if df_testes is not None:
+        print("8. testes_nao_parametricos.csv - Mann-Whitney, delta de Cliff e ICs bootstrap do speedup")
+    if df_eficiencia is not None:
+        print("9. eficiencia_limite.csv - Pontos do limite de requisições e itens por ponto por consulta")
+    if df_carga is not None:
+        print("10. metricas_carga.csv - Vazão e latência de cauda por nível de concorrência")
+    if df_varredura is not None:
+        print("11. curvas_varredura.csv - Latência e bytes por tamanho de página, páginas e consultas em lote")
     
     print("\n✓ Processamento concluído com sucesso!")
 
@@ -0,0 +1,97 @@
+"""
+Lab 05 - Ruído de Medição no Cliente
+Registra, durante o trecho cronometrado de cada medição, o que o próprio
+cliente estava fazendo e pode ter inflado o tempo medido:
+
+- Pausas do coletor de lixo (gc.callbacks): número de coletas e tempo total
+- Tempo de CPU do processo (process_time) comparado ao tempo da medição
+- Carga média do sistema no último minuto por núcleo (os.getloadavg;
+  vazia no Windows)
+
+A amostra é marcada como ruidosa (coluna ruido com 'gc', 'cpu' e/ou
+'carga') quando algum sinal passa do limite. O experimento põe essas
+amostras em quarentena (gravadas, mas fora das estatísticas do braço) e o
+dashboard pode excluí-las ou dar a elas um peso menor.
+"""
+
+import gc
+import os
+from time import perf_counter_ns, process_time_ns
+
+# Limites de cada sinal
+PAUSA_GC_MS = 1.0        # coletas jovens levam dezenas de µs e não afetam latências em ms
+RAZAO_CPU = 0.5          # CPU do processo / tempo da medição: acima disso o cliente estava ocupado
+CARGA_POR_NUCLEO = 1.0   # mais processos prontos que núcleos: o cliente disputou a CPU
+
+# Colunas adicionadas aos resultados
+CAMPOS_RUIDO = ['gc_coletas', 'gc_pausa_ms', 'cpu_processo_ms', 'carga_sistema', 'ruido']
+
+
+def carga_por_nucleo():
+    """Carga média do último minuto dividida pelos núcleos ('' sem os.getloadavg)"""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return ''
+
+
+class MonitorRuido:
+    """Sinais de ruído de uma medição por vez, entre iniciar() e finalizar()"""
+
+    def __init__(self):
+        self._ativo = False
+        self._inicio_gc = None
+        self._inicio_cpu = 0
+        self.coletas = 0
+        self.pausa_ns = 0
+        gc.callbacks.append(self._callback_gc)
+
+    def _callback_gc(self, fase, info):
+        if not self._ativo:
+            return
+        if fase == 'start':
+            self._inicio_gc = perf_counter_ns()
+        elif self._inicio_gc is not None:
+            self.pausa_ns += perf_counter_ns() - self._inicio_gc
+            self.coletas += 1
+            self._inicio_gc = None
+
+    def iniciar(self):
+        self.coletas = 0
+        self.pausa_ns = 0
+        self._inicio_gc = None
+        self._inicio_cpu = process_time_ns()
+        self._ativo = True
+
+    def finalizar(self, tempo_ms):
+        """
+        Encerra a medição que durou tempo_ms
+
+        Returns:
+            dict com CAMPOS_RUIDO; ruido traz os sinais acima do limite
+            unidos por '+' ('' numa amostra limpa)
+        """
+        self._ativo = False
+        cpu_ms = (process_time_ns() - self._inicio_cpu) / 1e6
+        pausa_ms = self.pausa_ns / 1e6
+        carga = carga_por_nucleo()
+
+        motivos = []
+        if pausa_ms >= PAUSA_GC_MS:
+            motivos.append('gc')
+        if tempo_ms > 0 and cpu_ms / tempo_ms > RAZAO_CPU:
+            motivos.append('cpu')
+        if carga != '' and carga > CARGA_POR_NUCLEO:
+            motivos.append('carga')
+
+        return {
+            'gc_coletas': self.coletas,
+            'gc_pausa_ms': pausa_ms,
+            'cpu_processo_ms': cpu_ms,
+            'carga_sistema': carga,
+            'ruido': '+'.join(motivos),
+        }
+
+
+# Monitor único: as medições do experimento são feitas uma de cada vez
+monitor = MonitorRuido()
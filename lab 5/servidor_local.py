@@ -0,0 +1,487 @@
+"""
+Lab 05 - Servidor Local (substituto da API do GitHub)
+Atende os endpoints REST e as queries GraphQL das 5 consultas do
+experimento, para rodar o experimento, o modo de carga e o dashboard
+sem rede e sem token:
+
+- Latência sorteada de uma lognormal ajustada, por consulta e tipo de
+  API, aos tempos de resultados/resultados_experimento.csv. Nas consultas
+  REST com vários endpoints, cada requisição recebe uma lognormal com a
+  mesma dispersão e 1/k da mediana, mantendo o total da consulta
+- Corpo gravado da API real (--gravacoes) ou sintético, no formato do
+  GitHub e com o tamanho médio observado no experimento
+- Páginas de issues (REST com per_page/page, GraphQL com first/after) e
+  documentos GraphQL em lote (campos com alias) para varredura.py
+- Limite de requisições como o do GitHub: cabeçalhos X-RateLimit-* com 1
+  ponto por requisição REST (recurso core) e o custo calculado de cada
+  query no GraphQL (recurso graphql), informado também em rateLimit
+  { cost } quando a query pede; o limite é contabilizado, mas não bloqueia
+- Compressão conforme o Accept-Encoding: br (com o pacote brotli
+  instalado), gzip ou nenhuma (identity)
+- Semente fixa: a sequência de latências de cada rota se repete entre
+  execuções
+- Relógio virtual (--relogio-virtual): em vez de esperar, o servidor
+  responde na hora e informa a latência no cabeçalho X-Latencia-Virtual-Ms,
+  que a instrumentação soma ao tempo medido; as medições de um
+  experimento completo são reproduzidas em segundos
+
+Uso:
+    python servidor_local.py --porta 8000 --relogio-virtual
+    python experimento.py --base-url http://127.0.0.1:8000
+"""
+
+import os
+import re
+import sys
+import csv
+import gzip
+import json
+import math
+import random
+import argparse
+import threading
+import statistics
+from time import sleep, time
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from instrumentacao import CABECALHO_LATENCIA_VIRTUAL
+from cenarios import carregar_cenarios
+
+ARQUIVO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  'resultados', 'resultados_experimento.csv')
+
+# Repositório/organização usados por cada consulta em experimento.py
+CONSULTAS_POR_REPOSITORIO = {
+    'torvalds/linux': 'Consulta 1 - Simples',
+    'facebook/react': 'Consulta 2 - Média',
+    'microsoft/vscode': 'Consulta 3 - Complexa',
+    'nodejs/node': 'Consulta 5 - Aninhada',
+}
+CONSULTAS_POR_ORGANIZACAO = {'google': 'Consulta 4 - Lista'}
+
+# Endpoints REST de cada consulta, do catálogo de cenários (tamanho e
+# latência são divididos entre eles)
+ENDPOINTS_REST = {c.nome: c.num_endpoints for c in carregar_cenarios()}
+
+# Trecho da query que identifica cada consulta GraphQL (testados em ordem)
+ASSINATURAS_GRAPHQL = [
+    ('mentionableUsers', 'Consulta 3 - Complexa'),
+    ('history(', 'Consulta 5 - Aninhada'),
+    ('organization(', 'Consulta 4 - Lista'),
+    ('issues(first: 10)', 'Consulta 2 - Média'),
+    ('repository(', 'Consulta 1 - Simples'),
+]
+
+# Varredura de paginação (varredura.py): páginas de issues com o tamanho por
+# item observado na consulta 2 (10 issues por página) e um custo de servidor
+# por item, que é uma suposição do servidor local (não foi medido)
+CONSULTA_PAGINACAO = 'Consulta 2 - Média'
+ITENS_CONSULTA_PAGINACAO = 10
+CUSTO_ITEM_MS = {'REST': 1.0, 'GraphQL': 2.0}
+
+# Lote GraphQL (várias consultas com alias num só documento): cada campo custa
+# a latência da sua consulta e a parcela fixa de uma requisição é paga uma vez
+SOBRECARGA_REQUISICAO_MS = 80
+
+# Limite de requisições por recurso e janela, como na API do GitHub
+LIMITE_PONTOS = 5000
+JANELA_LIMITE_S = 3600
+
+# Usado para consultas sem medições no CSV
+MODELO_PADRAO = {'mu': math.log(500), 'sigma': 0.3, 'tamanho': 2000}
+
+_ROTA_REPOSITORIO = re.compile(r'^/repos/([^/]+)/([^/]+)(?:/(issues|pulls|contributors|commits))?/?$')
+_ROTA_ORGANIZACAO = re.compile(r'^/orgs/([^/]+)/repos/?$')
+_ALIAS_LOTE = re.compile(r'^\s*(\w+)\s*:\s*(?:repository|organization)\(', re.M)
+
+
+def ajustar_modelos(arquivo=ARQUIVO_RESULTADOS):
+    """
+    Ajusta os modelos de resposta aos resultados de um experimento real
+
+    Returns:
+        dict {(consulta, tipo_api): {'mu', 'sigma', 'tamanho'}}, com mu e
+        sigma da lognormal do tempo (ms) e o tamanho médio em bytes
+    """
+    amostras = {}
+    with open(arquivo, 'r', encoding='utf-8-sig', newline='') as f:
+        for linha in csv.DictReader(f):
+            tempo = float(linha['tempo_ms'])
+            if linha['tipo_api'] not in ('REST', 'GraphQL') or tempo <= 0:
+                continue
+            logs, tamanhos = amostras.setdefault((linha['consulta'], linha['tipo_api']), ([], []))
+            logs.append(math.log(tempo))
+            tamanhos.append(float(linha['tamanho_bytes']))
+
+    return {
+        chave: {
+            'mu': statistics.fmean(logs),
+            'sigma': statistics.stdev(logs) if len(logs) > 1 else 0.0,
+            'tamanho': int(statistics.fmean(tamanhos)),
+        }
+        for chave, (logs, tamanhos) in amostras.items()
+    }
+
+
+# ========== Corpos sintéticos no formato do GitHub ==========
+
+def _data(i):
+    return f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T12:00:00Z"
+
+
+def _repositorio(owner, repo, i=0):
+    return {
+        'id': 1000 + i, 'name': repo, 'full_name': f"{owner}/{repo}",
+        'owner': {'login': owner, 'type': 'Organization'},
+        'description': f"Repositório {repo}", 'private': False,
+        'stargazers_count': 50000 + i, 'forks_count': 10000 + i,
+        'created_at': _data(i), 'updated_at': _data(i + 1),
+    }
+
+
+def _item_rest(tipo, i):
+    if tipo in ('issues', 'pulls'):
+        return {'number': i + 1, 'title': f"Título {i + 1}", 'state': 'open',
+                'created_at': _data(i), 'user': {'login': f"usuario{i}"}}
+    if tipo == 'contributors':
+        return {'login': f"usuario{i}", 'contributions': 1000 - i}
+    return {'sha': f"{i:040x}",
+            'commit': {'message': f"Commit {i}",
+                       'author': {'name': f"Autor {i}", 'email': f"autor{i}@exemplo.com",
+                                  'date': _data(i)}}}
+
+
+def _nos(gerar, n):
+    return {'nodes': [gerar(i) for i in range(n)]}
+
+
+def _graphql(consulta):
+    repositorio = {'name': 'repo', 'description': 'Repositório', 'stargazerCount': 50000}
+    if consulta == 'Consulta 2 - Média':
+        repositorio['issues'] = _nos(lambda i: {'title': f"Título {i}", 'state': 'OPEN',
+                                                'createdAt': _data(i),
+                                                'author': {'login': f"usuario{i}"}}, 10)
+    elif consulta == 'Consulta 3 - Complexa':
+        repositorio['issues'] = _nos(lambda i: {'title': f"Título {i}", 'state': 'OPEN'}, 5)
+        repositorio['pullRequests'] = _nos(lambda i: {'title': f"PR {i}", 'state': 'MERGED'}, 5)
+        repositorio['mentionableUsers'] = _nos(lambda i: {'login': f"usuario{i}", 'name': f"Usuário {i}"}, 5)
+    elif consulta == 'Consulta 4 - Lista':
+        return {'data': {'organization': {'repositories': _nos(
+            lambda i: {'name': f"repo{i}", 'description': 'Repositório', 'stargazerCount': 1000 - i}, 10)}}}
+    elif consulta == 'Consulta 5 - Aninhada':
+        repositorio['defaultBranchRef'] = {'target': {'history': _nos(
+            lambda i: {'message': f"Commit {i}",
+                       'author': {'name': f"Autor {i}", 'email': f"autor{i}@exemplo.com",
+                                  'date': _data(i)}}, 5)}}
+    else:
+        repositorio.update({'forkCount': 10000, 'createdAt': _data(0), 'updatedAt': _data(1)})
+    return {'data': {'repository': repositorio}}
+
+
+def _custo_graphql(query, variaveis):
+    """
+    Custo da query em pontos pela regra do GitHub: requisições necessárias
+    para cada conexão (first: N abre uma requisição para cada item das
+    conexões acima dela), somadas, divididas por 100 e arredondadas, mínimo 1
+    """
+    requisicoes = 0
+    multiplicadores = [1]
+    pendente = None
+    for m in re.finditer(r'first:\s*(\$?\w+)|[{}]', query):
+        if m.group(1):
+            valor = m.group(1)
+            pendente = int(variaveis.get(valor[1:], 0) if valor.startswith('$') else valor)
+        elif m.group(0) == '{':
+            if pendente is not None:
+                requisicoes += multiplicadores[-1]
+                multiplicadores.append(multiplicadores[-1] * pendente)
+                pendente = None
+            else:
+                multiplicadores.append(multiplicadores[-1])
+        elif len(multiplicadores) > 1:
+            multiplicadores.pop()
+    return max(1, round(requisicoes / 100))
+
+
+def _com_custo(corpo, custo):
+    """Corpo GraphQL com data.rateLimit.cost"""
+    dados = json.loads(corpo)
+    if isinstance(dados.get('data'), dict):
+        dados['data']['rateLimit'] = {'cost': custo}
+    return json.dumps(dados, separators=(',', ':')).encode('utf-8')
+
+
+def _preencher(corpo, tamanho_alvo):
+    """Completa o corpo até o tamanho alvo (serializado) com um campo de preenchimento"""
+    falta = tamanho_alvo - len(json.dumps(corpo, separators=(',', ':')))
+    if isinstance(corpo, list):
+        for item in corpo:
+            item['_preenchimento'] = 'x' * max(0, falta // len(corpo) - 20)
+    elif 'data' in corpo:
+        # Campo permitido no nível superior de respostas GraphQL
+        corpo['extensions'] = {'preenchimento': 'x' * max(0, falta - 36)}
+    else:
+        corpo['_preenchimento'] = 'x' * max(0, falta - 20)
+    return corpo
+
+
+class ServidorLocal(ThreadingHTTPServer):
+    """Servidor HTTP com o estado compartilhado pelas requisições"""
+
+    daemon_threads = True
+
+    def __init__(self, endereco, modelos, semente=42, relogio_virtual=False, gravacoes=None):
+        super().__init__(endereco, ManipuladorGitHub)
+        self.modelos = modelos
+        self.semente = semente
+        self.relogio_virtual = relogio_virtual
+        self.gravacoes = gravacoes
+        self._lock = threading.Lock()
+        self._sorteios = {}
+        self._corpos = {}
+        self._limites = {}
+
+    def handle_error(self, request, client_address):
+        # Clientes encerrados no meio de uma requisição (ex.: experimento interrompido)
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+    def sortear_latencia_ms(self, rota, mu, sigma):
+        """Próxima latência da rota (cada rota tem sua própria sequência)"""
+        with self._lock:
+            gerador = self._sorteios.get(rota)
+            if gerador is None:
+                gerador = self._sorteios[rota] = random.Random(f"{self.semente}:{rota}")
+            return gerador.lognormvariate(mu, sigma)
+
+    def consumir_limite(self, recurso, pontos):
+        """Desconta os pontos do recurso e devolve os cabeçalhos X-RateLimit-*"""
+        with self._lock:
+            reset, usado = self._limites.get(recurso, (0, 0))
+            if time() >= reset:
+                reset, usado = int(time()) + JANELA_LIMITE_S, 0
+            usado += pontos
+            self._limites[recurso] = (reset, usado)
+        return {
+            'X-RateLimit-Limit': str(LIMITE_PONTOS),
+            'X-RateLimit-Remaining': str(max(0, LIMITE_PONTOS - usado)),
+            'X-RateLimit-Reset': str(reset),
+            'X-RateLimit-Used': str(usado),
+            'X-RateLimit-Resource': recurso,
+        }
+
+    def corpo(self, rota, gerar):
+        """Corpo da rota em bytes (gravado ou sintético), montado uma única vez"""
+        with self._lock:
+            corpo = self._corpos.get(rota)
+        if corpo is None:
+            arquivo = os.path.join(self.gravacoes, f"{rota}.json") if self.gravacoes else None
+            if arquivo and os.path.exists(arquivo):
+                with open(arquivo, 'rb') as f:
+                    corpo = f.read()
+            else:
+                corpo = json.dumps(gerar(), separators=(',', ':')).encode('utf-8')
+            with self._lock:
+                self._corpos[rota] = corpo
+        return corpo
+
+
+class ManipuladorGitHub(BaseHTTPRequestHandler):
+    """Rotas REST e GraphQL usadas pelas consultas do experimento"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parametros = parse_qs(url.query)
+        per_page = int(parametros.get('per_page', ['30'])[0])
+
+        rota = _ROTA_REPOSITORIO.match(url.path)
+        if rota:
+            owner, repo, tipo = rota.groups()
+            if tipo is not None and 'page' in parametros:
+                pagina = int(parametros['page'][0])
+                inicio = (pagina - 1) * per_page
+                gerar = lambda: [_item_rest(tipo, inicio + i) for i in range(per_page)]
+                return self._responder_pagina('REST', f"pagina_rest_{tipo}_{owner}_{repo}_{per_page}_{pagina}",
+                                              gerar, per_page)
+            consulta = CONSULTAS_POR_REPOSITORIO.get(f"{owner}/{repo}", 'Consulta 1 - Simples')
+            if tipo is None:
+                gerar = lambda: _repositorio(owner, repo)
+            else:
+                gerar = lambda: [_item_rest(tipo, i) for i in range(per_page)]
+            return self._responder(consulta, 'REST', f"rest_{tipo or 'repo'}_{owner}_{repo}", gerar)
+
+        rota = _ROTA_ORGANIZACAO.match(url.path)
+        if rota:
+            org = rota.group(1)
+            consulta = CONSULTAS_POR_ORGANIZACAO.get(org, 'Consulta 4 - Lista')
+            gerar = lambda: [_repositorio(org, f"repo{i}", i) for i in range(per_page)]
+            return self._responder(consulta, 'REST', f"rest_org_repos_{org}", gerar)
+
+        self._enviar(404, b'{"message":"Not Found"}')
+
+    def do_POST(self):
+        tamanho = int(self.headers.get('Content-Length', 0))
+        pedido = self.rfile.read(tamanho)
+        if urlsplit(self.path).path.rstrip('/') != '/graphql':
+            return self._enviar(404, b'{"message":"Not Found"}')
+
+        payload = json.loads(pedido or b'{}')
+        query = payload.get('query', '')
+        self.custo_graphql = _custo_graphql(query, payload.get('variables') or {})
+        self.informar_custo = 'rateLimit' in query
+        if 'pageInfo' in query:
+            return self._responder_pagina_graphql(payload.get('variables') or {})
+        if _ALIAS_LOTE.search(query):
+            return self._responder_lote(query)
+        consulta = next((c for trecho, c in ASSINATURAS_GRAPHQL if trecho in query), None)
+        if consulta is None:
+            return self._enviar(200, b'{"errors":[{"message":"Query desconhecida"}]}')
+        numero = consulta.split()[1]
+        self._responder(consulta, 'GraphQL', f"graphql_consulta_{numero}", lambda: _graphql(consulta))
+
+    def _responder(self, consulta, tipo_api, rota, gerar):
+        modelo = self.server.modelos.get((consulta, tipo_api), MODELO_PADRAO)
+        # REST: a consulta é dividida entre os seus endpoints
+        partes = ENDPOINTS_REST.get(consulta, 1) if tipo_api == 'REST' else 1
+
+        corpo = self.server.corpo(rota, lambda: _preencher(gerar(), modelo['tamanho'] // partes))
+        latencia_ms = self.server.sortear_latencia_ms(rota, modelo['mu'] - math.log(partes), modelo['sigma'])
+        self._enviar_apos(latencia_ms, corpo)
+
+    def _responder_pagina(self, tipo_api, rota, gerar, itens):
+        """Página da varredura: tamanho e latência crescem com o número de itens"""
+        modelo = self.server.modelos.get((CONSULTA_PAGINACAO, tipo_api), MODELO_PADRAO)
+        partes = ENDPOINTS_REST[CONSULTA_PAGINACAO] if tipo_api == 'REST' else 1
+        tamanho_item = modelo['tamanho'] // partes // ITENS_CONSULTA_PAGINACAO
+
+        corpo = self.server.corpo(rota, lambda: _preencher(gerar(), tamanho_item * itens))
+        latencia_ms = self.server.sortear_latencia_ms(rota, modelo['mu'] - math.log(partes), modelo['sigma'])
+        self._enviar_apos(latencia_ms + itens * CUSTO_ITEM_MS[tipo_api], corpo)
+
+    def _responder_pagina_graphql(self, variaveis):
+        """Página de issues com cursor (o cursor é o deslocamento do primeiro item)"""
+        owner, repo = variaveis.get('owner'), variaveis.get('repo')
+        n = int(variaveis.get('n', 10))
+        inicio = int(variaveis.get('cursor') or 0)
+        gerar = lambda: {'data': {'repository': {'issues': {
+            'nodes': [{'number': inicio + i + 1, 'title': f"Título {inicio + i + 1}", 'state': 'OPEN',
+                       'createdAt': _data(inicio + i), 'author': {'login': f"usuario{inicio + i}"}}
+                      for i in range(n)],
+            'pageInfo': {'hasNextPage': True, 'endCursor': str(inicio + n)},
+        }}}}
+        self._responder_pagina('GraphQL', f"pagina_graphql_{owner}_{repo}_{n}_{inicio}", gerar, n)
+
+    def _responder_lote(self, query):
+        """Documento com várias consultas, cada uma sob um alias (c1: repository(...) ...)"""
+        aliases = [(m.start(), m.group(1)) for m in _ALIAS_LOTE.finditer(query)]
+        fins = [inicio for inicio, _ in aliases[1:]] + [len(query)]
+        dados, preenchimento, latencias = {}, 0, []
+        for (inicio, alias), fim in zip(aliases, fins):
+            consulta = next((c for trecho, c in ASSINATURAS_GRAPHQL if trecho in query[inicio:fim]), None)
+            if consulta is None:
+                return self._enviar(200, b'{"errors":[{"message":"Query desconhecida"}]}')
+            modelo = self.server.modelos.get((consulta, 'GraphQL'), MODELO_PADRAO)
+            rota = f"graphql_consulta_{consulta.split()[1]}"
+            parte = json.loads(self.server.corpo(
+                rota, lambda: _preencher(_graphql(consulta), modelo['tamanho'])))
+            dados[alias] = next(iter(parte['data'].values()))
+            preenchimento += len(parte.get('extensions', {}).get('preenchimento', ''))
+            latencias.append(self.server.sortear_latencia_ms(f"{rota}_lote", modelo['mu'], modelo['sigma']))
+
+        corpo = {'data': dados}
+        if preenchimento:
+            corpo['extensions'] = {'preenchimento': 'x' * preenchimento}
+        latencia_ms = max(max(latencias), sum(latencias) - (len(latencias) - 1) * SOBRECARGA_REQUISICAO_MS)
+        self._enviar_apos(latencia_ms, json.dumps(corpo, separators=(',', ':')).encode('utf-8'))
+
+    def _enviar_apos(self, latencia_ms, corpo):
+        """
+        Responde 200 depois da latência (ou a informa, com o relógio virtual),
+        descontando a requisição do limite
+        """
+        if self.command == 'POST':
+            cabecalhos = self.server.consumir_limite('graphql', self.custo_graphql)
+            if self.informar_custo:
+                corpo = _com_custo(corpo, self.custo_graphql)
+        else:
+            cabecalhos = self.server.consumir_limite('core', 1)
+        if self.server.relogio_virtual:
+            cabecalhos[CABECALHO_LATENCIA_VIRTUAL] = f"{latencia_ms:.3f}"
+        else:
+            sleep(latencia_ms / 1000)
+        self._enviar(200, corpo, cabecalhos)
+
+    def _enviar(self, status, corpo, cabecalhos=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        aceitas = {parte.split(';')[0].strip().lower()
+                   for parte in self.headers.get('Accept-Encoding', '').split(',')}
+        if brotli is not None and 'br' in aceitas:
+            corpo = brotli.compress(corpo, quality=4)
+            self.send_header('Content-Encoding', 'br')
+        elif 'gzip' in aceitas:
+            corpo = gzip.compress(corpo, compresslevel=6)
+            self.send_header('Content-Encoding', 'gzip')
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def iniciar_servidor(host='127.0.0.1', porta=0, arquivo_resultados=ARQUIVO_RESULTADOS,
+                     semente=42, relogio_virtual=False, gravacoes=None):
+    """
+    Inicia o servidor em uma thread (porta=0 escolhe uma porta livre)
+
+    Returns:
+        ServidorLocal; a URL base é f"http://{host}:{servidor.server_port}"
+    """
+    modelos = ajustar_modelos(arquivo_resultados) if os.path.exists(arquivo_resultados) else {}
+    servidor = ServidorLocal((host, porta), modelos, semente, relogio_virtual, gravacoes)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def main():
+    """Executa o servidor local até Ctrl+C"""
+    parser = argparse.ArgumentParser(description='Lab 05 - servidor local da API do GitHub')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8000)
+    parser.add_argument('--resultados', default=ARQUIVO_RESULTADOS,
+                        help='CSV de um experimento real para ajustar latências e tamanhos')
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--relogio-virtual', action='store_true',
+                        help='Informa a latência em X-Latencia-Virtual-Ms em vez de esperar')
+    parser.add_argument('--gravacoes', help='Diretório com corpos gravados (<rota>.json)')
+    args = parser.parse_args()
+
+    modelos = ajustar_modelos(args.resultados) if os.path.exists(args.resultados) else {}
+    servidor = ServidorLocal((args.host, args.porta), modelos, args.semente,
+                             args.relogio_virtual, args.gravacoes)
+
+    print(f"Servidor local em http://{args.host}:{servidor.server_port}")
+    print(f"Modelos ajustados: {len(modelos)} | Semente: {args.semente} | "
+          f"Relógio virtual: {'Sim' if args.relogio_virtual else 'Não'}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServidor encerrado.")
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Testes - Cubo de Agregados (agregados.py) e Modo em Blocos do Dashboard
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from agregados import EsbocoKLL, momentos, mesclar_momentos
+from cenarios import carregar_cenarios
+from preparar_dashboard import (adicionar_metricas_derivadas, processar_em_blocos, montar_cubo, resumir,
+                                calcular_metricas_comparativas)
+
+# Erro de posto aceito para K_ESBOCO (o observado fica abaixo de 0,005)
+ERRO_POSTO = 0.02
+
+
+def resultados(linhas, semente=0):
+    """Medições sintéticas das consultas do catálogo, na ordem de execução"""
+    sorteio = np.random.default_rng(semente)
+    nomes = [c.nome for c in carregar_cenarios()]
+    df = pd.DataFrame({
+        'consulta': sorteio.choice(nomes, linhas),
+        'tipo_api': sorteio.choice(['REST', 'GraphQL'], linhas),
+        'tempo_ms': sorteio.lognormal(5, 0.5, linhas),
+        'tamanho_bytes': sorteio.integers(500, 5000, linhas),
+        'ruido': np.where(sorteio.random(linhas) < 0.1, 'gc', ''),
+    })
+    df['timestamp'] = pd.Timestamp('2025-01-01 05:00') + pd.to_timedelta(np.arange(linhas) * 7, unit='s')
+    return df
+
+
+def test_mesclar_momentos_igual_a_uma_passada():
+    df = resultados(3000)
+    codigo, rotulos = pd.factorize(df['consulta'])
+    unica = momentos(df, codigo, pd.Index(rotulos), ['tempo_ms', 'tamanho_bytes'])
+
+    mesclado = None
+    for inicio in range(0, len(df), 450):
+        bloco = df.iloc[inicio:inicio + 450]
+        codigo, rotulos = pd.factorize(bloco['consulta'])
+        parcial = momentos(bloco, codigo, pd.Index(rotulos), ['tempo_ms', 'tamanho_bytes'])
+        mesclado = parcial if mesclado is None else mesclar_momentos(mesclado, parcial)
+
+    mesclado = mesclado.reindex(unica.index)
+    pd.testing.assert_frame_equal(mesclado, unica, rtol=1e-10, check_dtype=False)
+    direto = df.groupby('consulta')['tempo_ms'].agg(['count', 'mean', 'min', 'max'])
+    assert np.allclose(unica[('tempo_ms', 'media')].loc[direto.index], direto['mean'], rtol=1e-12)
+    assert np.allclose(unica[('tempo_ms', 'm2')].loc[direto.index],
+                       df.groupby('consulta')['tempo_ms'].var(ddof=0).loc[direto.index] * direto['count'])
+
+
+def test_esboco_sem_k_e_exato():
+    valores = np.random.default_rng(1).lognormal(5, 1, 5000)
+    esboco = EsbocoKLL(k=None)
+    for bloco in np.array_split(valores, 9):
+        esboco.adicionar(bloco)
+    ps = np.array([0.25, 0.5, 0.75, 0.95])
+    assert esboco.exato
+    assert np.array_equal(esboco.quantis(ps), np.percentile(valores, ps * 100))
+
+
+def test_esboco_com_k_tem_erro_de_posto_limitado():
+    valores = np.random.default_rng(2).lognormal(5, 1, 50000)
+    unico = EsbocoKLL(k=256)
+    for bloco in np.array_split(valores, 37):
+        unico.adicionar(bloco)
+    a, b = EsbocoKLL(k=256, semente=1), EsbocoKLL(k=256, semente=2)
+    a.adicionar(valores[:20000])
+    b.adicionar(valores[20000:])
+    mesclado = a.mesclar(b)
+
+    ordenados, ps = np.sort(valores), np.arange(1, 100) / 100
+    for esboco in (unico, mesclado):
+        assert not esboco.exato and esboco.n == len(valores)
+        assert sum(map(len, esboco.niveis)) < 4 * 256
+        postos = np.searchsorted(ordenados, esboco.quantis(ps), side='right') / len(valores)
+        assert np.abs(postos - ps).max() <= ERRO_POSTO
+    # Mesclar não altera os esboços de origem
+    assert a.n == 20000 and b.n == 30000
+
+
+def test_esboco_exato_abaixo_de_k_e_ignora_nan():
+    valores = np.random.default_rng(3).normal(100, 10, 200)
+    esboco = EsbocoKLL(k=256)
+    esboco.adicionar(np.append(valores, np.nan))
+    assert esboco.exato and esboco.n == 200
+    assert esboco.quantis([0.5])[0] == pytest.approx(np.median(valores))
+    assert np.isnan(EsbocoKLL().quantis([0.5])).all()
+
+
+@pytest.mark.parametrize('linhas_bloco', [97, 1000])
+def test_modo_em_blocos_igual_ao_em_memoria(tmp_path, linhas_bloco):
+    # ~100 medições por grupo: abaixo de K_ESBOCO, os quantis também coincidem
+    df = resultados(1000, semente=4)
+    arquivo = tmp_path / 'resultados_experimento.csv'
+    df.to_csv(arquivo, index=False)
+    cenarios = carregar_cenarios()
+
+    memoria = adicionar_metricas_derivadas(pd.read_csv(arquivo, parse_dates=['timestamp']), cenarios)
+    resumo_memoria, diferencas_memoria = resumir(montar_cubo(memoria)[0])
+    info = processar_em_blocos(str(arquivo), linhas_bloco, cenarios, saida=str(tmp_path / 'enriquecidos.csv'))
+    resumo_blocos, diferencas_blocos = resumir(info['cubo'])
+
+    assert info['registros'] == len(df) and info['ruidosas'] == int((df['ruido'] != '').sum())
+    # Iguais a menos de arredondamento (os momentos são somados em outra ordem)
+    iguais = dict(rtol=1e-9, check_dtype=False)
+    pd.testing.assert_frame_equal(resumo_blocos, resumo_memoria, **iguais)
+    pd.testing.assert_frame_equal(diferencas_blocos, diferencas_memoria, **iguais)
+    pd.testing.assert_frame_equal(calcular_metricas_comparativas(resumo_blocos, diferencas_blocos),
+                                  calcular_metricas_comparativas(resumo_memoria, diferencas_memoria), **iguais)
+
+    enriquecidos = pd.read_csv(tmp_path / 'enriquecidos.csv')
+    assert len(enriquecidos) == len(df)
+    assert enriquecidos['ordem_execucao'].tolist() == list(range(1, len(df) + 1))
+
+
+@pytest.fixture(scope='module')
+def cubo_e_dados():
+    df = resultados(2000, semente=5)
+    df['decodificador'] = np.where(np.arange(len(df)) % 2, 'orjson', 'json')
+    # Medições espalhadas pelo dia, para várias horas e períodos
+    df['timestamp'] = pd.Timestamp('2025-01-01') + pd.to_timedelta(np.arange(len(df)) * 43, unit='s')
+    df = adicionar_metricas_derivadas(df, carregar_cenarios())
+    return montar_cubo(df)[0], df
+
+
+@pytest.mark.parametrize('por', [['consulta'], ['consulta', 'hora'], ['periodo_dia'], ['decodificador'], []])
+def test_fatia_igual_ao_groupby(cubo_e_dados, por):
+    cubo, df = cubo_e_dados
+    fatia = cubo.fatia(por)
+    grupos = df.groupby(por + ['tipo_api'], sort=False)['tempo_ms']
+    direto = grupos.agg(['count', 'mean', 'min', 'max', 'median'])
+    direto['m2'] = grupos.var(ddof=0) * direto['count']
+    direto['p95'] = grupos.quantile(0.95)
+
+    # Grupos na ordem em que aparecem no dataset
+    assert list(fatia.index) == list(direto.index)
+    assert list(fatia.index.names) == por + ['tipo_api']
+    assert np.array_equal(fatia[('tempo_ms', 'n')], direto['count'])
+    for estatistica, coluna in [('media', 'mean'), ('min', 'min'), ('max', 'max'), ('m2', 'm2'),
+                                ('p50', 'median'), ('p95', 'p95')]:
+        assert np.allclose(fatia[('tempo_ms', estatistica)], direto[coluna], rtol=1e-9), estatistica
+    primeiras = df.groupby(por + ['tipo_api'], sort=False)['complexidade'].first()
+    assert fatia[('meta', 'complexidade')].tolist() == primeiras.tolist()
+
+
+def test_resumo_e_a_fatia_das_chaves(cubo_e_dados):
+    cubo, _ = cubo_e_dados
+    assert cubo.dimensoes == ['periodo_dia', 'hora', 'decodificador']
+    pd.testing.assert_frame_equal(cubo.resumo(), cubo.fatia(['consulta']))
+
+
+def test_cubos_por_consulta_mesclados_igual_ao_cubo_unico(cubo_e_dados):
+    cubo, df = cubo_e_dados
+    partes = [montar_cubo(df[df['consulta'] == consulta])[0] for consulta in df['consulta'].unique()]
+    mesclado = partes[0]
+    for parte in partes[1:]:
+        mesclado.mesclar(parte)
+    mesclado.reordenar(cubo.momentos.index)
+    iguais = dict(rtol=1e-9, check_dtype=False)
+    pd.testing.assert_frame_equal(mesclado.fatia(['consulta', 'hora']), cubo.fatia(['consulta', 'hora']), **iguais)
+    pd.testing.assert_frame_equal(mesclado.pares, cubo.pares.reindex(mesclado.pares.index), **iguais)
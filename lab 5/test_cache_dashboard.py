@@ -0,0 +1,141 @@
+"""
+Testes - Cache Incremental do Dashboard (cache_dashboard.py)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cache_dashboard import ARQUIVO_CACHE, CacheDashboard, hashes_grupos
+from cenarios import carregar_cenarios
+from preparar_dashboard import (adicionar_metricas_derivadas, montar_cubo, resumir,
+                                calcular_metricas_comparativas, calcular_testes_nao_parametricos)
+
+REAMOSTRAGENS = 200
+
+
+def resultados(semente=0, linhas=600):
+    sorteio = np.random.default_rng(semente)
+    nomes = [c.nome for c in carregar_cenarios()]
+    df = pd.DataFrame({
+        'consulta': np.repeat(nomes, linhas // len(nomes)),
+        'tipo_api': np.tile(['REST', 'GraphQL'], linhas // 2),
+        'tempo_ms': sorteio.lognormal(5, 0.5, linhas),
+        'tamanho_bytes': sorteio.integers(500, 5000, linhas),
+    })
+    df['timestamp'] = pd.Timestamp('2025-01-01 09:00') + pd.to_timedelta(np.arange(linhas) * 5, unit='s')
+    return df
+
+
+def preparar(df, arquivo, assinatura='v1'):
+    """Uma execução do dashboard com o cache: (cache, cubo, recalculadas, testes)"""
+    cache = CacheDashboard(str(arquivo), assinatura)
+    hashes = hashes_grupos(df)
+    enriquecido = adicionar_metricas_derivadas(df.copy(), carregar_cenarios())
+    cubo, recalculadas = montar_cubo(enriquecido, cache, hashes)
+    testes = calcular_testes_nao_parametricos(enriquecido, REAMOSTRAGENS, processos=1, cache=cache, hashes=hashes)
+    cache.salvar()
+    return cache, cubo, recalculadas, testes
+
+
+def sem_cache(df):
+    enriquecido = adicionar_metricas_derivadas(df.copy(), carregar_cenarios())
+    cubo = montar_cubo(enriquecido)[0]
+    return cubo, calcular_testes_nao_parametricos(enriquecido, REAMOSTRAGENS, processos=1)
+
+
+def saidas(cubo):
+    resumo, diferencas = resumir(cubo)
+    return calcular_metricas_comparativas(resumo, diferencas), cubo.fatia(['consulta', 'hora'])
+
+
+def assert_mesmas_saidas(cubo, testes, esperado_cubo, esperado_testes):
+    for obtida, esperada in zip(saidas(cubo), saidas(esperado_cubo)):
+        pd.testing.assert_frame_equal(obtida, esperada, rtol=1e-9, check_dtype=False)
+    pd.testing.assert_frame_equal(testes, esperado_testes, check_dtype=False)
+
+
+def test_arquivo_padrao_em_resultados():
+    assert os.path.dirname(ARQUIVO_CACHE) == 'resultados'
+
+
+def test_hashes_mudam_apenas_no_grupo_alterado():
+    df = resultados()
+    antes = hashes_grupos(df)
+    alterado = df.copy()
+    alterado.loc[0, 'tempo_ms'] += 1
+    depois = hashes_grupos(alterado)
+    rotulo = (df.loc[0, 'consulta'], df.loc[0, 'tipo_api'])
+    assert depois.keys() == antes.keys()
+    assert [r for r in antes if antes[r] != depois[r]] == [rotulo]
+
+
+def test_reaproveita_sem_mudancas(tmp_path):
+    df = resultados()
+    arquivo = tmp_path / 'cache' / 'cache_dashboard.npz'
+    _, _, recalculadas, _ = preparar(df, arquivo)
+    assert len(recalculadas) == df['consulta'].nunique()
+    assert arquivo.exists()
+
+    cache, cubo, recalculadas, testes = preparar(df, arquivo)
+    assert recalculadas == []
+    assert cache.reaproveitados == {'cubos': df['consulta'].nunique(), 'testes': len(testes)}
+    assert_mesmas_saidas(cubo, testes, *sem_cache(df))
+
+
+def test_recalcula_apenas_a_consulta_alterada(tmp_path):
+    df = resultados()
+    arquivo = tmp_path / 'cache_dashboard.npz'
+    preparar(df, arquivo)
+
+    alterado = df.copy()
+    consulta = alterado['consulta'].iloc[-1]
+    alterado.loc[alterado.index[-1], 'tempo_ms'] *= 3
+    cache, cubo, recalculadas, testes = preparar(alterado, arquivo)
+    assert recalculadas == [consulta]
+    assert cache.reaproveitados['cubos'] == df['consulta'].nunique() - 1
+    # Recalculadas: as comparações da consulta e as de 'Todas'
+    assert cache.reaproveitados['testes'] == len(testes) - 2
+    assert_mesmas_saidas(cubo, testes, *sem_cache(alterado))
+
+
+def test_assinatura_diferente_invalida_tudo(tmp_path):
+    df = resultados()
+    arquivo = tmp_path / 'cache_dashboard.npz'
+    preparar(df, arquivo, assinatura='v1')
+    cache, _, recalculadas, _ = preparar(df, arquivo, assinatura='v2')
+    assert len(recalculadas) == df['consulta'].nunique()
+    assert cache.reaproveitados == {'cubos': 0, 'testes': 0}
+
+
+def test_arquivo_lido_sem_pickle(tmp_path):
+    arquivo = tmp_path / 'cache_dashboard.npz'
+    preparar(resultados(), arquivo)
+    with np.load(arquivo, allow_pickle=False) as npz:
+        arrays = {nome: npz[nome] for nome in npz.files}
+    assert 'estrutura' in arrays
+    assert all(array.dtype != object for array in arrays.values())
+
+
+@pytest.mark.parametrize('conteudo', [b'', b'isto nao e um zip', b'PK\x03\x04corrompido'])
+def test_arquivo_corrompido_recalcula(tmp_path, conteudo):
+    df = resultados()
+    arquivo = tmp_path / 'cache_dashboard.npz'
+    arquivo.write_bytes(conteudo)
+    cache, cubo, recalculadas, testes = preparar(df, arquivo)
+    assert len(recalculadas) == df['consulta'].nunique()
+    assert cache.reaproveitados == {'cubos': 0, 'testes': 0}
+    assert_mesmas_saidas(cubo, testes, *sem_cache(df))
+    # A execução regrava um cache válido
+    assert CacheDashboard(str(arquivo), 'v1').cubos
+
+
+def test_somente_entradas_usadas_voltam_ao_arquivo(tmp_path):
+    df = resultados()
+    arquivo = tmp_path / 'cache_dashboard.npz'
+    preparar(df, arquivo)
+    consulta = df['consulta'].iloc[0]
+    preparar(df[df['consulta'] != consulta], arquivo)
+    assert consulta not in CacheDashboard(str(arquivo), 'v1').cubos
@@ -0,0 +1,101 @@
+"""
+Testes - Catálogo de Cenários (cenarios.py)
+"""
+
+import json
+
+import pytest
+
+from cenarios import Cenario, carregar_cenarios
+from experimento import ExperimentoAPI, CombinedResponse
+
+
+def definicao(nome='Dependente', rest=None):
+    return {
+        'nome': nome, 'complexidade': 'Média', 'itens': 2,
+        'variaveis': {'owner': 'facebook', 'repo': 'react', 'limite': 10},
+        'rest': rest if rest is not None else [
+            {'chave': 'repository', 'caminho': '/repos/{owner}/{repo}'},
+            {'chave': 'issues', 'caminho': '/repos/{repository[full_name]}/issues?per_page={limite}',
+             'depende_de': ['repository']},
+            {'chave': 'pulls', 'caminho': '/repos/{owner}/{repo}/pulls'},
+        ],
+        'graphql': ['query($owner: String!, $repo: String!) {',
+                    '  repository(owner: $owner, name: $repo) {', '    name', '  }', '}'],
+    }
+
+
+def test_catalogo_do_experimento():
+    cenarios = carregar_cenarios()
+    assert len(cenarios) == 5
+    assert len({c.nome for c in cenarios}) == 5
+    for cenario in cenarios:
+        assert cenario.num_endpoints >= 1
+        assert set(cenario.variaveis_graphql(cenario.variaveis)) <= set(cenario.variaveis)
+        assert cenario.query.count('{') == cenario.query.count('}')
+
+
+def test_niveis_e_paralelizavel():
+    cenario = Cenario(definicao())
+    assert [[e['chave'] for e in nivel] for nivel in cenario.niveis()] == [['repository', 'pulls'], ['issues']]
+    assert cenario.paralelizavel
+
+    cadeia = Cenario(definicao(rest=[
+        {'chave': 'a', 'caminho': '/a'},
+        {'chave': 'b', 'caminho': '/b/{a[id]}', 'depende_de': ['a']},
+    ]))
+    assert not cadeia.paralelizavel
+    assert cadeia.endpoints[0]['depende_de'] == []
+
+
+def test_caminho_com_resposta_anterior():
+    cenario = Cenario(definicao())
+    caminho = cenario.caminho(cenario.endpoints[1], cenario.variaveis, {'repository': {'full_name': 'o/r'}})
+    assert caminho == '/repos/o/r/issues?per_page=10'
+
+
+def test_variaveis_graphql_apenas_as_declaradas():
+    cenario = Cenario(definicao())
+    assert cenario.variaveis_graphql(cenario.variaveis) == {'owner': 'facebook', 'repo': 'react'}
+
+
+@pytest.mark.parametrize('rest, mensagem', [
+    ([{'chave': 'b', 'caminho': '/b', 'depende_de': ['a']}, {'chave': 'a', 'caminho': '/a'}],
+     'não foi declarado antes'),
+    ([{'chave': 'a', 'caminho': '/a'}, {'chave': 'a', 'caminho': '/a2'}], 'repetida'),
+])
+def test_endpoints_invalidos(rest, mensagem):
+    with pytest.raises(ValueError, match=mensagem):
+        Cenario(definicao(rest=rest))
+
+
+def test_nomes_repetidos_no_arquivo(tmp_path):
+    arquivo = tmp_path / 'cenarios.json'
+    arquivo.write_text(json.dumps({'consultas': [definicao('X'), definicao('X')]}), encoding='utf-8')
+    with pytest.raises(ValueError, match='nome repetido'):
+        carregar_cenarios(arquivo)
+
+
+@pytest.mark.parametrize('braco', ['executar_rest', 'executar_rest_paralelo'])
+def test_bracos_rest_com_dependencia_no_servidor(servidor, braco):
+    cenario = Cenario(definicao())
+    api = ExperimentoAPI(servidor, f"{servidor}/graphql", delay=0, cenarios=[cenario])
+    try:
+        resposta = getattr(api, braco)(cenario)
+    finally:
+        api.fechar()
+    assert isinstance(resposta, CombinedResponse)
+    assert set(resposta.respostas) == {'repository', 'issues', 'pulls'}
+    assert all(r.status_code == 200 for r in resposta.respostas.values())
+    assert resposta.respostas['issues'].url.endswith('/repos/facebook/react/issues?per_page=10')
+
+
+def test_braco_graphql_no_servidor(servidor):
+    cenario = Cenario(definicao())
+    api = ExperimentoAPI(servidor, f"{servidor}/graphql", delay=0, cenarios=[cenario])
+    try:
+        dados = api.executar_graphql(cenario).json()
+    finally:
+        api.fechar()
+    assert 'repository' in dados['data']
+    assert dados['data']['rateLimit']['cost'] >= 1
@@ -0,0 +1,164 @@
+"""
+Testes - Estatísticas Incrementais e Critério de Parada (estatistica_online.py)
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+import experimento
+from estatistica_online import (EstatisticaOnline, QuantilP2, AcumuladorBraco, estatistica_welch,
+                                fronteira_sequencial)
+from experimento import ExperimentoAPI
+
+
+# Erro de posto aceito para os quantis P² (o observado fica abaixo de 0,01)
+ERRO_POSTO_P2 = 0.02
+
+
+def estatistica(valores):
+    resultado = EstatisticaOnline()
+    for valor in valores:
+        resultado.adicionar(float(valor))
+    return resultado
+
+
+def test_welford_e_mescla_iguais_ao_numpy():
+    valores = np.random.default_rng(10).lognormal(5, 0.6, 1000)
+    unica = estatistica(valores)
+    mesclada = estatistica(valores[:300]).mesclar(estatistica(valores[300:700])).mesclar(
+        estatistica(valores[700:]))
+    for resultado in (unica, mesclada):
+        assert resultado.n == len(valores)
+        assert resultado.media == pytest.approx(valores.mean(), rel=1e-12)
+        assert resultado.variancia == pytest.approx(valores.var(ddof=1), rel=1e-10)
+    assert EstatisticaOnline().mesclar(EstatisticaOnline()).n == 0
+    assert EstatisticaOnline().mesclar(unica).media == pytest.approx(unica.media)
+
+
+def test_ic_da_media():
+    valores = np.random.default_rng(11).normal(100, 10, 400)
+    resultado = estatistica(valores)
+    meia_largura = 1.959964 * valores.std(ddof=1) / np.sqrt(len(valores))
+    assert resultado.meia_largura_ic() == pytest.approx(meia_largura, rel=1e-5)
+    assert resultado.largura_relativa_ic() == pytest.approx(meia_largura / valores.mean(), rel=1e-5)
+    assert estatistica([5.0]).largura_relativa_ic() == np.inf
+
+
+@pytest.mark.parametrize('p', [0.5, 0.9])
+def test_p2_exato_com_poucas_amostras(p):
+    valores = np.random.default_rng(12).lognormal(5, 0.6, QuantilP2.AMOSTRAS_EXATAS - 1)
+    quantil = QuantilP2(p)
+    assert np.isnan(quantil.valor())
+    for valor in valores:
+        quantil.adicionar(float(valor))
+    assert quantil.valor() == pytest.approx(np.percentile(valores, p * 100))
+
+
+@pytest.mark.parametrize('semente', [13, 14, 15])
+@pytest.mark.parametrize('p', [0.5, 0.9])
+def test_p2_com_erro_de_posto_limitado(p, semente):
+    valores = np.random.default_rng(semente).lognormal(5, 0.6, 3000)
+    quantil = QuantilP2(p)
+    for valor in valores:
+        quantil.adicionar(float(valor))
+    assert quantil.alturas is not None
+    assert abs((valores <= quantil.valor()).mean() - p) <= ERRO_POSTO_P2
+
+
+def test_acumulador_do_braco():
+    braco = AcumuladorBraco()
+    linhas = [{'tempo_ms': 10.0 * i, 'tamanho_bytes': 100 * i,
+               'bytes_corpo_comprimido': 40 * i, 'bytes_cabecalhos': 10} for i in range(1, 5)]
+    linhas.append({'tempo_ms': 50.0, 'tamanho_bytes': 500, 'bytes_corpo_comprimido': '',
+                   'bytes_cabecalhos': 10})
+    for linha in linhas:
+        braco.adicionar(linha)
+    braco.registrar_falha()
+    braco.registrar_quarentena()
+    braco.registrar_quarentena()
+
+    resumo = braco.resumo()
+    assert braco.medicoes == 7
+    assert (resumo['n'], resumo['falhas'], resumo['quarentena']) == (5, 1, 2)
+    assert resumo['tempo_media'] == pytest.approx(30.0)
+    assert resumo['tempo_p50'] == pytest.approx(30.0)
+    assert resumo['tempo_p90'] == pytest.approx(np.percentile([10, 20, 30, 40, 50], 90))
+    assert resumo['tamanho_media'] == pytest.approx(300.0)
+    # Linhas sem os bytes comprimidos ficam fora da média na rede
+    assert resumo['bytes_rede_media'] == pytest.approx(np.mean([50, 90, 130, 170]))
+
+
+@pytest.mark.parametrize('alfa, olhadas', [(0.05, 1), (0.05, 21), (0.01, 5), (0.05, 0)])
+def test_fronteira_e_bonferroni(alfa, olhadas):
+    esperado = NormalDist().inv_cdf(1 - alfa / (2 * max(1, olhadas)))
+    assert fronteira_sequencial(alfa, olhadas) == pytest.approx(esperado)
+
+
+def test_fronteira_cresce_com_as_olhadas():
+    assert fronteira_sequencial(0.05, 1) == pytest.approx(1.959964, abs=1e-6)
+    fronteiras = [fronteira_sequencial(0.05, k) for k in range(1, 30)]
+    assert fronteiras == sorted(fronteiras)
+
+
+def test_parada_sequencial_controla_falso_positivo():
+    # Sob H0 (braços iguais), olhar a cada rodada de MIN_REPETICOES até o
+    # máximo e parar no primeiro |z| ≥ fronteira rejeita no máximo alfa das vezes
+    sorteio = np.random.default_rng(0)
+    simulacoes, minimo, maximo = 4000, experimento.MIN_REPETICOES, experimento.REPETICOES
+    fronteira = fronteira_sequencial(experimento.ALFA, maximo - minimo + 1)
+    a = sorteio.lognormal(5, 0.5, size=(simulacoes, maximo))
+    b = sorteio.lognormal(5, 0.5, size=(simulacoes, maximo))
+
+    def taxa_de_rejeicao(fronteira):
+        rejeitou = np.zeros(simulacoes, dtype=bool)
+        for n in range(minimo, maximo + 1):
+            erro = np.sqrt(a[:, :n].var(axis=1, ddof=1) / n + b[:, :n].var(axis=1, ddof=1) / n)
+            z = (a[:, :n].mean(axis=1) - b[:, :n].mean(axis=1)) / erro
+            rejeitou |= np.abs(z) >= fronteira
+        return rejeitou.mean()
+
+    assert taxa_de_rejeicao(fronteira) <= experimento.ALFA
+    # Sem a correção (fronteira de um único teste) a taxa passa de alfa
+    assert taxa_de_rejeicao(fronteira_sequencial(experimento.ALFA, 1)) > experimento.ALFA
+
+    # A mesma estatística calculada incrementalmente
+    n = maximo
+    z = (a[0].mean() - b[0].mean()) / np.sqrt(a[0].var(ddof=1) / n + b[0].var(ddof=1) / n)
+    assert estatistica_welch(estatistica(a[0]), estatistica(b[0])) == pytest.approx(z)
+
+
+@pytest.fixture
+def api():
+    return ExperimentoAPI(cenarios=[])
+
+
+def bracos(rest, graphql):
+    return {('REST', 'fria', 'gzip'): estatistica(rest), ('GraphQL', 'fria', 'gzip'): estatistica(graphql)}
+
+
+def test_parada_por_largura_do_ic(api):
+    sorteio = np.random.default_rng(1)
+    motivo = api.verificar_parada(bracos(sorteio.normal(100, 1, 10), sorteio.normal(100, 1, 10)), 30)
+    assert motivo is not None and motivo.startswith('IC 95%')
+
+
+def test_parada_por_fronteira(api):
+    sorteio = np.random.default_rng(2)
+    estatisticas = bracos(sorteio.normal(1000, 300, 10), sorteio.normal(100, 30, 10))
+    assert estatisticas[('REST', 'fria', 'gzip')].largura_relativa_ic() > experimento.LARGURA_IC_RELATIVA
+    motivo = api.verificar_parada(estatisticas, 30)
+    assert motivo is not None and 'cruzaram' in motivo
+
+
+def test_continua_sem_diferenca(api):
+    sorteio = np.random.default_rng(3)
+    assert api.verificar_parada(bracos(sorteio.normal(100, 30, 10), sorteio.normal(100, 30, 10)), 30) is None
+
+
+def test_parada_exige_todas_as_comparacoes(api):
+    sorteio = np.random.default_rng(4)
+    estatisticas = bracos(sorteio.normal(1000, 300, 10), sorteio.normal(100, 30, 10))
+    estatisticas[('REST-paralelo', 'fria', 'gzip')] = estatistica(sorteio.normal(100, 30, 10))
+    assert api.verificar_parada(estatisticas, 30) is None
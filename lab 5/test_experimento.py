@@ -0,0 +1,64 @@
+"""
+Testes - Experimento contra o servidor local (experimento.py)
+"""
+
+import pytest
+
+import experimento
+from experimento import ExperimentoAPI, com_custo, custo_graphql
+from cenarios import carregar_cenarios
+
+
+def test_com_custo_acrescenta_rate_limit_na_raiz(monkeypatch):
+    query = "query {\n  repository(owner: \"a\", name: \"b\") {\n    name\n  }\n}\n"
+    resultado = com_custo(query)
+    assert resultado.endswith("  }\n  rateLimit {\n    cost\n  }\n}\n")
+    assert resultado.count('{') == resultado.count('}')
+    monkeypatch.setattr(experimento, 'CONSULTAR_CUSTO_GRAPHQL', False)
+    assert com_custo(query) == query
+
+
+def test_custo_graphql_soma_as_respostas():
+    assert custo_graphql([{'data': {'rateLimit': {'cost': 2}}}, {'data': {'rateLimit': {'cost': 3}}}]) == 5
+    assert custo_graphql([{'data': {'repository': {}}}, [1, 2], None]) == ''
+    assert custo_graphql([{'errors': [{'message': 'x'}]}]) == ''
+
+
+@pytest.fixture(scope='module')
+def resultados(servidor):
+    api = ExperimentoAPI(servidor, f"{servidor}/graphql", delay=0)
+    try:
+        for nome, funcoes in api.consultas():
+            api.executar_consulta(nome, funcoes['REST'], funcoes['GraphQL'], repeticoes=3)
+    finally:
+        api.fechar()
+    return api.resultados
+
+
+def test_todas_as_medicoes_concluidas(resultados):
+    assert len(resultados) == len(carregar_cenarios()) * 2 * 3
+
+
+def test_custo_e_limite_do_graphql(resultados):
+    graphql = [r for r in resultados if r['tipo_api'] == 'GraphQL']
+    assert all(isinstance(r['custo_graphql'], int) and r['custo_graphql'] >= 1 for r in graphql)
+    assert all(r['ratelimit_recurso'] == 'graphql' and r['requisicoes'] == 1 for r in graphql)
+    # Primeira medição: sem uso anterior para comparar ('') ou comparada ao
+    # uso visto por testes anteriores no mesmo processo
+    assert graphql[0]['ratelimit_consumido'] in ('', graphql[0]['custo_graphql'])
+    assert all(r['ratelimit_consumido'] == r['custo_graphql'] for r in graphql[1:])
+
+
+def test_limite_do_rest(resultados):
+    rest = [r for r in resultados if r['tipo_api'] == 'REST']
+    assert all(r['custo_graphql'] == '' and r['ratelimit_recurso'] == 'core' for r in rest)
+    assert rest[0]['ratelimit_consumido'] in ('', rest[0]['requisicoes'])
+    # Um ponto por requisição REST, somado entre os endpoints da consulta
+    assert all(r['ratelimit_consumido'] == r['requisicoes'] for r in rest[1:])
+    assert max(r['requisicoes'] for r in rest) > 1
+
+
+def test_restante_diminui_a_cada_medicao(resultados):
+    for recurso in ('core', 'graphql'):
+        restantes = [r['ratelimit_restante'] for r in resultados if r['ratelimit_recurso'] == recurso]
+        assert all(depois < antes for antes, depois in zip(restantes, restantes[1:]))
@@ -0,0 +1,116 @@
+"""
+Testes - Gravação Incremental dos Resultados (gravacao.py)
+"""
+
+import csv
+
+import pytest
+
+import gravacao
+from gravacao import GravadorCSV, ler_resultados
+from experimento import ExperimentoAPI, CAMPOS_RESULTADO
+
+CAMPOS = ['consulta', 'tempo_ms', 'tamanho_bytes']
+
+
+def linhas_do_arquivo(arquivo):
+    with open(arquivo, encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_retomada_descarta_linha_cortada(tmp_path):
+    arquivo = tmp_path / 'resultados.csv'
+    with GravadorCSV(arquivo, CAMPOS) as gravador:
+        gravador.gravar({'consulta': 'C1', 'tempo_ms': 10.5, 'tamanho_bytes': 100})
+        gravador.gravar({'consulta': 'C2', 'tempo_ms': 20.0, 'tamanho_bytes': 200})
+    with open(arquivo, 'a', encoding='utf-8') as f:
+        f.write('C3,30.')  # queda no meio da escrita
+
+    with GravadorCSV(arquivo, CAMPOS, retomar=True) as gravador:
+        gravador.gravar({'consulta': 'C3', 'tempo_ms': 30.0, 'tamanho_bytes': 300})
+    assert linhas_do_arquivo(arquivo) == [CAMPOS, ['C1', '10.5', '100'], ['C2', '20.0', '200'],
+                                          ['C3', '30.0', '300']]
+
+
+def test_retomada_recusa_outras_colunas(tmp_path):
+    arquivo = tmp_path / 'resultados.csv'
+    GravadorCSV(arquivo, CAMPOS).fechar()
+    with pytest.raises(ValueError):
+        GravadorCSV(arquivo, CAMPOS + ['timestamp'], retomar=True)
+
+
+def test_sem_retomar_sobrescreve_e_retomar_arquivo_vazio_grava_cabecalho(tmp_path):
+    arquivo = tmp_path / 'resultados.csv'
+    with GravadorCSV(arquivo, CAMPOS) as gravador:
+        gravador.gravar({'consulta': 'C1', 'tempo_ms': 1, 'tamanho_bytes': 1})
+    GravadorCSV(arquivo, CAMPOS).fechar()
+    assert linhas_do_arquivo(arquivo) == [CAMPOS]
+
+    vazio = tmp_path / 'vazio.csv'
+    vazio.write_text('')
+    GravadorCSV(vazio, CAMPOS, retomar=True).fechar()
+    assert linhas_do_arquivo(vazio) == [CAMPOS]
+
+
+def test_sincronizacao_em_lotes(tmp_path):
+    arquivo = tmp_path / 'resultados.csv'
+    gravador = GravadorCSV(arquivo, CAMPOS, lote=3, intervalo=3600)
+    for i in range(2):
+        gravador.gravar({'consulta': f'C{i}', 'tempo_ms': i, 'tamanho_bytes': i})
+    assert len(linhas_do_arquivo(arquivo)) == 1
+    gravador.gravar({'consulta': 'C2', 'tempo_ms': 2, 'tamanho_bytes': 2})
+    assert len(linhas_do_arquivo(arquivo)) == 4
+    gravador.fechar()
+
+
+def test_ler_resultados_converte_numeros(tmp_path):
+    arquivo = tmp_path / 'resultados.csv'
+    arquivo.write_text('consulta,tempo_ms,tamanho_bytes\n1,12.5,300\n2,7,40', encoding='utf-8')
+    assert ler_resultados(arquivo, campos_texto=('consulta',)) == [
+        {'consulta': '1', 'tempo_ms': 12.5, 'tamanho_bytes': 300}]
+    assert ler_resultados(tmp_path / 'inexistente.csv') == []
+
+
+@pytest.mark.parametrize('conteudo, esperado', [
+    (b'cab\nlinha 1\nlinha 2 bem mais longa que o bloco', b'cab\nlinha 1\n'),
+    (b'cab\nlinha 1\n', b'cab\nlinha 1\n'),
+    (b'linha sem quebra nenhuma', b''),
+    (b'', b''),
+    (b'abcdefgh\n' + b'x' * 37, b'abcdefgh\n'),
+])
+def test_truncamento_lendo_em_blocos(tmp_path, monkeypatch, conteudo, esperado):
+    monkeypatch.setattr(gravacao, 'BLOCO_LEITURA', 4)
+    arquivo = tmp_path / 'resultados.csv'
+    arquivo.write_bytes(conteudo)
+    gravacao._descartar_linha_incompleta(arquivo)
+    assert arquivo.read_bytes() == esperado
+
+
+def executar(servidor, arquivo, retomar, repeticoes):
+    api = ExperimentoAPI(servidor, f"{servidor}/graphql", delay=0)
+    nome, funcoes = api.consultas()[0]
+    api.iniciar_gravacao(arquivo, retomar=retomar)
+    try:
+        api.executar_consulta(nome, funcoes['REST'], funcoes['GraphQL'], repeticoes=repeticoes)
+    finally:
+        api.fechar()
+    return nome
+
+
+def test_experimento_retomado_mede_apenas_o_que_falta(servidor, tmp_path):
+    arquivo = str(tmp_path / 'resultados_experimento.csv')
+    nome = executar(servidor, arquivo, retomar=False, repeticoes=3)
+
+    # Simula uma queda: as duas últimas medições se perdem e a anterior fica cortada
+    with open(arquivo, encoding='utf-8', newline='') as f:
+        linhas = f.readlines()
+    with open(arquivo, 'w', encoding='utf-8', newline='') as f:
+        f.writelines(linhas[:-3])
+        f.write(linhas[-3][:20])
+
+    executar(servidor, arquivo, retomar=True, repeticoes=3)
+    resultados = ler_resultados(arquivo, campos_texto=('consulta', 'tipo_api'))
+    assert linhas_do_arquivo(arquivo)[0] == CAMPOS_RESULTADO
+    assert len(resultados) == 6
+    assert all(r['consulta'] == nome for r in resultados)
+    assert sorted(r['tipo_api'] for r in resultados) == ['GraphQL'] * 3 + ['REST'] * 3
@@ -0,0 +1,54 @@
+"""
+Testes - Instrumentação das Requisições HTTP (instrumentacao.py)
+"""
+
+import socket
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+
+from instrumentacao import ClienteHTTP, coletor
+
+HOST_TESTE = 'servidor.teste'
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    """Faz HOST_TESTE resolver para os IPs dados, na ordem dada"""
+    original = socket.getaddrinfo
+
+    def configurar(*ips):
+        def getaddrinfo(host, porta, *args, **kwargs):
+            if host != HOST_TESTE:
+                return original(host, porta, *args, **kwargs)
+            return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (ip, porta)) for ip in ips]
+        monkeypatch.setattr(socket, 'getaddrinfo', getaddrinfo)
+    return configurar
+
+
+def url_teste(servidor):
+    return f"http://{HOST_TESTE}:{urlsplit(servidor).port}/repos/facebook/react"
+
+
+def test_primeiro_endereco_recusa_e_o_segundo_aceita(servidor, resolver):
+    # O servidor escuta apenas em 127.0.0.1: 127.0.0.2 recusa a conexão
+    resolver('127.0.0.2', '127.0.0.1')
+    cliente = ClienteHTTP()
+    coletor.iniciar()
+    resposta = cliente.get(url_teste(servidor))
+    assert resposta.status_code == 200
+    resumo = coletor.resumo()
+    assert resumo['requisicoes'] == 1
+    assert resumo['fase_dns_ms'] > 0 and resumo['fase_conexao_ms'] > 0
+
+
+def test_todos_os_enderecos_recusam(servidor, resolver):
+    resolver('127.0.0.2', '127.0.0.3')
+    with pytest.raises(requests.ConnectionError):
+        ClienteHTTP().get(url_teste(servidor))
+
+
+def test_host_inexistente(servidor):
+    with pytest.raises(requests.ConnectionError):
+        ClienteHTTP().get(f"http://host-inexistente.invalid:{urlsplit(servidor).port}/")
@@ -0,0 +1,100 @@
+"""
+Testes - Métricas Comparativas do Dashboard (preparar_dashboard.py)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from cenarios import carregar_cenarios
+from preparar_dashboard import (adicionar_metricas_derivadas, montar_cubo, resumir,
+                                calcular_metricas_comparativas)
+
+RODADAS = 12
+
+
+def resultados_sinteticos(semente=0):
+    """
+    Medições em rodadas (REST e GraphQL em ordem sorteada), com REST-paralelo
+    na Consulta 2 e duas medições GraphQL perdidas na Consulta 3
+    """
+    sorteio = np.random.default_rng(semente)
+    cenarios = carregar_cenarios()
+    linhas = []
+    for i, cenario in enumerate(cenarios, 1):
+        apis = ['REST', 'GraphQL'] + (['REST-paralelo'] if cenario.nome == 'Consulta 2 - Média' else [])
+        for rodada in range(RODADAS):
+            for api in sorteio.permutation(apis):
+                if cenario.nome == 'Consulta 3 - Complexa' and api == 'GraphQL' and rodada >= RODADAS - 2:
+                    continue
+                base = {'REST': 300, 'GraphQL': 200, 'REST-paralelo': 220}[api] * i
+                linhas.append({'consulta': cenario.nome, 'tipo_api': api,
+                               'tempo_ms': sorteio.lognormal(np.log(base), 0.3),
+                               'tamanho_bytes': int(sorteio.normal(5000 if api != 'GraphQL' else 1500, 100))})
+    df = pd.DataFrame(linhas)
+    df['timestamp'] = pd.Timestamp('2025-01-01 10:00') + pd.to_timedelta(np.arange(len(df)), unit='s')
+    return df, cenarios
+
+
+@pytest.fixture(scope='module')
+def dados():
+    df, cenarios = resultados_sinteticos()
+    enriquecido = adicionar_metricas_derivadas(df, cenarios)
+    cubo, _ = montar_cubo(enriquecido)
+    metricas = calcular_metricas_comparativas(*resumir(cubo)).set_index('consulta')
+    return enriquecido, metricas
+
+
+def tempos(df, consulta, api, coluna='tempo_ms'):
+    return df.loc[(df['consulta'] == consulta) & (df['tipo_api'] == api), coluna].to_numpy()
+
+
+def test_estatisticas_descritivas(dados):
+    df, metricas = dados
+    assert list(metricas.index) == list(df['consulta'].unique())
+    for consulta, linha in metricas.iterrows():
+        rest, graphql = tempos(df, consulta, 'REST'), tempos(df, consulta, 'GraphQL')
+        assert linha['rest_tempo_media'] == pytest.approx(rest.mean())
+        assert linha['graphql_tempo_mediana'] == pytest.approx(np.median(graphql))
+        assert linha['rest_tempo_desvio'] == pytest.approx(np.std(rest))
+        assert linha['graphql_tempo_p95'] == pytest.approx(np.percentile(graphql, 95))
+        assert (linha['rest_tempo_min'], linha['rest_tempo_max']) == pytest.approx((rest.min(), rest.max()))
+        assert linha['speedup'] == pytest.approx(rest.mean() / graphql.mean())
+        assert linha['ganho_tempo_percentual'] == pytest.approx((rest.mean() - graphql.mean()) / rest.mean() * 100)
+        assert linha['rest_cv_tempo'] == pytest.approx(np.std(rest) / rest.mean() * 100)
+        tamanho_rest = tempos(df, consulta, 'REST', 'tamanho_bytes')
+        assert linha['rest_tamanho_media'] == pytest.approx(tamanho_rest.mean())
+
+
+def test_teste_t_pareado_na_ordem_de_execucao(dados):
+    df, metricas = dados
+    for consulta in ['Consulta 1 - Simples', 'Consulta 2 - Média', 'Consulta 5 - Aninhada']:
+        for medida, coluna in [('tempo', 'tempo_ms'), ('tamanho', 'tamanho_bytes')]:
+            esperado = stats.ttest_rel(tempos(df, consulta, 'REST', coluna), tempos(df, consulta, 'GraphQL', coluna))
+            assert metricas.loc[consulta, f't_statistic_{medida}'] == pytest.approx(esperado.statistic)
+            assert metricas.loc[consulta, f'p_value_{medida}'] == pytest.approx(esperado.pvalue, rel=1e-6, abs=1e-300)
+        assert metricas.loc[consulta, 'significante_tempo'] == (
+            'Sim' if metricas.loc[consulta, 'p_value_tempo'] < 0.05 else 'Não')
+
+
+def test_welch_quando_as_contagens_diferem(dados):
+    df, metricas = dados
+    consulta = 'Consulta 3 - Complexa'
+    rest, graphql = tempos(df, consulta, 'REST'), tempos(df, consulta, 'GraphQL')
+    assert len(rest) != len(graphql)
+    esperado = stats.ttest_ind(rest, graphql, equal_var=False)
+    assert metricas.loc[consulta, 't_statistic_tempo'] == pytest.approx(esperado.statistic)
+    assert metricas.loc[consulta, 'p_value_tempo'] == pytest.approx(esperado.pvalue, rel=1e-6)
+
+
+def test_rest_paralelo(dados):
+    df, metricas = dados
+    consulta = 'Consulta 2 - Média'
+    paralelo, graphql = tempos(df, consulta, 'REST-paralelo'), tempos(df, consulta, 'GraphQL')
+    esperado = stats.ttest_ind(paralelo, graphql, equal_var=False)
+    assert metricas.loc[consulta, 'speedup_paralelo'] == pytest.approx(paralelo.mean() / graphql.mean())
+    assert metricas.loc[consulta, 't_statistic_tempo_paralelo'] == pytest.approx(esperado.statistic)
+    assert metricas.loc[consulta, 'p_value_tempo_paralelo'] == pytest.approx(esperado.pvalue, rel=1e-6)
+    # Consultas sem o braço ficam em branco
+    assert metricas.loc['Consulta 1 - Simples', ['speedup_paralelo', 'significante_tempo_paralelo']].isna().all()
@@ -0,0 +1,83 @@
+"""
+Testes - Ruído de Medição no Cliente (ruido.py)
+"""
+
+import gc
+import time
+
+import pytest
+
+import ruido
+import experimento
+from ruido import CAMPOS_RUIDO, MonitorRuido
+from estatistica_online import AcumuladorBraco
+from experimento import ExperimentoAPI
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    # Carga do sistema fixa: a da máquina de teste não entra no resultado
+    monkeypatch.setattr(ruido, 'carga_por_nucleo', lambda: 0.1)
+    monitor = MonitorRuido()
+    yield monitor
+    gc.callbacks.remove(monitor._callback_gc)
+
+
+def medir(monitor, trabalho):
+    monitor.iniciar()
+    inicio = time.perf_counter_ns()
+    trabalho()
+    return monitor.finalizar((time.perf_counter_ns() - inicio) / 1e6)
+
+
+def test_amostra_limpa(monitor):
+    resultado = medir(monitor, lambda: time.sleep(0.05))
+    assert list(resultado) == CAMPOS_RUIDO
+    assert resultado['ruido'] == ''
+    assert resultado['gc_coletas'] == 0
+    assert resultado['carga_sistema'] == 0.1
+
+
+def test_pausa_do_gc(monitor, monkeypatch):
+    monkeypatch.setattr(ruido, 'PAUSA_GC_MS', 0.0)
+    resultado = medir(monitor, lambda: (time.sleep(0.02), gc.collect()))
+    assert resultado['gc_coletas'] >= 1
+    assert resultado['gc_pausa_ms'] > 0
+    assert 'gc' in resultado['ruido'].split('+')
+
+
+def test_cpu_ocupada(monitor):
+    def ocupar():
+        fim = time.perf_counter() + 0.05
+        while time.perf_counter() < fim:
+            pass
+    resultado = medir(monitor, ocupar)
+    assert resultado['cpu_processo_ms'] > 0
+    assert 'cpu' in resultado['ruido'].split('+')
+
+
+def test_carga_do_sistema(monitor, monkeypatch):
+    monkeypatch.setattr(ruido, 'carga_por_nucleo', lambda: ruido.CARGA_POR_NUCLEO + 1)
+    assert medir(monitor, lambda: time.sleep(0.02))['ruido'] == 'carga'
+
+
+def test_coletas_fora_da_medicao_nao_contam(monitor):
+    gc.collect()
+    resultado = medir(monitor, lambda: time.sleep(0.02))
+    gc.collect()
+    assert resultado['gc_coletas'] == 0
+    assert monitor.coletas == 0
+
+
+@pytest.mark.parametrize('quarentena', [True, False])
+def test_quarentena_no_braco(monkeypatch, quarentena):
+    monkeypatch.setattr(experimento, 'QUARENTENA_RUIDO', quarentena)
+    api = ExperimentoAPI(cenarios=[])
+    braco = AcumuladorBraco()
+    for tempo, motivo in [(10.0, ''), (20.0, ''), (500.0, 'gc+cpu')]:
+        api.registrar_no_braco(braco, {'tempo_ms': tempo, 'tamanho_bytes': 100, 'ruido': motivo})
+    assert braco.medicoes == 3
+    if quarentena:
+        assert (braco.tempo.n, braco.quarentena, braco.tempo.media) == (2, 1, 15.0)
+    else:
+        assert (braco.tempo.n, braco.quarentena) == (3, 0)
@@ -0,0 +1,86 @@
+"""
+Testes - Testes Não Paramétricos e Bootstrap (testes_nao_parametricos.py)
+"""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+import testes_nao_parametricos
+from testes_nao_parametricos import comparar, comparar_varios, estatisticas_reamostradas, magnitude_cliff
+
+
+def amostras(semente, n_a=40, n_b=55, escala=1.3):
+    sorteio = np.random.default_rng(semente)
+    return sorteio.lognormal(5, 0.4, n_a) * escala, sorteio.lognormal(5, 0.4, n_b)
+
+
+def cliff_por_pares(a, b):
+    diferencas = np.sign(np.subtract.outer(a, b))
+    return diferencas.mean()
+
+
+@pytest.mark.parametrize('semente', [0, 1])
+def test_mann_whitney_e_delta_de_cliff(semente):
+    a, b = amostras(semente)
+    # Empates entre as APIs (tempos arredondados)
+    a, b = np.round(a, -1), np.round(b, -1)
+    resultado = comparar(a, b, reamostragens=200, semente=0)
+    esperado = stats.mannwhitneyu(a, b, alternative='two-sided')
+    assert resultado['u_statistic'] == pytest.approx(esperado.statistic)
+    assert resultado['p_value'] == pytest.approx(esperado.pvalue)
+    assert resultado['cliff_delta'] == pytest.approx(cliff_por_pares(a, b))
+    assert resultado['magnitude_cliff'] == magnitude_cliff(resultado['cliff_delta'])
+    assert (resultado['n_a'], resultado['n_b']) == (len(a), len(b))
+
+
+@pytest.mark.parametrize('delta, magnitude', [
+    (0.0, 'desprezível'), (0.146, 'desprezível'), (0.147, 'pequeno'), (-0.2, 'pequeno'),
+    (0.33, 'médio'), (-0.47, 'médio'), (0.474, 'grande'), (-1.0, 'grande'), (np.nan, None),
+])
+def test_limites_da_magnitude(delta, magnitude):
+    assert magnitude_cliff(delta) == magnitude
+
+
+def test_reamostragens_em_lotes(monkeypatch):
+    valores = np.random.default_rng(2).lognormal(5, 0.4, 31)
+    medias, medianas = estatisticas_reamostradas(valores, 500, np.random.default_rng(7))
+    indices = np.random.default_rng(7).integers(0, len(valores), size=(500, len(valores)), dtype=np.int32)
+    reamostrados = np.sort(valores)[indices]
+    assert np.allclose(medias, reamostrados.mean(axis=1))
+    assert np.allclose(medianas, np.median(reamostrados, axis=1))
+
+    # Lotes pequenos: as matrizes de índices seguem a mesma sequência sorteada
+    monkeypatch.setattr(testes_nao_parametricos, 'ELEMENTOS_LOTE', len(valores) * 7)
+    medias_lotes, medianas_lotes = estatisticas_reamostradas(valores, 500, np.random.default_rng(7))
+    assert np.array_equal(medias_lotes, medias)
+    assert np.array_equal(medianas_lotes, medianas)
+
+
+def test_intervalos_contem_a_estimativa():
+    a, b = amostras(3)
+    resultado = comparar(a, b, reamostragens=2000, semente=1)
+    for nome in ('media', 'mediana'):
+        assert resultado[f'speedup_{nome}_ic_inf'] <= resultado[f'speedup_{nome}'] <= resultado[f'speedup_{nome}_ic_sup']
+    assert resultado['speedup_media'] == pytest.approx(a.mean() / b.mean())
+    assert resultado['speedup_mediana'] == pytest.approx(np.median(a) / np.median(b))
+
+
+def test_lado_vazio_ou_nan():
+    assert comparar([], [1.0, 2.0]) == {'n_a': 0, 'n_b': 2}
+    resultado = comparar([1.0, np.nan, 3.0], [2.0, 4.0], reamostragens=50, semente=0)
+    assert (resultado['n_a'], resultado['n_b']) == (2, 2)
+
+
+def test_resultado_nao_depende_dos_processos_nem_dos_demais_pares():
+    pares = [amostras(semente, n_a=20, n_b=25) for semente in range(4)]
+    identificadores = [f'Consulta {i}' for i in range(4)]
+    um = comparar_varios(pares, reamostragens=300, processos=1, identificadores=identificadores)
+    dois = comparar_varios(pares, reamostragens=300, processos=2, identificadores=identificadores)
+    assert um == dois
+    sozinho = comparar_varios(pares[2:3], reamostragens=300, processos=1, identificadores=identificadores[2:3])
+    assert sozinho[0] == um[2]
+
+    # Sem identificadores: sementes de SeedSequence.spawn, ainda determinísticas
+    assert comparar_varios(pares, reamostragens=300, processos=1) == \
+        comparar_varios(pares, reamostragens=300, processos=2)
@@ -0,0 +1,132 @@
+"""
+Lab 05 - Testes Não Paramétricos e Bootstrap
+Compara os tempos de dois tipos de API sem supor normalidade nem pareamento
+(as medições são feitas em ordem sorteada e a latência é assimétrica):
+
+- Teste de Mann-Whitney (soma de postos de Wilcoxon), bilateral
+- Delta de Cliff, P(a > b) − P(a < b), tirado da estatística U, com a
+  magnitude pelos limites de Romano et al. (2006)
+- Intervalos de confiança bootstrap (percentil) do speedup a/b da média e da
+  mediana, reamostrando cada API de forma independente
+
+As reamostragens são feitas em lotes, como matrizes de índices do NumPy
+(uma linha por reamostragem), e as comparações são divididas entre
+processos. Cada comparação recebe sua própria semente (tirada do seu
+identificador, ou SeedSequence.spawn sem ele), então o resultado não depende
+do número de processos.
+"""
+
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import stats
+
+# Reamostragens do bootstrap e nível de confiança dos intervalos
+REAMOSTRAGENS = 10000
+CONFIANCA = 0.95
+
+# Elementos por matriz de índices (limita a memória de cada lote)
+ELEMENTOS_LOTE = 2_000_000
+
+# Limites de |delta de Cliff| para pequeno, médio e grande
+LIMITES_CLIFF = [(0.474, 'grande'), (0.33, 'médio'), (0.147, 'pequeno')]
+
+
+def magnitude_cliff(delta):
+    """Magnitude do efeito pelo |delta de Cliff|"""
+    if np.isnan(delta):
+        return None
+    return next((nome for limite, nome in LIMITES_CLIFF if abs(delta) >= limite), 'desprezível')
+
+
+def estatisticas_reamostradas(valores, reamostragens, sorteio):
+    """
+    Média e mediana de cada reamostragem (com reposição) de valores
+
+    Returns:
+        tuple de arrays com reamostragens posições: (médias, medianas)
+    """
+    n = len(valores)
+    ordenados = np.sort(valores)
+    meio = [(n - 1) // 2, n // 2]
+    medias, medianas = np.empty(reamostragens), np.empty(reamostragens)
+    lote = max(1, ELEMENTOS_LOTE // n)
+    for inicio in range(0, reamostragens, lote):
+        fim = min(inicio + lote, reamostragens)
+        indices = sorteio.integers(0, n, size=(fim - inicio, n), dtype=np.int32)
+        medias[inicio:fim] = ordenados[indices].mean(axis=1)
+        # Com os valores ordenados, a mediana da reamostragem está nos índices
+        # do meio: particionar os índices sai bem mais barato que os valores
+        indices.partition(meio, axis=1)
+        medianas[inicio:fim] = (ordenados[indices[:, meio[0]]] + ordenados[indices[:, meio[1]]]) / 2
+    return medias, medianas
+
+
+def comparar(a, b, reamostragens=REAMOSTRAGENS, confianca=CONFIANCA, semente=None):
+    """
+    Testes de a contra b (ex.: tempos REST e GraphQL de uma consulta)
+
+    Returns:
+        dict com n_a, n_b, u_statistic, p_value, cliff_delta, magnitude_cliff
+        e, para media e mediana, speedup_{estatística} com ic_inf/ic_sup
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    a, b = a[~np.isnan(a)], b[~np.isnan(b)]
+    resultado = {'n_a': len(a), 'n_b': len(b)}
+    if len(a) == 0 or len(b) == 0:
+        return resultado
+
+    u, p = stats.mannwhitneyu(a, b, alternative='two-sided')
+    # U conta os pares com a > b (empates valem 1/2): delta = 2U/(n_a·n_b) − 1
+    delta = 2 * u / (len(a) * len(b)) - 1
+    resultado.update({'u_statistic': u, 'p_value': p, 'cliff_delta': delta,
+                      'magnitude_cliff': magnitude_cliff(delta)})
+
+    sorteio = np.random.default_rng(semente)
+    medias_a, medianas_a = estatisticas_reamostradas(a, reamostragens, sorteio)
+    medias_b, medianas_b = estatisticas_reamostradas(b, reamostragens, sorteio)
+    caudas = [(1 - confianca) / 2 * 100, (1 + confianca) / 2 * 100]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for nome, estimativa, reamostrado in [
+            ('media', a.mean() / b.mean(), medias_a / medias_b),
+            ('mediana', np.median(a) / np.median(b), medianas_a / medianas_b),
+        ]:
+            inferior, superior = np.percentile(reamostrado, caudas)
+            resultado.update({f'speedup_{nome}': estimativa,
+                              f'speedup_{nome}_ic_inf': inferior,
+                              f'speedup_{nome}_ic_sup': superior})
+    return resultado
+
+
+def _comparar_tarefa(argumentos):
+    return comparar(*argumentos)
+
+
+def comparar_varios(pares, reamostragens=REAMOSTRAGENS, confianca=CONFIANCA, semente=0, processos=None,
+                    identificadores=None):
+    """
+    comparar() de cada par (a, b), divididos entre processos
+
+    Args:
+        processos: número de processos (None: um por núcleo; 1: no próprio processo)
+        identificadores: texto que identifica cada par; com ele, a semente de
+            um par não depende dos demais (resultados reaproveitáveis entre execuções)
+
+    Returns:
+        list de dicts, na ordem de pares
+    """
+    if identificadores is None:
+        sementes = np.random.SeedSequence(semente).spawn(len(pares))
+    else:
+        sementes = [np.random.SeedSequence([semente, int.from_bytes(
+                        hashlib.blake2b(identificador.encode('utf-8'), digest_size=8).digest(), 'little')])
+                    for identificador in identificadores]
+    tarefas = [(a, b, reamostragens, confianca, s) for (a, b), s in zip(pares, sementes)]
+    processos = min(processos or os.cpu_count() or 1, len(tarefas))
+    if processos <= 1:
+        return [_comparar_tarefa(tarefa) for tarefa in tarefas]
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(executor.map(_comparar_tarefa, tarefas, chunksize=max(1, len(tarefas) // (4 * processos))))
@@ -0,0 +1,296 @@
+"""
+Lab 05 - GraphQL vs REST - Varredura de Paginação e Lotes
+Mede como cada API escala com o tamanho do resultado, em duas partes:
+
+- Paginação: issues de um repositório em páginas de 10 a 100 itens
+  (per_page no REST, first no GraphQL) e de 1 a N páginas seguidas
+  (page=2, 3... no REST; cursor after no GraphQL, que só conhece a próxima
+  página depois de ler a anterior)
+- Lote: as k primeiras consultas do experimento (k = 1 a 5) feitas uma a
+  uma em REST e em GraphQL, e num único documento GraphQL com um alias por
+  consulta (GraphQL-lote)
+
+Cada combinação é medida REPETICOES_VARREDURA vezes, em rodadas com ordem
+sorteada e conexões persistentes, e gravada em resultados_varredura.csv
+assim que termina (--retomar continua uma varredura interrompida).
+preparar_dashboard.py transforma o arquivo em curvas de latência × bytes
+por API (curvas_varredura.csv).
+
+Uso:
+    python varredura.py --base-url http://127.0.0.1:8000
+"""
+
+import re
+import time
+import random
+import argparse
+from collections import Counter
+from datetime import datetime
+
+from experimento import (
+    ExperimentoAPI, CombinedResponse, GITHUB_TOKEN, REST_BASE_URL, GRAPHQL_URL,
+    DELAY_ENTRE_REQUESTS, HEADERS_REST, HEADERS_GRAPHQL
+)
+from gravacao import GravadorCSV, ler_resultados
+from cenarios import carregar_cenarios
+
+TAMANHOS_PAGINA = [10, 25, 50, 100]
+PROFUNDIDADES = [1, 2, 4, 8]
+REPETICOES_VARREDURA = 10
+
+# Repositório paginado (o mesmo das issues da consulta 2)
+REPOSITORIO_PAGINACAO = ('facebook', 'react')
+
+# Consultas combinadas em lote: as do catálogo de cenários, na ordem do
+# experimento, com as variáveis padrão de cada uma
+CONSULTAS_LOTE = [(c.query, c.variaveis_graphql(c.variaveis)) for c in carregar_cenarios()]
+
+QUERY_PAGINA_ISSUES = """
+query($owner: String!, $repo: String!, $n: Int!, $cursor: String) {
+  repository(owner: $owner, name: $repo) {
+    issues(first: $n, after: $cursor) {
+      nodes {
+        number
+        title
+        state
+        createdAt
+        author {
+          login
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+    }
+  }
+}
+"""
+
+# Colunas que identificam um ponto da varredura
+CHAVE_VARREDURA = ['modo', 'tipo_api', 'tamanho_pagina', 'paginas', 'consultas_lote']
+
+CAMPOS_VARREDURA = CHAVE_VARREDURA + [
+    'itens', 'requisicoes', 'tempo_ms', 'tamanho_bytes', 'bytes_rede', 'timestamp'
+]
+
+
+def paginar_rest(experimento, tamanho, paginas):
+    """Páginas 1..N de issues em sequência (para antes se uma página vier incompleta)"""
+    owner, repo = REPOSITORIO_PAGINACAO
+    respostas = {}
+    for pagina in range(1, paginas + 1):
+        resposta = experimento.http.get(
+            f"{experimento.rest_base_url}/repos/{owner}/{repo}/issues?per_page={tamanho}&page={pagina}&state=all",
+            headers=HEADERS_REST
+        )
+        respostas[f"pagina_{pagina}"] = resposta
+        if len(resposta.json()) < tamanho:
+            break
+    return CombinedResponse(respostas)
+
+
+def paginar_graphql(experimento, tamanho, paginas):
+    """Páginas 1..N de issues seguindo o cursor de cada página"""
+    owner, repo = REPOSITORIO_PAGINACAO
+    respostas = {}
+    cursor = None
+    for pagina in range(1, paginas + 1):
+        variables = {"owner": owner, "repo": repo, "n": tamanho, "cursor": cursor}
+        resposta = experimento.http.post(
+            experimento.graphql_url, headers=HEADERS_GRAPHQL,
+            json={"query": QUERY_PAGINA_ISSUES, "variables": variables}
+        )
+        respostas[f"pagina_{pagina}"] = resposta
+        info = resposta.json()['data']['repository']['issues']['pageInfo']
+        if not info['hasNextPage']:
+            break
+        cursor = info['endCursor']
+    return CombinedResponse(respostas)
+
+
+def documento_em_lote(consultas):
+    """
+    Junta várias queries num único documento, cada uma sob um alias (c1, c2...)
+
+    As variáveis de cada query ganham o número do alias como sufixo para não
+    colidirem entre si.
+
+    Args:
+        consultas: list de (query, variables)
+
+    Returns:
+        dict com 'query' e 'variables', pronto para o POST
+    """
+    definicoes, campos, variables = [], [], {}
+    for i, (query, valores) in enumerate(consultas, 1):
+        cabecalho, corpo = query.split('{', 1)
+        corpo = corpo.rsplit('}', 1)[0].strip()
+        definicoes.append(re.sub(r'\$(\w+)', rf'$\1_{i}', re.search(r'\((.*)\)', cabecalho).group(1)))
+        campos.append(f"c{i}: " + re.sub(r'\$(\w+)', rf'$\1_{i}', corpo))
+        variables.update({f"{nome}_{i}": valor for nome, valor in valores.items()})
+    query = "query(" + ", ".join(definicoes) + ") {\n" + "\n".join(campos) + "\n}"
+    return {"query": query, "variables": variables}
+
+
+def consultas_em_sequencia(funcoes):
+    """Executa as consultas uma após a outra, juntando todas as respostas"""
+    respostas = {}
+    for i, funcao in enumerate(funcoes, 1):
+        resposta = funcao()
+        if isinstance(resposta, CombinedResponse):
+            respostas.update({f"c{i}_{chave}": r for chave, r in resposta.respostas.items()})
+        else:
+            respostas[f"c{i}"] = resposta
+    return CombinedResponse(respostas)
+
+
+def funcao_do_ponto(experimento, modo, tipo, tamanho, paginas, k):
+    """Função sem argumentos que executa um ponto da varredura"""
+    if modo == 'paginacao':
+        paginar = paginar_rest if tipo == 'REST' else paginar_graphql
+        return lambda: paginar(experimento, tamanho, paginas)
+    if tipo == 'GraphQL-lote':
+        payload = documento_em_lote(CONSULTAS_LOTE[:k])
+        return lambda: experimento.http.post(experimento.graphql_url, headers=HEADERS_GRAPHQL, json=payload)
+    funcoes = [f[tipo] for _, f in experimento.consultas()[:k]]
+    return lambda: consultas_em_sequencia(funcoes)
+
+
+def contar_itens(modo, tipo, dados, k):
+    """Itens retornados: issues na paginação, consultas no lote"""
+    if modo == 'lote':
+        return k
+    if tipo == 'REST':
+        return sum(len(pagina) for pagina in dados.values())
+    return sum(len(pagina['data']['repository']['issues']['nodes']) for pagina in dados.values())
+
+
+def pontos_da_varredura(tamanhos, profundidades, lote_max):
+    """Combinações (modo, tipo_api, tamanho_pagina, paginas, consultas_lote); '' quando não se aplica"""
+    pontos = [('paginacao', tipo, tamanho, paginas, '')
+              for tipo in ('REST', 'GraphQL') for tamanho in tamanhos for paginas in profundidades]
+    pontos += [('lote', tipo, '', '', k)
+               for tipo in ('REST', 'GraphQL', 'GraphQL-lote') for k in range(1, lote_max + 1)]
+    return pontos
+
+
+def executar_varredura(experimento, tamanhos=TAMANHOS_PAGINA, profundidades=PROFUNDIDADES,
+                       lote_max=len(CONSULTAS_LOTE), repeticoes=REPETICOES_VARREDURA,
+                       gravador=None, anteriores=()):
+    """
+    Mede todos os pontos da varredura em rodadas de ordem sorteada
+
+    Args:
+        gravador: GravadorCSV que recebe cada medição assim que ela termina
+        anteriores: linhas de uma varredura interrompida (contam para as repetições)
+
+    Returns:
+        list de dicts com as colunas de CAMPOS_VARREDURA
+    """
+    experimento.http = experimento.clientes['quente']
+    linhas = list(anteriores)
+    feitas = Counter(tuple(l[c] for c in CHAVE_VARREDURA) for l in anteriores)
+    pontos = pontos_da_varredura(tamanhos, profundidades, lote_max)
+
+    total = sum(max(0, repeticoes - feitas[p]) for p in pontos)
+    if total == 0:
+        print("Varredura já concluída.")
+        return linhas
+
+    # Aquecimento: abre as conexões antes da primeira medição
+    experimento.aquecer([lambda: paginar_rest(experimento, min(tamanhos), 1),
+                         lambda: paginar_graphql(experimento, min(tamanhos), 1)])
+
+    i = 0
+    for rodada in range(1, repeticoes + 1):
+        bloco = [p for p in pontos if feitas[p] < rodada]
+        for ponto in random.sample(bloco, len(bloco)):
+            modo, tipo, tamanho, paginas, k = ponto
+            i += 1
+            descricao = f"{tamanho} itens × {paginas} página(s)" if modo == 'paginacao' else f"{k} consulta(s)"
+            print(f"Medição {i}/{total} - {modo} {tipo} ({descricao})...", end=" ")
+
+            funcao = funcao_do_ponto(experimento, modo, tipo, tamanho, paginas, k)
+            tempo, tamanho_bytes, sucesso, dados, extras = experimento.medir_tempo_tamanho(funcao)
+            if sucesso:
+                linha = {
+                    'modo': modo, 'tipo_api': tipo, 'tamanho_pagina': tamanho,
+                    'paginas': paginas, 'consultas_lote': k,
+                    'itens': contar_itens(modo, tipo, dados, k),
+                    'requisicoes': extras['requisicoes'],
+                    'tempo_ms': tempo,
+                    'tamanho_bytes': tamanho_bytes,
+                    'bytes_rede': extras['bytes_corpo_comprimido'] + extras['bytes_cabecalhos'],
+                    'timestamp': datetime.now().isoformat(),
+                }
+                linhas.append(linha)
+                feitas[ponto] += 1
+                if gravador is not None:
+                    gravador.gravar(linha)
+                print(f"✓ Tempo: {tempo:.2f}ms, Itens: {linha['itens']}, Tamanho: {tamanho_bytes} bytes")
+            else:
+                print("✗ Falha")
+
+            # Delay para evitar rate limiting
+            time.sleep(experimento.delay)
+
+    return linhas
+
+
+def main():
+    """Executa a varredura de paginação e lotes"""
+    parser = argparse.ArgumentParser(description='Lab 05 - varredura de paginação e lotes GraphQL')
+    parser.add_argument('--base-url',
+                        help='URL base da API REST (ex.: servidor_local.py); padrão: API do GitHub')
+    parser.add_argument('--graphql-url', help='Endpoint GraphQL (padrão: <base-url>/graphql)')
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_PAGINA,
+                        help='Itens por página (máximo 100 na API do GitHub)')
+    parser.add_argument('--profundidades', type=int, nargs='+', default=PROFUNDIDADES,
+                        help='Número de páginas seguidas')
+    parser.add_argument('--lote-max', type=int, default=len(CONSULTAS_LOTE),
+                        help='Maior número de consultas combinadas em lote')
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_VARREDURA)
+    parser.add_argument('--delay', type=float,
+                        help=f'Segundos entre medições (padrão: {DELAY_ENTRE_REQUESTS} na API do GitHub, 0 com --base-url)')
+    parser.add_argument('-o', '--output', default='resultados_varredura.csv')
+    parser.add_argument('--retomar', action='store_true',
+                        help='Continua uma varredura interrompida no arquivo de saída')
+    args = parser.parse_args()
+
+    if args.base_url:
+        rest_base_url = args.base_url.rstrip('/')
+        graphql_url = args.graphql_url or f"{rest_base_url}/graphql"
+        delay = 0 if args.delay is None else args.delay
+    else:
+        if GITHUB_TOKEN == "SEU_TOKEN_AQUI":
+            print("\n⚠️  Configure o token do GitHub em experimento.py ou use --base-url")
+            return
+        rest_base_url = REST_BASE_URL
+        graphql_url = args.graphql_url or GRAPHQL_URL
+        delay = DELAY_ENTRE_REQUESTS if args.delay is None else args.delay
+    experimento = ExperimentoAPI(rest_base_url, graphql_url, delay)
+    lote_max = min(args.lote_max, len(CONSULTAS_LOTE))
+
+    print("="*60)
+    print("VARREDURA DE PAGINAÇÃO E LOTES: GraphQL vs REST")
+    print("="*60)
+    print(f"REST: {experimento.rest_base_url} | GraphQL: {experimento.graphql_url}")
+    print(f"Itens por página: {', '.join(map(str, args.tamanhos))} | "
+          f"Páginas: {', '.join(map(str, args.profundidades))} | Lote: 1 a {lote_max} consultas")
+
+    anteriores = ler_resultados(args.output, campos_texto=('modo', 'tipo_api', 'timestamp')) if args.retomar else []
+    if anteriores:
+        print(f"Retomando {args.output}: {len(anteriores)} medições já gravadas")
+
+    try:
+        with GravadorCSV(args.output, CAMPOS_VARREDURA, retomar=args.retomar) as gravador:
+            executar_varredura(experimento, args.tamanhos, args.profundidades, lote_max,
+                               args.repeticoes, gravador, anteriores)
+    finally:
+        experimento.fechar()
+    print(f"\nVarredura salva em: {args.output}")
+
+
+if __name__ == "__main__":
+    main()